@@ -13,16 +13,43 @@ Workflow 模式（专家流水线）:
     result = pipeline.run(input_data=data, job_description="...")
 """
 
-# 基类
-from .base import BaseLLMAgent
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-# Solo 模式
-from .react_agent import ReactAgent, Agent
-from .plan_execute_reflect_agent import PlanExecuteReflectAgent, PERAgent
+# 按需导入（PEP 562）：只用到 BaseLLMAgent 时不会加载各 Agent 及其提示词
+_LAZY_IMPORTS = {
+    # 基类
+    "BaseLLMAgent": ".base",
+    # Solo 模式
+    "ReactAgent": ".react_agent",
+    "Agent": ".react_agent",
+    "PlanExecuteReflectAgent": ".plan_execute_reflect_agent",
+    "PERAgent": ".plan_execute_reflect_agent",
+    # 专家 Agent（供 Workflow 使用）
+    "ContentAgent": ".crews.resume.content_agent",
+    "LayoutAgent": ".crews.resume.layout_agent",
+}
+
+if TYPE_CHECKING:
+    from .base import BaseLLMAgent
+    from .react_agent import ReactAgent, Agent
+    from .plan_execute_reflect_agent import PlanExecuteReflectAgent, PERAgent
+    from .crews.resume.content_agent import ContentAgent
+    from .crews.resume.layout_agent import LayoutAgent
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-# 专家 Agent（供 Workflow 使用）
-from .crews.resume.content_agent import ContentAgent
-from .crews.resume.layout_agent import LayoutAgent
 
 __all__ = [
     # 基类
@@ -5,15 +5,101 @@ Base LLM Agent 基础类
 """
 
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Protocol
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Protocol
+import asyncio
+import hashlib
 import json
+import os
 import re
 
 from common.logger import get_logger
+from common.response_cache import CacheBackend, ResponseCache
+
+if TYPE_CHECKING:
+    from common.semantic_cache import SemanticCache
 
 logger = get_logger(__name__)
 
+_PARSED_JSON_CACHE_SIZE = 16
+
+# 解析失败时的 JSON 修复提示词（只重发一次，避免重跑 think + execute）
+_JSON_REPAIR_PROMPT = """上一次的回复不是合法的 JSON。请只输出其中的 JSON 对象，不要包含任何说明文字：
+
+{response}"""
+_JSON_REPAIR_MAX_CHARS = 4000
+
+_JSON_DECODER = json.JSONDecoder()
+
+# ```json ... ``` 或 ``` ... ``` 代码块
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```", re.IGNORECASE)
+
+# 设置 DEBUG_PROMPTS=1 时提示词中的 JSON 保留缩进，便于人工查看
+_DEBUG_PROMPTS = os.getenv("DEBUG_PROMPTS", "").lower() in ("1", "true", "yes")
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+@lru_cache(maxsize=64)
+def _prompt_fingerprint(text: str) -> str:
+    """静态提示词（系统提示词等）的短指纹，同一进程内每段文本只哈希一次"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _iter_strings(value: Any):
+    """递归产出嵌套结构中的所有字符串值"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_strings(item)
+
+
+def _iter_json_values(text: str):
+    """按优先级依次产出能解析的 JSON 值（整段 -> 代码块 -> 第一个 '{' 起的完整值 -> 首尾大括号）
+    
+    第一个 '{' 起的值用 raw_decode 在 C 扫描器中一次完成定界与解析（与 core.parser 一致），
+    不再逐字符做括号匹配后再对截出的片段 json.loads 一遍。
+    """
+    candidates = []
+    # 结构化输出时响应本身就是 JSON，直接整段解析
+    stripped = text.strip()
+    if stripped.startswith(("{", "[")):
+        candidates.append(stripped)
+    
+    if "```" in text:
+        fenced = _JSON_FENCE_RE.search(text)
+        if fenced:
+            candidates.append(fenced.group(1))
+    
+    for candidate in candidates:
+        try:
+            yield json.loads(candidate)
+        except json.JSONDecodeError:
+            pass
+    
+    start = text.find("{")
+    if start < 0:
+        return
+    try:
+        yield _JSON_DECODER.raw_decode(text, start)[0]
+    except json.JSONDecodeError:
+        pass
+    last = text.rfind("}")
+    if last > start:
+        try:
+            yield json.loads(text[start:last + 1])
+        except json.JSONDecodeError:
+            pass
+
 
 class LLMProtocol(Protocol):
     """LLM 协议接口"""
@@ -21,7 +107,7 @@ class LLMProtocol(Protocol):
         ...
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentMessage:
     """Agent 消息"""
     role: str  # "system", "user", "assistant"
@@ -29,7 +115,7 @@ class AgentMessage:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResult:
     """Agent 执行结果"""
     success: bool
@@ -37,6 +123,8 @@ class AgentResult:
     reasoning: str = ""
     suggestions: List[str] = field(default_factory=list)
     error: Optional[str] = None
+    # 失败原因是确定性的（如修复后仍无法解析 JSON）时为 False，run 不再重试
+    retryable: bool = True
 
 
 class BaseLLMAgent(ABC):
@@ -47,8 +135,15 @@ class BaseLLMAgent(ABC):
     - 思考 (think): 分析输入并生成推理
     - 执行 (execute): 根据推理执行具体任务
     - 反思 (reflect): 评估执行结果并提供改进建议
+    
+    LLM 响应按 (system_prompt, prompt, model) 精确匹配缓存在进程级缓存中，
+    相同提示词不会重复请求 LLM。可选挂载语义缓存，在精确缓存未命中时
+    复用语义相近提示词的响应（仅用于分析类调用）。
     """
     
+    # 进程级精确匹配缓存（所有 Agent 实例共享，受条数 / 字节数 / TTL 约束）
+    _response_cache: CacheBackend = ResponseCache(maxsize=512, ttl=3600)
+    
     def __init__(
         self,
         llm: LLMProtocol,
@@ -56,23 +151,165 @@ class BaseLLMAgent(ABC):
         role: str,
         system_prompt: str,
         max_retries: int = 2,
+        cache_enabled: bool = True,
+        semantic_cache: Optional["SemanticCache"] = None,
+        structured_output: bool = False,
+        history_maxlen: Optional[int] = 0,
     ):
         self.llm = llm
         self.name = name
         self.role = role
         self.system_prompt = system_prompt
         self.max_retries = max_retries
-        self.conversation_history: List[AgentMessage] = []
+        self.cache_enabled = cache_enabled
+        self.semantic_cache = semantic_cache
+        # 后端支持 response_format（OpenAI / vLLM guided decoding）时开启，约束模型只输出合法 JSON
+        self.structured_output = structured_output
+        # 对话历史：0 表示不记录，None 表示不限长度，>0 时只保留最近 N 条
+        self.history_maxlen = history_maxlen
+        self.conversation_history: Deque[AgentMessage] = deque(maxlen=history_maxlen)
+        # 当前尝试中写入的缓存键（失败时淘汰，保证重试不会命中坏响应）
+        self._attempt_cache_keys: List[str] = []
+        # 当前尝试中写入或命中的语义缓存响应（失败时一并淘汰）
+        self._attempt_semantic: List[str] = []
+        # 单次 run 内可复用的中间结果（序列化后的输入、格式化好的提示词等），run 之外为 None
+        self._run_context: Optional[Dict[str, Any]] = None
+        
+        logger.info("[%s] Agent 初始化完成，角色: %s", self.name, self.role)
+    
+    def _cache_namespace(
+        self,
+        use_system_prompt: bool,
+        chat_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """缓存分区：系统提示词指纹 + 模型 + 请求参数指纹
         
-        logger.info(f"[{self.name}] Agent 初始化完成，角色: {self.role}")
+        精确缓存与语义缓存共用同一分区，response_format 等请求参数不同的
+        调用（结构化输出与自由文本）不会互相命中。
+        """
+        system = self.system_prompt if use_system_prompt and self.system_prompt else ""
+        model_id = getattr(self.llm, "model", None) or type(self.llm).__name__
+        params = ""
+        if chat_kwargs:
+            params = _prompt_fingerprint(json.dumps(chat_kwargs, sort_keys=True, ensure_ascii=False))
+        return f"{_prompt_fingerprint(system)}:{model_id}:{params}"
+    
+    def _cache_key(
+        self,
+        prompt: str,
+        use_system_prompt: bool,
+        chat_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """计算缓存键：缓存分区 + blake2b(prompt)
+        
+        系统提示词在所有实例间共享且不变，只按指纹参与计算；
+        每次变化的 prompt 用更快的 blake2b 哈希。
+        """
+        digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{self._cache_namespace(use_system_prompt, chat_kwargs)}:{digest}"
+    
+    @classmethod
+    def _cache_get(cls, key: str) -> Optional[str]:
+        return cls._response_cache.get(key)
+    
+    @classmethod
+    def _cache_set(cls, key: str, content: str) -> None:
+        cls._response_cache.set(key, content)
+    
+    @classmethod
+    def _cache_discard(cls, keys: List[str]) -> None:
+        for key in keys:
+            cls._response_cache.delete(key)
     
-    def _call_llm(self, prompt: str, use_system_prompt: bool = True) -> str:
+    def _discard_attempt(self) -> None:
+        """淘汰当前尝试写入或命中的缓存条目，保证重试不会命中同一个坏响应"""
+        self._cache_discard(self._attempt_cache_keys)
+        if self.semantic_cache is not None:
+            for response in self._attempt_semantic:
+                self.semantic_cache.discard(response)
+    
+    @classmethod
+    def clear_response_cache(cls) -> None:
+        """清空进程级 LLM 响应缓存"""
+        cls._response_cache.clear()
+    
+    @classmethod
+    def set_response_cache(cls, backend: CacheBackend) -> None:
+        """替换响应缓存后端（如多进程部署时换成 RedisResponseCache）"""
+        BaseLLMAgent._response_cache = backend
+    
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        """响应缓存统计（hits / misses / bytes 等，取决于后端）"""
+        stats = getattr(cls._response_cache, "stats", None)
+        return stats() if callable(stats) else {}
+    
+    def _call_llm(
+        self,
+        prompt: str,
+        use_system_prompt: bool = True,
+        semantic: bool = False,
+        response_schema: Optional[Dict[str, Any]] = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        record: bool = True,
+        static_prefix: str = "",
+    ) -> str:
         """调用 LLM
         
         自动适配不同 LLM 接口:
         - 如果 LLM 有 chat(messages) 方法，使用 messages 格式
         - 如果 LLM 有 chat(prompt, system_prompt) 方法，使用简单格式
+        
+        启用缓存时，命中精确匹配缓存直接返回，不再请求 LLM。
+        semantic=True 且挂载了语义缓存时，精确缓存未命中后再查语义缓存。
+        执行类调用（需要逐字段对应输入）不要开启 semantic。prompt 以不随输入
+        变化的 static_prefix 开头时，语义缓存只嵌入其后的动态部分，前缀按指纹
+        和系统提示词、模型、请求参数一起划分缓存分区（长前缀会占满 Embedding
+        模型的截断长度，不同输入的向量几乎相同）。
+        开启 structured_output 且传入 response_schema 时，以 response_format
+        要求后端按 JSON Schema 约束解码。
+        传入 on_chunk 且 LLM 支持 chat_stream 时流式请求，每收到一块文本回调一次；
+        缓存命中或不支持流式时，以完整响应回调一次。
+        record=False 时不写入对话历史和本次尝试的缓存键，供与 think / execute
+        并行的后台调用使用（这些状态不加锁，只属于主流程）。
         """
+        chat_kwargs: Dict[str, Any] = {}
+        if self.structured_output and response_schema is not None:
+            chat_kwargs["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": self.name, "schema": response_schema},
+            }
+        
+        cache_key = None
+        if self.cache_enabled:
+            cache_key = self._cache_key(prompt, use_system_prompt, chat_kwargs)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.debug("[%s] 命中 LLM 响应缓存", self.name)
+                if record:
+                    self._record_exchange(prompt, cached, cached=True)
+                    self._attempt_cache_keys.append(cache_key)
+                if on_chunk is not None:
+                    on_chunk(cached)
+                return cached
+        
+        semantic_text = None
+        if semantic and self.semantic_cache is not None:
+            semantic_text = prompt[len(static_prefix):]
+            semantic_namespace = (
+                f"{self._cache_namespace(use_system_prompt, chat_kwargs)}"
+                f":{_prompt_fingerprint(static_prefix)}"
+            )
+            cached = self.semantic_cache.lookup(semantic_text, semantic_namespace)
+            if cached is not None:
+                logger.debug("[%s] 命中语义缓存", self.name)
+                if record:
+                    self._record_exchange(prompt, cached, cached=True)
+                    self._attempt_semantic.append(cached)
+                if on_chunk is not None:
+                    on_chunk(cached)
+                return cached
+        
         try:
             # 构建消息列表
             messages = []
@@ -80,51 +317,138 @@ class BaseLLMAgent(ABC):
                 messages.append({"role": "system", "content": self.system_prompt})
             messages.append({"role": "user", "content": prompt})
             
-            # 尝试使用 messages 格式调用
-            try:
-                response = self.llm.chat(messages)
-                # 处理返回值可能是 dict 或 str
-                if isinstance(response, dict):
-                    content = response.get("content", "")
-                else:
+            chat_stream = getattr(self.llm, "chat_stream", None) if on_chunk is not None else None
+            if chat_stream is not None:
+                # 流式请求：边接收边回调
+                chunks = []
+                for chunk in chat_stream(messages, **chat_kwargs):
+                    chunks.append(chunk)
+                    on_chunk(chunk)
+                content = "".join(chunks)
+            else:
+                # 尝试使用 messages 格式调用
+                try:
+                    response = self.llm.chat(messages, **chat_kwargs)
+                    # 处理返回值可能是 dict 或 str
+                    if isinstance(response, dict):
+                        # 工具调用 / 空消息时 OpenAI 风格客户端返回 content=None
+                        content = response.get("content") or ""
+                    else:
+                        content = str(response)
+                except TypeError:
+                    # 回退到简单格式
+                    system = self.system_prompt if use_system_prompt else None
+                    response = self.llm.chat(prompt, system_prompt=system)
                     content = str(response)
-            except TypeError:
-                # 回退到简单格式
-                system = self.system_prompt if use_system_prompt else None
-                response = self.llm.chat(prompt, system_prompt=system)
-                content = str(response)
+                if on_chunk is not None:
+                    on_chunk(content)
+            
+            if record:
+                self._record_exchange(prompt, content)
             
-            # 记录对话历史
-            self.conversation_history.append(AgentMessage(role="user", content=prompt))
-            self.conversation_history.append(AgentMessage(role="assistant", content=content))
+            if cache_key is not None:
+                self._cache_set(cache_key, content)
+                if record:
+                    self._attempt_cache_keys.append(cache_key)
+            if semantic_text is not None:
+                self.semantic_cache.add(semantic_text, content, semantic_namespace)
+                if record:
+                    self._attempt_semantic.append(content)
             
             return content
         except Exception as e:
-            logger.error(f"[{self.name}] LLM 调用失败: {e}")
+            logger.error("[%s] LLM 调用失败: %s", self.name, e)
             raise
     
-    def _parse_json_response(self, response: str) -> Dict[str, Any]:
-        """从 LLM 响应中解析 JSON"""
-        # 尝试提取 JSON 块
-        json_patterns = [
-            r"```json\s*([\s\S]*?)\s*```",
-            r"```\s*([\s\S]*?)\s*```",
-            r"\{[\s\S]*\}",
+    def _record_exchange(self, prompt: str, content: str, cached: bool = False) -> None:
+        """记录一轮对话（history_maxlen=0 时不记录）"""
+        if self.history_maxlen == 0:
+            return
+        metadata = {"cached": True} if cached else {}
+        self.conversation_history.append(
+            AgentMessage(role="user", content=prompt, metadata=dict(metadata))
+        )
+        self.conversation_history.append(
+            AgentMessage(role="assistant", content=content, metadata=metadata)
+        )
+    
+    def dump_history(self) -> List[Dict[str, Any]]:
+        """导出对话历史（需在初始化时开启 history_maxlen）"""
+        return [
+            {"role": msg.role, "content": msg.content, "metadata": msg.metadata}
+            for msg in self.conversation_history
         ]
+    
+    @staticmethod
+    def _dumps(obj: Any) -> str:
+        """序列化提示词中的 JSON（紧凑格式，减少 token）
         
-        for pattern in json_patterns:
-            match = re.search(pattern, response)
-            if match:
-                try:
-                    json_str = match.group(1) if "```" in pattern else match.group(0)
-                    return json.loads(json_str)
-                except json.JSONDecodeError:
-                    continue
+        安装了 orjson 时使用 orjson，否则回退到标准库的紧凑输出。
+        """
+        if _DEBUG_PROMPTS:
+            return json.dumps(obj, ensure_ascii=False, indent=2)
+        if _orjson is not None:
+            return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    
+    def _resume_json(self, input_data: Dict[str, Any]) -> str:
+        """返回 input_data 的序列化结果，同一次 run 内只序列化一次"""
+        ctx = self._run_context
+        if ctx is None:
+            return self._dumps(input_data)
+        if ctx.get("input") is not input_data:
+            ctx.clear()
+            ctx["input"] = input_data
+            ctx["resume_json"] = self._dumps(input_data)
+        return ctx["resume_json"]
+    
+    def _parse_json_response(self, response: str) -> Dict[str, Any]:
+        """从 LLM 响应中解析 JSON
+        
+        依次尝试：整段解析、代码块、从第一个 '{' 起解码出的完整 JSON 值。
+        同一次 run 内相同响应只解析一次；run 之外每次都重新解析，
+        调用方拿到的结果互不共享，可以放心修改。
+        """
+        memo = None
+        if self._run_context is not None:
+            memo = self._run_context.setdefault("parsed_json", {})
+            cached = memo.get(response)
+            if cached is not None:
+                return cached
+        
+        for parsed in _iter_json_values(response):
+            if memo is not None:
+                if len(memo) >= _PARSED_JSON_CACHE_SIZE:
+                    memo.clear()
+                memo[response] = parsed
+            return parsed
         
         # 如果无法解析，返回原始响应
-        logger.warning(f"[{self.name}] 无法解析 JSON 响应，返回原始文本")
+        logger.warning("[%s] 无法解析 JSON 响应，返回原始文本", self.name)
         return {"raw_response": response}
     
+    def _parse_json_with_repair(
+        self,
+        response: str,
+        response_schema: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """解析 JSON，失败时要求 LLM 只重发 JSON 一次
+        
+        模型输出夹杂说明文字属于确定性失败，重跑整个 think + execute 大概率
+        得到同样的结果；单独追问一次 JSON 只多一次短调用。修复后仍无法解析时
+        调用方应返回 retryable=False 的结果，不再整轮重试。
+        """
+        parsed = self._parse_json_response(response)
+        if "raw_response" not in parsed:
+            return parsed
+        
+        logger.info("[%s] 响应不是合法 JSON，请求重新输出", self.name)
+        repaired = self._call_llm(
+            _JSON_REPAIR_PROMPT.format(response=response[:_JSON_REPAIR_MAX_CHARS]),
+            response_schema=response_schema,
+        )
+        return self._parse_json_response(repaired)
+    
     @abstractmethod
     def think(self, input_data: Dict[str, Any]) -> str:
         """
@@ -164,47 +488,84 @@ class BaseLLMAgent(ABC):
         """
         return result.suggestions
     
-    def run(self, input_data: Dict[str, Any]) -> AgentResult:
+    def run(self, input_data: Dict[str, Any], reasoning: Optional[str] = None) -> AgentResult:
         """
         运行 Agent 的完整流程：Think -> Execute -> Reflect
         
         Args:
             input_data: 输入数据
+            reasoning: 预先完成的思考结果（如与其它阶段并行得到），
+                首次尝试跳过 think 直接使用，重试时重新 think
             
         Returns:
             最终执行结果
         """
-        logger.info(f"[{self.name}] 开始执行任务...")
+        logger.info("[%s] 开始执行任务...", self.name)
+        self._run_context = {}
         
-        for attempt in range(self.max_retries + 1):
-            try:
-                # Step 1: Think
-                logger.debug(f"[{self.name}] 思考阶段 (尝试 {attempt + 1}/{self.max_retries + 1})")
-                reasoning = self.think(input_data)
+        try:
+            for attempt in range(self.max_retries + 1):
+                # 预先给出的 reasoning（如流水线预取的 think）写入的缓存条目属于首次尝试，
+                # 保留下来，execute 失败时一并淘汰，重试的 think 才会重新请求 LLM
+                if attempt > 0 or reasoning is None:
+                    self._attempt_cache_keys = []
+                    self._attempt_semantic = []
+                try:
+                    # Step 1: Think
+                    if reasoning is None:
+                        logger.debug(
+                            "[%s] 思考阶段 (尝试 %d/%d)", self.name, attempt + 1, self.max_retries + 1
+                        )
+                        reasoning = self.think(input_data)
                 
-                # Step 2: Execute
-                logger.debug(f"[{self.name}] 执行阶段")
-                result = self.execute(input_data, reasoning)
+                    # Step 2: Execute
+                    logger.debug("[%s] 执行阶段", self.name)
+                    result = self.execute(input_data, reasoning)
                 
-                if result.success:
-                    # Step 3: Reflect
-                    suggestions = self.reflect(result)
-                    result.suggestions = suggestions
-                    logger.info(f"[{self.name}] 任务完成")
-                    return result
+                    if result.success:
+                        # Step 3: Reflect
+                        suggestions = self.reflect(result)
+                        result.suggestions = suggestions
+                        logger.info("[%s] 任务完成", self.name)
+                        return result
+                
+                    # 失败的响应不能留在缓存里，否则重试会命中同一个坏结果
+                    self._discard_attempt()
+                    if not result.retryable:
+                        logger.warning("[%s] 执行失败且不可重试: %s", self.name, result.error)
+                        return result
+                    reasoning = None
                     
-            except Exception as e:
-                logger.warning(f"[{self.name}] 执行失败 (尝试 {attempt + 1}): {e}")
-                if attempt == self.max_retries:
-                    return AgentResult(
-                        success=False,
-                        data={},
-                        error=str(e)
-                    )
-        
-        return AgentResult(success=False, data={}, error="Max retries exceeded")
+                except Exception as e:
+                    self._discard_attempt()
+                    reasoning = None
+                    logger.warning("[%s] 执行失败 (尝试 %d): %s", self.name, attempt + 1, e)
+                    if attempt == self.max_retries:
+                        return AgentResult(
+                            success=False,
+                            data={},
+                            error=str(e)
+                        )
+            
+            return AgentResult(success=False, data={}, error="Max retries exceeded")
+        finally:
+            self._run_context = None
+            self._attempt_cache_keys = []
+            self._attempt_semantic = []
+    
+    async def athink(self, input_data: Dict[str, Any]) -> str:
+        """异步思考阶段（在线程中执行 think，便于多个 Agent 并发等待 LLM）"""
+        return await asyncio.to_thread(self.think, input_data)
+    
+    async def aexecute(self, input_data: Dict[str, Any], reasoning: str) -> AgentResult:
+        """异步执行阶段"""
+        return await asyncio.to_thread(self.execute, input_data, reasoning)
+    
+    async def arun(self, *args, **kwargs) -> AgentResult:
+        """异步运行完整流程，参数与 run 一致"""
+        return await asyncio.to_thread(self.run, *args, **kwargs)
     
     def reset(self):
         """重置 Agent 状态"""
         self.conversation_history.clear()
-        logger.debug(f"[{self.name}] 状态已重置")
+        logger.debug("[%s] 状态已重置", self.name)
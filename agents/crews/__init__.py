@@ -8,11 +8,35 @@
 使用方式: 通过 workflows.ResumePipeline 调用
 """
 
-# 简历专家
-from .resume import ContentAgent, LayoutAgent
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# 按需导入（PEP 562）：只用到其中一个专家时不加载另一个及其提示词
+_LAZY_IMPORTS = {
+    # 简历专家
+    "ContentAgent": ".resume.content_agent",
+    "LayoutAgent": ".resume.layout_agent",
+}
+
+if TYPE_CHECKING:
+    from .resume.content_agent import ContentAgent
+    from .resume.layout_agent import LayoutAgent
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     "ContentAgent",
     "LayoutAgent",
 ]
-
@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 """Crew 基类 - Agent 团队抽象。"""
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Awaitable, Dict, List, Optional, TYPE_CHECKING, Union
+import asyncio
+import inspect
 import time
 
-from common.logger import get_logger
+from common.async_utils import run_sync
+from common.logger import clock_time, get_logger
 
 if TYPE_CHECKING:
     from core.task import Task, TaskResult
@@ -13,6 +16,9 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# 构建检索查询时依次尝试的输入字段
+_RETRIEVAL_QUERY_KEYS = ("description", "summary", "content", "text")
+
 
 class BaseCrew(ABC):
     """Agent 团队基类
@@ -23,6 +29,9 @@ class BaseCrew(ABC):
     1. 设置 CREW_NAME
     2. 实现 _init_agents() 初始化团队成员
     3. 实现 _execute() 定义工作流
+    
+    _execute 可以是普通方法，也可以是 async 方法；async 实现中可用
+    asyncio.gather 让互不依赖的 Agent 并发执行 athink。
     """
     
     CREW_NAME: str = "BaseCrew"
@@ -38,7 +47,7 @@ class BaseCrew(ABC):
         self._logs: List[str] = []
         
         self._init_agents()
-        logger.info(f"[{self.CREW_NAME}] 初始化完成，共 {len(self.agents)} 个 Agent")
+        logger.info("[%s] 初始化完成，共 %d 个 Agent", self.CREW_NAME, len(self.agents))
     
     @abstractmethod
     def _init_agents(self):
@@ -46,16 +55,17 @@ class BaseCrew(ABC):
         pass
     
     @abstractmethod
-    def _execute(self, task: "Task") -> "TaskResult":
-        """执行任务的具体流程（子类实现）"""
+    def _execute(self, task: "Task") -> Union["TaskResult", Awaitable["TaskResult"]]:
+        """执行任务的具体流程（子类实现，可为 async def）"""
         pass
     
     def run(self, task: "Task") -> "TaskResult":
         """执行任务（完整流程）"""
         from core.task import TaskResult
         
-        self._logs.clear()
-        start_time = time.time()
+        # 每次运行使用新的列表，结果直接持有它，无需复制
+        self._logs = []
+        start_time = time.monotonic()
         
         self._log(f"开始执行任务: {task.name}")
         
@@ -70,41 +80,50 @@ class BaseCrew(ABC):
         # 2. 执行具体流程
         try:
             result = self._execute(task)
-            result.logs = self._logs.copy()
+            if inspect.isawaitable(result):
+                # 已有运行中的事件循环时 run_sync 会改在独立线程中执行
+                result = run_sync(result)
+            result.logs = self._logs
             
-            elapsed = time.time() - start_time
+            elapsed = time.monotonic() - start_time
             self._log(f"任务完成，耗时 {elapsed:.2f}s")
             
             return result
             
         except Exception as e:
-            logger.error(f"[{self.CREW_NAME}] 执行失败: {e}", exc_info=True)
+            logger.error("[%s] 执行失败: %s", self.CREW_NAME, e, exc_info=True)
             return TaskResult(
                 success=False,
                 output=None,
-                logs=self._logs.copy(),
+                logs=self._logs,
                 error=str(e),
             )
     
+    async def arun(self, task: "Task") -> "TaskResult":
+        """异步执行任务（在线程中运行 run，不阻塞事件循环）"""
+        return await asyncio.to_thread(self.run, task)
+    
     def _build_retrieval_query(self, task: "Task") -> str:
         """构建检索查询（子类可重写）"""
-        if isinstance(task.input_data, dict):
-            # 尝试从常见字段构建查询
-            for key in ["description", "summary", "content", "text"]:
-                if key in task.input_data:
-                    return str(task.input_data[key])[:500]
+        data = task.input_data
+        if isinstance(data, dict):
+            # 尝试从常见字段构建查询，命中第一个即返回
+            for key in _RETRIEVAL_QUERY_KEYS:
+                if key in data:
+                    value = data[key]
+                    return (value if isinstance(value, str) else str(value))[:500]
         return task.name
     
     def _log(self, message: str):
         """记录日志"""
-        timestamp = time.strftime("%H:%M:%S")
+        timestamp = clock_time()
         log_entry = f"[{timestamp}] [{self.CREW_NAME}] {message}"
         self._logs.append(log_entry)
-        logger.info(f"[{self.CREW_NAME}] {message}")
+        logger.info("[%s] %s", self.CREW_NAME, message)
     
     def reset(self):
         """重置所有 Agent 状态"""
         for agent in self.agents:
             agent.reset()
-        self._logs.clear()
+        self._logs = []
 
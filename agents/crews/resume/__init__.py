@@ -8,11 +8,34 @@
     result = pipeline.run(input_data=resume_data, job_description="...")
 """
 
-from .content_agent import ContentAgent
-from .layout_agent import LayoutAgent
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# 按需导入（PEP 562）：导入 layout_agent 时不会连带加载 content_agent，反之亦然
+_LAZY_IMPORTS = {
+    "ContentAgent": ".content_agent",
+    "LayoutAgent": ".layout_agent",
+}
+
+if TYPE_CHECKING:
+    from .content_agent import ContentAgent
+    from .layout_agent import LayoutAgent
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     "ContentAgent",
     "LayoutAgent",
 ]
-
@@ -9,27 +9,136 @@ Content Agent - 简历内容优化专家
 - 根据目标职位调整内容侧重点（新增）
 """
 
-from typing import Any, Dict, List, Optional
-import json
+from concurrent.futures import Future
+from functools import lru_cache
+from itertools import chain, islice
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
 import re
+import sys
 
-from agents.base import BaseLLMAgent, AgentResult, LLMProtocol
+from agents.base import (
+    BaseLLMAgent,
+    AgentResult,
+    LLMProtocol,
+    _iter_strings,
+)
+from common.executors import get_executor
+from common.json_schema import compile_validator
+from common.json_stream import JsonObjectStream
 from common.logger import get_logger
 from prompts.content import (
     CONTENT_AGENT_SYSTEM_PROMPT,
-    CONTENT_THINK_PROMPT,
-    CONTENT_EXECUTE_PROMPT,
-    JOB_CONTEXT_TEMPLATE,
+    CONTENT_THINK_STATIC,
+    CONTENT_EXECUTE_STATIC,
+    CONTENT_ANALYSIS_SCHEMA,
+    CONTENT_RESUME_SCHEMA,
     JOB_MATCH_DIMENSION,
     JOB_MATCH_SCORE,
     JOB_KEYWORDS_FIELD,
     JOB_SUMMARY_NOTE,
     JOB_EXP_NOTE,
     JOB_SKILLS_NOTE,
+    render_job_context,
+    render_think_dynamic,
+    render_execute_dynamic,
+    render_execute_patch_dynamic,
 )
 
+if TYPE_CHECKING:
+    from common.semantic_cache import SemanticCache
+
 logger = get_logger(__name__)
 
+# 提示词的静态前缀只随“是否有职位描述”变化，导入时预先渲染，
+# 保证同一模式下每次请求的前缀逐字节一致（便于服务端前缀缓存）
+_THINK_PREFIX = {
+    False: CONTENT_THINK_STATIC.format(
+        job_match_dimension="", job_match_score="", job_keywords_field="",
+    ),
+    True: CONTENT_THINK_STATIC.format(
+        job_match_dimension=JOB_MATCH_DIMENSION,
+        job_match_score=JOB_MATCH_SCORE,
+        job_keywords_field=JOB_KEYWORDS_FIELD,
+    ),
+}
+_EXECUTE_PREFIX = {
+    False: CONTENT_EXECUTE_STATIC.format(
+        job_summary_note="", job_exp_note="", job_skills_note="",
+    ),
+    True: CONTENT_EXECUTE_STATIC.format(
+        job_summary_note=JOB_SUMMARY_NOTE,
+        job_exp_note=JOB_EXP_NOTE,
+        job_skills_note=JOB_SKILLS_NOTE,
+    ),
+}
+
+# 关键词提取提示词：说明在前、职位描述在后，语义缓存只比较职位描述
+_KEYWORD_PROMPT_PREFIX = """请从以下职位描述中提取关键技能和要求词汇，每个关键词用逗号分隔。
+只返回关键词列表，格式如：Python, 机器学习, 数据分析, ...
+
+职位描述：
+"""
+
+# 优化结果按字段校验（导入时编译一次），类型不符的字段保留原值
+_RESUME_FIELD_VALIDATORS = {
+    key: compile_validator(sub)
+    for key, sub in CONTENT_RESUME_SCHEMA["properties"].items()
+}
+_EXPERIENCE_SCHEMA = CONTENT_RESUME_SCHEMA["properties"]["experiences"]["items"]
+_EXPERIENCE_BATCH_SCHEMA = CONTENT_RESUME_SCHEMA["properties"]["experiences"]
+_validate_experience = compile_validator(_EXPERIENCE_SCHEMA)
+
+
+class _KeywordMatcher:
+    """一次扫描找出文本中出现的全部关键词（子串语义，忽略大小写）
+    
+    所有关键词编译成一个按长度降序的交替正则，并用前瞻在每个位置尝试匹配；
+    同一位置只会命中最长的关键词，因此额外记录“被包含的关键词”，
+    命中长词时一并视为命中（如命中 javascript 即同时命中 java）。
+    关键词的小写形式在构造时计算并驻留，匹配时不再逐个 lower()。
+    """
+    
+    def __init__(self, keywords: Tuple[str, ...]):
+        # (原始关键词, 小写关键词)，保持输入顺序
+        self._keywords = tuple((kw, sys.intern(kw.lower())) for kw in keywords if kw)
+        lowered = sorted({low for _, low in self._keywords}, key=len, reverse=True)
+        self._pattern = (
+            re.compile("(?=(" + "|".join(map(re.escape, lowered)) + "))")
+            if lowered else None
+        )
+        self._implied: Dict[str, FrozenSet[str]] = {
+            kw: frozenset(other for other in lowered if other in kw)
+            for kw in lowered
+        }
+    
+    def find(self, text_lower: str) -> FrozenSet[str]:
+        """返回在 text_lower 中出现的关键词（小写）"""
+        if self._pattern is None:
+            return frozenset()
+        hits = {m.group(1) for m in self._pattern.finditer(text_lower)}
+        return frozenset().union(*(self._implied[kw] for kw in hits))
+    
+    def matched(self, text_lower: str) -> List[str]:
+        """返回在 text_lower 中出现的关键词（原始写法，保持输入顺序）"""
+        hits = self.find(text_lower)
+        return [kw for kw, low in self._keywords if low in hits]
+
+
+@lru_cache(maxsize=32)
+def _keyword_matcher(keywords: Tuple[str, ...]) -> _KeywordMatcher:
+    return _KeywordMatcher(keywords)
+
+
+# 常见技术关键词（JD 关键词提取失败时的回退方案）
+_TECH_KEYWORDS = (
+    "Python", "Java", "JavaScript", "Go", "C++", "Rust",
+    "React", "Vue", "Angular", "Node.js", "Django", "Flask",
+    "MySQL", "PostgreSQL", "MongoDB", "Redis", "Kafka",
+    "Docker", "Kubernetes", "AWS", "Azure", "GCP",
+    "机器学习", "深度学习", "NLP", "CV", "AI",
+    "数据分析", "数据挖掘", "大数据", "Spark", "Hadoop",
+)
+
 
 class ContentAgent(BaseLLMAgent):
     """
@@ -43,16 +152,40 @@ class ContentAgent(BaseLLMAgent):
     - 职位匹配优化（新增）
     """
     
-    def __init__(self, llm: LLMProtocol, max_retries: int = 2):
+    # 本地词表在 JD 中命中不少于该数量时，不再调用 LLM 提取关键词
+    KEYWORD_PREFILTER_THRESHOLD: int = 8
+    
+    def __init__(
+        self,
+        llm: LLMProtocol,
+        max_retries: int = 2,
+        cache_enabled: bool = True,
+        semantic_cache: Optional["SemanticCache"] = None,
+        structured_output: bool = False,
+        history_maxlen: Optional[int] = 0,
+        patch_mode: bool = True,
+        stream: bool = False,
+    ):
         super().__init__(
             llm=llm,
             name="ContentAgent",
             role="简历内容优化专家",
             system_prompt=CONTENT_AGENT_SYSTEM_PROMPT,
             max_retries=max_retries,
+            cache_enabled=cache_enabled,
+            semantic_cache=semantic_cache,
+            structured_output=structured_output,
+            history_maxlen=history_maxlen,
         )
+        # 补丁模式：execute 只发送 think 标记的 target_fields，结果在本地合并
+        self.patch_mode = patch_mode
+        # 流式模式：execute 边接收边合并已闭合的顶层字段
+        self.stream = stream
         self._job_description: str = ""
         self._extracted_keywords: List[str] = []
+        self._keywords_future: Optional["Future[List[str]]"] = None
+        # 最近一次 think 的 (原始响应, 解析结果)，供 execute 复用
+        self._last_analysis: Optional[Tuple[str, Dict[str, Any]]] = None
     
     def run(
         self,
@@ -69,91 +202,154 @@ class ContentAgent(BaseLLMAgent):
             AgentResult 包含优化后的数据和建议
         """
         self._job_description = job_description
+        self._extracted_keywords = []
         
-        # 如果有职位描述，先提取关键词
+        # 关键词只在 execute 末尾计算匹配度时用到，与 think / execute 并行提取
         if job_description:
-            self._extracted_keywords = self._extract_job_keywords(job_description)
-            logger.info(f"[{self.name}] 提取到 {len(self._extracted_keywords)} 个目标关键词")
+            self._keywords_future = get_executor("agent-bg", max_workers=4).submit(
+                self._extract_job_keywords, job_description
+            )
         
-        # 调用父类的 run 方法
-        return super().run(resume_data)
+        try:
+            return super().run(resume_data)
+        finally:
+            self._join_job_keywords()
     
-    def think(self, input_data: Dict[str, Any]) -> str:
-        """分析简历内容，识别优化点"""
-        resume_json = json.dumps(input_data, ensure_ascii=False, indent=2)
+    def _join_job_keywords(self) -> List[str]:
+        """等待后台关键词提取完成并返回关键词"""
+        future, self._keywords_future = self._keywords_future, None
+        if future is not None:
+            self._extracted_keywords = future.result()
+            logger.info("[%s] 提取到 %d 个目标关键词", self.name, len(self._extracted_keywords))
+        return self._extracted_keywords
+    
+    def think(self, input_data: Dict[str, Any], *, resume_json: Optional[str] = None) -> str:
+        """分析简历内容，识别优化点
         
-        # 构建提示词（根据是否有职位描述）
-        if self._job_description:
-            job_context = JOB_CONTEXT_TEMPLATE.format(job_description=self._job_description)
-            job_match_dimension = JOB_MATCH_DIMENSION
-            job_match_score = JOB_MATCH_SCORE
-            job_keywords_field = JOB_KEYWORDS_FIELD
+        调用方已有 input_data 的序列化结果时可通过 resume_json 传入，避免重复序列化。
+        """
+        # 思考提示词只依赖输入，重试时直接复用
+        ctx = self._run_context
+        if ctx is not None and ctx.get("think_input") is input_data:
+            prompt = ctx["think_prompt"]
         else:
-            job_context = ""
-            job_match_dimension = ""
-            job_match_score = ""
-            job_keywords_field = ""
+            prompt = self._build_think_prompt(input_data, resume_json)
+            if ctx is not None:
+                ctx["think_input"] = input_data
+                ctx["think_prompt"] = prompt
         
-        prompt = CONTENT_THINK_PROMPT.format(
-            resume_json=resume_json,
-            job_context=job_context,
-            job_match_dimension=job_match_dimension,
-            job_match_score=job_match_score,
-            job_keywords_field=job_keywords_field,
+        response = self._call_llm(
+            prompt,
+            semantic=True,
+            response_schema=CONTENT_ANALYSIS_SCHEMA,
+            static_prefix=_THINK_PREFIX[bool(self._job_description)],
         )
-        
-        response = self._call_llm(prompt)
-        logger.debug(f"[{self.name}] 分析完成")
+        self._last_analysis = None
+        self._analysis_for(response)
+        logger.debug("[%s] 分析完成", self.name)
         
         return response
     
+    def _build_think_prompt(
+        self,
+        input_data: Dict[str, Any],
+        resume_json: Optional[str] = None,
+    ) -> str:
+        """构建思考阶段提示词：静态前缀 + 简历数据"""
+        if resume_json is None:
+            resume_json = self._resume_json(input_data)
+        return _THINK_PREFIX[bool(self._job_description)] + render_think_dynamic(
+            resume_json=resume_json,
+            job_context=self._job_context(),
+        )
+    
+    def _job_context(self) -> str:
+        """渲染职位上下文，同一次 run 内 think 与 execute 共用"""
+        if not self._job_description:
+            return ""
+        ctx = self._run_context
+        if ctx is None:
+            return render_job_context(job_description=self._job_description)
+        value = ctx.get("job_context")
+        if value is None:
+            value = ctx["job_context"] = render_job_context(job_description=self._job_description)
+        return value
+    
     def execute(self, input_data: Dict[str, Any], reasoning: str) -> AgentResult:
         """执行内容优化"""
-        resume_json = json.dumps(input_data, ensure_ascii=False, indent=2)
-        
-        # 构建提示词
-        if self._job_description:
-            job_context = JOB_CONTEXT_TEMPLATE.format(job_description=self._job_description)
-            job_summary_note = JOB_SUMMARY_NOTE
-            job_exp_note = JOB_EXP_NOTE
-            job_skills_note = JOB_SKILLS_NOTE
+        # 构建提示词：静态前缀 + 简历数据和分析结果
+        has_job = bool(self._job_description)
+        job_context = self._job_context()
+        fields = self._target_fields(input_data, reasoning) if self.patch_mode else []
+        if fields:
+            # 只发送需要修改的字段，未列出的字段原样保留
+            schema = {
+                "type": "object",
+                "properties": {
+                    key: CONTENT_RESUME_SCHEMA["properties"].get(key, {}) for key in fields
+                },
+            }
+            prompt = _EXECUTE_PREFIX[has_job] + render_execute_patch_dynamic(
+                resume_json=self._dumps({key: input_data[key] for key in fields}),
+                reasoning=reasoning,
+                job_context=job_context,
+                fields=", ".join(fields),
+            )
         else:
-            job_context = ""
-            job_summary_note = ""
-            job_exp_note = ""
-            job_skills_note = ""
-        
-        prompt = CONTENT_EXECUTE_PROMPT.format(
-            resume_json=resume_json,
-            reasoning=reasoning,
-            job_context=job_context,
-            job_summary_note=job_summary_note,
-            job_exp_note=job_exp_note,
-            job_skills_note=job_skills_note,
-        )
-        
-        response = self._call_llm(prompt)
-        optimized_data = self._parse_json_response(response)
-        
-        # 验证优化结果
-        if "raw_response" in optimized_data:
-            return AgentResult(
-                success=False,
-                data=input_data,
+            schema = CONTENT_RESUME_SCHEMA
+            prompt = _EXECUTE_PREFIX[has_job] + render_execute_dynamic(
+                resume_json=self._resume_json(input_data),
                 reasoning=reasoning,
-                error="无法解析优化结果"
+                job_context=job_context,
             )
         
-        # 合并原始数据和优化数据（保留未优化的字段）
-        merged_data = {**input_data, **optimized_data}
+        merged_data = dict(input_data)
+        parser = JsonObjectStream() if self.stream else None
+        
+        def merge_chunk(chunk: str) -> None:
+            for key, value in parser.feed(chunk):
+                self._merge_field(merged_data, key, value)
+        
+        response = self._call_llm(
+            prompt,
+            response_schema=schema,
+            on_chunk=merge_chunk if parser is not None else None,
+        )
         
-        # 提取建议
-        suggestions = self._extract_suggestions(reasoning)
+        if parser is None or not parser.done or parser.failed:
+            # 非流式，或流式增量解析未能完整解析时，对完整响应整体解析
+            optimized_data = self._parse_json_with_repair(response, schema)
+            
+            # 验证优化结果
+            if "raw_response" in optimized_data:
+                return AgentResult(
+                    success=False,
+                    data=input_data,
+                    reasoning=reasoning,
+                    error="无法解析优化结果",
+                    retryable=False,
+                )
+            
+            if not isinstance(optimized_data, dict):
+                return AgentResult(
+                    success=False,
+                    data=input_data,
+                    reasoning=reasoning,
+                    error="优化结果不是 JSON 对象",
+                    retryable=False,
+                )
+            
+            # 合并原始数据和优化数据（保留未优化的字段及格式不符的字段）
+            merged_data = dict(input_data)
+            for key, value in optimized_data.items():
+                self._merge_field(merged_data, key, value)
         
-        # 如果有职位描述，添加匹配度信息
-        if self._job_description and self._extracted_keywords:
-            match_info = self._calculate_keyword_match(merged_data)
-            suggestions.insert(0, match_info)
+        # 提取建议；如果有职位描述，匹配度信息放在最前
+        match_info = (
+            (self._calculate_keyword_match(merged_data),)
+            if self._job_description and self._join_job_keywords() else ()
+        )
+        suggestions = self._extract_suggestions(reasoning, prefix=match_info)
         
         return AgentResult(
             success=True,
@@ -162,6 +358,33 @@ class ContentAgent(BaseLLMAgent):
             suggestions=suggestions
         )
     
+    def _merge_field(self, merged_data: Dict[str, Any], key: str, value: Any) -> None:
+        """校验后写入单个字段，格式不符时保留原值"""
+        validate = _RESUME_FIELD_VALIDATORS.get(key)
+        errors = validate(value) if validate else []
+        if errors:
+            logger.warning("[%s] 丢弃格式不符的字段 %s: %s", self.name, key, errors[0])
+            return
+        merged_data[key] = value
+    
+    def _target_fields(self, input_data: Dict[str, Any], reasoning: str) -> List[str]:
+        """从分析结果中取出需要修改的顶层字段（仅保留输入中存在的字段）
+        
+        "experiences[0].highlights" 这类路径按顶层字段 experiences 处理。
+        """
+        raw_fields = self._analysis_for(reasoning).get("target_fields")
+        if not isinstance(raw_fields, list):
+            return []
+        
+        fields: List[str] = []
+        for path in raw_fields:
+            if not isinstance(path, str):
+                continue
+            key = path.split(".", 1)[0].split("[", 1)[0].strip()
+            if key in input_data and key not in fields:
+                fields.append(key)
+        return fields
+    
     def _extract_job_keywords(self, job_description: str) -> List[str]:
         """从职位描述中提取关键词
         
@@ -171,74 +394,87 @@ class ContentAgent(BaseLLMAgent):
         Returns:
             关键词列表
         """
+        # 先用本地词表预筛，命中足够多时直接返回，省掉一次 LLM 调用
+        local_keywords = self._simple_keyword_extract(job_description)
+        if len(local_keywords) >= self.KEYWORD_PREFILTER_THRESHOLD:
+            return local_keywords[:20]
+        
         # 使用 LLM 提取关键词
-        prompt = f"""请从以下职位描述中提取关键技能和要求词汇，每个关键词用逗号分隔：
-
-职位描述：
-{job_description}
-
-只返回关键词列表，格式如：Python, 机器学习, 数据分析, ..."""
+        prompt = _KEYWORD_PROMPT_PREFIX + job_description
         
+        # 同一 JD 跨候选人重复出现：精确缓存直接命中，挂载语义缓存时近似 JD 也可复用。
+        # 该调用在后台线程与 think / execute 并行，不写入本次尝试的状态
         try:
-            response = self._call_llm(prompt)
-            keywords = [kw.strip() for kw in response.split(",") if kw.strip()]
-            return keywords[:20]  # 限制数量
+            response = self._call_llm(
+                prompt, semantic=True, record=False, static_prefix=_KEYWORD_PROMPT_PREFIX,
+            )
         except Exception as e:
-            logger.warning(f"[{self.name}] 关键词提取失败: {e}")
+            logger.warning("[%s] 关键词提取失败: %s", self.name, e)
             # 简单的关键词提取回退方案
-            return self._simple_keyword_extract(job_description)
+            return local_keywords
+        
+        # LLM 结果在前，补上本地词表命中的关键词（去重，保持顺序）
+        llm_keywords = (kw.strip() for kw in response.split(","))
+        keywords = dict.fromkeys(chain((kw for kw in llm_keywords if kw), local_keywords))
+        return list(islice(keywords, 20))  # 限制数量
     
     def _simple_keyword_extract(self, text: str) -> List[str]:
         """简单关键词提取（回退方案）"""
-        # 常见技术关键词
-        tech_keywords = [
-            "Python", "Java", "JavaScript", "Go", "C++", "Rust",
-            "React", "Vue", "Angular", "Node.js", "Django", "Flask",
-            "MySQL", "PostgreSQL", "MongoDB", "Redis", "Kafka",
-            "Docker", "Kubernetes", "AWS", "Azure", "GCP",
-            "机器学习", "深度学习", "NLP", "CV", "AI",
-            "数据分析", "数据挖掘", "大数据", "Spark", "Hadoop",
-        ]
-        
-        found = []
-        text_lower = text.lower()
-        for kw in tech_keywords:
-            if kw.lower() in text_lower:
-                found.append(kw)
-        
-        return found
+        return _keyword_matcher(_TECH_KEYWORDS).matched(text.lower())
     
     def _calculate_keyword_match(self, resume_data: Dict[str, Any]) -> str:
         """计算简历与职位关键词的匹配度"""
         if not self._extracted_keywords:
             return ""
         
-        # 将简历内容转为文本
-        resume_text = json.dumps(resume_data, ensure_ascii=False).lower()
-        
-        matched = []
-        for kw in self._extracted_keywords:
-            if kw.lower() in resume_text:
-                matched.append(kw)
-        
+        matcher = _keyword_matcher(tuple(self._extracted_keywords))
+        matched = self._matched_keywords(resume_data, matcher)
         match_rate = len(matched) / len(self._extracted_keywords) * 100
         
         return f"职位关键词匹配度: {match_rate:.0f}% ({len(matched)}/{len(self._extracted_keywords)})"
     
-    def _extract_suggestions(self, reasoning: str) -> List[str]:
-        """从分析中提取改进建议"""
-        try:
-            analysis = self._parse_json_response(reasoning)
-            suggestions = []
-            
-            if "weaknesses" in analysis:
-                suggestions.extend(analysis["weaknesses"])
-            if "opportunities" in analysis:
-                suggestions.extend(analysis["opportunities"])
-            
-            return suggestions[:5]  # 最多返回 5 条建议
-        except Exception:
-            return []
+    def _matched_keywords(self, resume_data: Dict[str, Any], matcher: "_KeywordMatcher") -> List[str]:
+        """返回简历中出现的职位关键词（保持关键词原顺序）"""
+        # 只拼接字符串值（无需 JSON 转义），整体小写一次
+        return matcher.matched("\n".join(_iter_strings(resume_data)).lower())
+    
+    def keyword_match_rates(self, resumes: List[Dict[str, Any]]) -> List[float]:
+        """批量计算多份简历对当前职位关键词的匹配率（0-1）
+        
+        用于同一 JD 批量筛选简历：关键词只编译一次，每份简历单次扫描。
+        需先通过 run(job_description=...) 提取关键词。
+        """
+        keywords = self._join_job_keywords()
+        if not keywords:
+            return [0.0] * len(resumes)
+        
+        matcher = _keyword_matcher(tuple(keywords))
+        return [len(self._matched_keywords(resume, matcher)) / len(keywords) for resume in resumes]
+    
+    def _analysis_for(self, reasoning: str) -> Dict[str, Any]:
+        """返回分析结果的解析字典，think 已解析过的直接复用"""
+        cached = self._last_analysis
+        if cached is not None and cached[0] is reasoning:
+            return cached[1]
+        
+        analysis = self._parse_json_response(reasoning)
+        if not isinstance(analysis, dict):
+            analysis = {}
+        self._last_analysis = (reasoning, analysis)
+        return analysis
+    
+    def _extract_suggestions(self, reasoning: str, prefix: Tuple[str, ...] = ()) -> List[str]:
+        """从分析中提取改进建议（最多 5 条），prefix 中的条目排在最前且不计入上限"""
+        analysis = self._analysis_for(reasoning)
+        weaknesses = analysis.get("weaknesses")
+        opportunities = analysis.get("opportunities")
+        return list(chain(prefix, islice(
+            chain(
+                weaknesses if isinstance(weaknesses, list) else (),
+                opportunities if isinstance(opportunities, list) else (),
+            ),
+            5,
+        )))
     
     def optimize_summary(self, summary: str, context: Dict[str, Any]) -> str:
         """单独优化个人简介"""
@@ -263,18 +499,103 @@ class ContentAgent(BaseLLMAgent):
 
 直接返回优化后的简介文本，不要加任何解释。"""
         
-        return self._call_llm(prompt).strip()
+        return self._call_llm(prompt, semantic=True).strip()
     
     def optimize_experience(self, experience: Dict[str, Any]) -> Dict[str, Any]:
         """单独优化一条工作经历"""
-        job_note = ""
+        return self.optimize_experiences_batch([experience])[0]
+    
+    def optimize_experiences_batch(
+        self,
+        experiences: List[Dict[str, Any]],
+        batch_size: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """批量优化工作经历
+        
+        每 batch_size 条经历合并为一次 LLM 请求，返回同长度的 JSON 数组；
+        批量结果中无效的条目再单独请求一次，仍失败则保留原经历。
+        
+        Args:
+            experiences: 工作经历列表
+            batch_size: 每次请求包含的最大经历数
+            
+        Returns:
+            与输入顺序一致的优化后经历列表
+        """
+        batch_size = max(1, batch_size)
+        optimized: List[Dict[str, Any]] = []
+        for start in range(0, len(experiences), batch_size):
+            chunk = experiences[start:start + batch_size]
+            if len(chunk) == 1:
+                optimized.append(self._optimize_single_experience(chunk[0]))
+                continue
+            
+            results = self._optimize_experience_chunk(chunk)
+            for experience, result in zip(chunk, results):
+                optimized.append(
+                    result if result is not None
+                    else self._optimize_single_experience(experience)
+                )
+        return optimized
+    
+    def _experience_job_note(self, index: int) -> str:
         if self._job_description:
-            job_note = f"\n5. 突出与目标职位相关的经验"
+            return f"\n{index}. 突出与目标职位相关的经验"
+        return ""
+    
+    def _optimize_experience_chunk(
+        self,
+        experiences: List[Dict[str, Any]],
+    ) -> List[Optional[Dict[str, Any]]]:
+        """一次请求优化多条经历，无法解析或格式不符的位置返回 None"""
+        job_note = self._experience_job_note(6)
+        
+        prompt = f"""请优化以下 {len(experiences)} 条工作经历，使用 STAR 法则重构：
+
+```json
+{self._dumps(experiences)}
+```
+
+要求：
+1. 每条 highlight 以强动词开头
+2. 包含具体的量化指标
+3. 突出技术深度和业务价值
+4. 控制在 3-4 条核心成就
+5. 返回的数组必须与输入顺序一致、长度相同{job_note}
+
+返回优化后的 JSON 数组：
+```json
+[
+    {{
+        "company": "公司名",
+        "position": "职位",
+        "period": "时间段",
+        "highlights": ["成就1", "成就2", ...]
+    }}
+]
+```"""
+        
+        response = self._call_llm(prompt, response_schema=_EXPERIENCE_BATCH_SCHEMA)
+        parsed = self._parse_json_response(response)
+        items = parsed if isinstance(parsed, list) else parsed.get("experiences")
+        
+        if not isinstance(items, list) or len(items) != len(experiences):
+            logger.warning("[%s] 批量经历优化结果无效，逐条回退", self.name)
+            return [None] * len(experiences)
+        
+        return [
+            item if isinstance(item, dict) and not _validate_experience(item) else None
+            for item in items
+        ]
+    
+    def _optimize_single_experience(self, experience: Dict[str, Any]) -> Dict[str, Any]:
+        """单条请求优化一条经历，失败时返回原经历"""
+        job_note = self._experience_job_note(5)
         
         prompt = f"""请优化以下工作经历，使用 STAR 法则重构：
 
 ```json
-{json.dumps(experience, ensure_ascii=False, indent=2)}
+{self._dumps(experience)}
 ```
 
 要求：
@@ -293,10 +614,14 @@ class ContentAgent(BaseLLMAgent):
 }}
 ```"""
         
-        response = self._call_llm(prompt)
+        response = self._call_llm(prompt, response_schema=_EXPERIENCE_SCHEMA)
         result = self._parse_json_response(response)
         
-        if "raw_response" in result:
+        if (
+            not isinstance(result, dict)
+            or "raw_response" in result
+            or _validate_experience(result)
+        ):
             return experience
         
         return result
@@ -9,29 +9,66 @@ Layout Agent - 简历布局编排专家
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple
+import hashlib
 import json
 
-from agents.base import BaseLLMAgent, AgentResult, LLMProtocol
+from agents.base import BaseLLMAgent, AgentResult, LLMProtocol, _iter_strings
+from common.json_stream import JsonObjectStream
 from common.logger import get_logger
+from common.prompt_template import PromptTemplate
+from common.response_cache import CacheBackend, ResponseCache
 from resume_copilot.domain import normalize_resume_data
 from prompts.layout import (
     LAYOUT_AGENT_SYSTEM_PROMPT,
-    LAYOUT_THINK_PROMPT,
-    LAYOUT_EXECUTE_PROMPT,
+    LAYOUT_THINK_STATIC,
+    LAYOUT_THINK_DYNAMIC_FMT,
+    LAYOUT_EXECUTE_STATIC,
+    LAYOUT_EXECUTE_DYNAMIC_FMT,
+    LAYOUT_COMBINED_STATIC,
     LAYOUT_CONTENT_TRIM_PROMPT,
 )
 
+if TYPE_CHECKING:
+    from common.semantic_cache import SemanticCache
+
 logger = get_logger(__name__)
 
 
-@dataclass
+# 提示词静态前缀导入时预先渲染，保证每次请求逐字节一致（便于服务端前缀缓存）
+_THINK_PREFIX = LAYOUT_THINK_STATIC.format()
+_EXECUTE_PREFIX = LAYOUT_EXECUTE_STATIC.format()
+_COMBINED_PREFIX = LAYOUT_COMBINED_STATIC.format()
+_THINK_DYNAMIC_TMPL = PromptTemplate(LAYOUT_THINK_DYNAMIC_FMT)
+_EXECUTE_DYNAMIC_TMPL = PromptTemplate(LAYOUT_EXECUTE_DYNAMIC_FMT)
+
+_DEFAULT_SECTION_ORDER = ("header", "summary", "experience", "projects", "education", "skills")
+
+
+def _freeze(value: Any) -> Any:
+    """把嵌套 dict / list 转为只读的 MappingProxyType / tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """把只读映射 / tuple 还原为可修改的 dict / list（深拷贝）"""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+@dataclass(slots=True)
 class LayoutConfig:
     """布局配置"""
     # 章节顺序
-    section_order: List[str] = field(default_factory=lambda: [
-        "header", "summary", "experience", "projects", "education", "skills"
-    ])
+    section_order: List[str] = field(default_factory=lambda: list(_DEFAULT_SECTION_ORDER))
     
     # 布局风格
     style: str = "modern"  # modern, classic, minimal, creative
@@ -63,6 +100,126 @@ class LayoutConfig:
     max_highlights_per_item: int = 4
 
 
+# 样式预设（紧凑版，适合一页简历），无需调用 LLM；只读，取用时复制
+STYLE_PRESETS: Mapping[str, Mapping[str, Any]] = _freeze({
+    "modern": {
+        "style": "modern",
+        "color_scheme": "professional",
+        "font_config": {
+            "title_size": 16, "heading_size": 10, "subheading_size": 9,
+            "body_size": 9, "small_size": 8,
+        },
+        "spacing_config": {"margin": 0.4, "section_gap": 4, "item_gap": 1},
+        "visual_elements": {"use_icons": True, "use_skill_bars": True, "use_timeline": False},
+    },
+    "classic": {
+        "style": "classic",
+        "color_scheme": "monochrome",
+        "font_config": {
+            "title_size": 14, "heading_size": 11, "subheading_size": 10,
+            "body_size": 10, "small_size": 9,
+        },
+        "spacing_config": {"margin": 0.5, "section_gap": 6, "item_gap": 2},
+        "visual_elements": {"use_icons": False, "use_skill_bars": False, "use_timeline": False},
+    },
+    "minimal": {
+        "style": "minimal",
+        "color_scheme": "elegant",
+        "font_config": {
+            "title_size": 14, "heading_size": 10, "subheading_size": 9,
+            "body_size": 9, "small_size": 8,
+        },
+        "spacing_config": {"margin": 0.4, "section_gap": 4, "item_gap": 1},
+        "visual_elements": {"use_icons": False, "use_skill_bars": False, "use_timeline": False},
+    },
+    "creative": {
+        "style": "modern",
+        "color_scheme": "vibrant",
+        "font_config": {
+            "title_size": 18, "heading_size": 11, "subheading_size": 10,
+            "body_size": 9, "small_size": 8,
+        },
+        "spacing_config": {"margin": 0.5, "section_gap": 6, "item_gap": 2},
+        "visual_elements": {"use_icons": True, "use_skill_bars": True, "use_timeline": True},
+    },
+})
+
+
+def _build_default_config(section_order: Tuple[str, ...]) -> Mapping[str, Any]:
+    """构建只读的默认布局配置"""
+    return _freeze({
+        "section_order": section_order,
+        "style": "modern",
+        "color_scheme": "executive",
+        "font_config": {
+            "family": "Microsoft YaHei",
+            "title_size": 20,          # 更有存在感的姓名标题
+            "heading_size": 11,
+            "subheading_size": 10,
+            "body_size": 9,             # 正文
+            "small_size": 8,
+        },
+        "spacing_config": {
+            "margin": 0.45,
+            "section_gap": 6,
+            "item_gap": 2,
+            "line_height": 1.08,
+        },
+        "visual_elements": {
+            "use_icons": False,
+            "use_skill_bars": True,
+            "use_timeline": False,
+            "highlight_keywords": True,
+        },
+        "content_limits": {
+            "compact_mode": True,
+            "max_experiences": 3,
+            "max_projects": 2,
+            "max_highlights_per_item": 3,
+        },
+        "design_notes": "Executive editorial layout with stronger hierarchy and cleaner spacing."
+    })
+
+
+# LLM 布局配置不可用时的默认配置，按是否应届生预先构建；只读，取用时复制
+_FRESH_GRAD_SECTION_ORDER = ("header", "summary", "education", "projects", "experience", "skills")
+_DEFAULT_CONFIGS: Mapping[bool, Mapping[str, Any]] = MappingProxyType({
+    True: _build_default_config(_FRESH_GRAD_SECTION_ORDER),
+    False: _build_default_config(_DEFAULT_SECTION_ORDER),
+})
+
+
+def _experiences_of(resume_data: Dict[str, Any]) -> List[Any]:
+    """读取经历列表（兼容 experience / experiences 两种字段名）"""
+    experiences = (
+        resume_data.get("experience") if "experience" in resume_data
+        else resume_data.get("experiences")
+    )
+    return experiences or []
+
+
+def _is_fresh_grad(experiences: List[Any]) -> bool:
+    """没有经历，或只有一段实习经历，按应届生处理"""
+    return len(experiences) == 0 or (
+        len(experiences) == 1
+        and any("实习" in text for text in _iter_strings(experiences[0]))
+    )
+
+
+def _layout_fingerprint(resume_data: Dict[str, Any]) -> str:
+    """简历结构指纹：各章节条数 + 是否有简介 + 职业阶段，与具体文字无关"""
+    experiences = _experiences_of(resume_data)
+    shape = (
+        len(experiences),
+        len(resume_data.get("projects") or ()),
+        len(resume_data.get("education") or ()),
+        len(resume_data.get("skills") or ()),
+        bool(resume_data.get("summary")),
+        _is_fresh_grad(experiences),
+    )
+    return hashlib.blake2b(repr(shape).encode(), digest_size=16).hexdigest()
+
+
 class LayoutAgent(BaseLLMAgent):
     """
     简历布局编排 Agent
@@ -72,43 +229,132 @@ class LayoutAgent(BaseLLMAgent):
     - 视觉层次设计
     - 内容密度调整
     - 样式配置生成
+    
+    开启 structural_cache 后，布局配置按简历结构指纹缓存：结构相同的简历
+    （各章节条数、职业阶段一致）直接复用配置，只在本地按实际内容精简。
+    
+    开启 fused 后，think 用一次 LLM 调用同时产出分析结果和布局配置，
+    execute 直接使用该配置，简历 JSON 只发送一次；合并输出不完整时
+    execute 退回单独生成配置。
+    
+    开启 stream 后，execute 流式接收布局配置，边接收边解析已闭合的顶层字段。
     """
     
-    def __init__(self, llm: LLMProtocol, max_retries: int = 2):
+    # 结构缓存（所有实例共享）：结构指纹 -> 布局配置 JSON
+    _layout_cache: CacheBackend = ResponseCache(maxsize=256, ttl=None)
+    
+    def __init__(
+        self,
+        llm: LLMProtocol,
+        max_retries: int = 2,
+        cache_enabled: bool = True,
+        semantic_cache: Optional["SemanticCache"] = None,
+        history_maxlen: Optional[int] = 0,
+        structural_cache: bool = False,
+        fused: bool = False,
+        stream: bool = False,
+    ):
         super().__init__(
             llm=llm,
             name="LayoutAgent",
             role="简历布局编排专家",
             system_prompt=LAYOUT_AGENT_SYSTEM_PROMPT,
             max_retries=max_retries,
+            cache_enabled=cache_enabled,
+            semantic_cache=semantic_cache,
+            history_maxlen=history_maxlen,
         )
+        self.structural_cache = structural_cache
+        self.fused = fused
+        self.stream = stream
+        # 合并调用的结果：(简历 JSON, 分析结果, 布局配置)，由下一次 execute 取用
+        self._fused_result: Optional[Tuple[str, str, Dict[str, Any]]] = None
+    
+    def run(self, input_data: Dict[str, Any], reasoning: Optional[str] = None) -> AgentResult:
+        """运行布局流程；结构缓存命中时不调用 LLM"""
+        if self.structural_cache:
+            cached = self._layout_cache.get(_layout_fingerprint(input_data))
+            if cached is not None:
+                logger.debug("[%s] 命中结构缓存", self.name)
+                return self._layout_result(input_data, json.loads(cached), reasoning or "")
+        return super().run(input_data, reasoning=reasoning)
     
-    def think(self, input_data: Dict[str, Any]) -> str:
-        """分析简历内容，确定布局策略"""
-        resume_json = json.dumps(input_data, ensure_ascii=False, indent=2)
-        prompt = LAYOUT_THINK_PROMPT.format(resume_json=resume_json)
+    def think(self, input_data: Dict[str, Any], *, resume_json: Optional[str] = None) -> str:
+        """分析简历内容，确定布局策略
         
-        response = self._call_llm(prompt)
-        logger.debug(f"[{self.name}] 布局分析完成")
+        调用方已有 input_data 的序列化结果时可通过 resume_json 传入，避免重复序列化。
+        """
+        if resume_json is None:
+            resume_json = self._resume_json(input_data)
+        if self.fused:
+            return self._think_fused(resume_json)
+        prompt = _THINK_PREFIX + _THINK_DYNAMIC_TMPL.render(resume_json=resume_json)
+        
+        response = self._call_llm(prompt, semantic=True, static_prefix=_THINK_PREFIX)
+        logger.debug("[%s] 布局分析完成", self.name)
         
         return response
     
+    def _think_fused(self, resume_json: str) -> str:
+        """一次调用完成分析与配置生成，配置暂存给 execute"""
+        prompt = _COMBINED_PREFIX + _THINK_DYNAMIC_TMPL.render(resume_json=resume_json)
+        response = self._call_llm(prompt, semantic=True, static_prefix=_COMBINED_PREFIX)
+        parsed = self._parse_json_response(response)
+        
+        # 顶层为数组等非对象响应同样视为不完整
+        layout_config = parsed.get("layout_config") if isinstance(parsed, dict) else None
+        if not isinstance(layout_config, dict):
+            # 合并输出不完整：原始响应作为分析结果，execute 再单独生成配置
+            logger.debug("[%s] 合并响应缺少 layout_config，退回两步调用", self.name)
+            return response
+        
+        reasoning = self._dumps(parsed.get("analysis", {}))
+        self._fused_result = (resume_json, reasoning, layout_config)
+        logger.debug("[%s] 布局分析与配置生成完成", self.name)
+        return reasoning
+    
     def execute(self, input_data: Dict[str, Any], reasoning: str) -> AgentResult:
         """生成布局配置"""
-        resume_json = json.dumps(input_data, ensure_ascii=False, indent=2)
-        prompt = LAYOUT_EXECUTE_PROMPT.format(
-            resume_json=resume_json,
-            reasoning=reasoning
-        )
+        resume_json = self._resume_json(input_data)
+        fused, self._fused_result = self._fused_result, None
         
-        response = self._call_llm(prompt)
-        layout_config = self._parse_json_response(response)
+        if fused is not None and fused[0] == resume_json and fused[1] == reasoning:
+            layout_config = fused[2]
+        else:
+            prompt = _EXECUTE_PREFIX + _EXECUTE_DYNAMIC_TMPL.render(
+                resume_json=resume_json,
+                reasoning=reasoning
+            )
+            parser = JsonObjectStream() if self.stream else None
+            streamed: Dict[str, Any] = {}
+            
+            def collect_chunk(chunk: str) -> None:
+                streamed.update(parser.feed(chunk))
+            
+            response = self._call_llm(
+                prompt, on_chunk=collect_chunk if parser is not None else None
+            )
+            if parser is not None and parser.done and not parser.failed:
+                layout_config = streamed
+            else:
+                # 非流式，或流式增量解析未能完整解析时，对完整响应整体解析
+                layout_config = self._parse_json_response(response)
         
-        if "raw_response" in layout_config:
-            # 使用默认配置
+        if not isinstance(layout_config, dict) or "raw_response" in layout_config:
+            # 解析失败或不是 JSON 对象，使用默认配置
             layout_config = self._get_default_config(input_data)
+        elif self.structural_cache:
+            self._layout_cache.set(_layout_fingerprint(input_data), self._dumps(layout_config))
         
-        # 根据配置精简内容
+        return self._layout_result(input_data, layout_config, reasoning)
+    
+    def _layout_result(
+        self,
+        input_data: Dict[str, Any],
+        layout_config: Dict[str, Any],
+        reasoning: str,
+    ) -> AgentResult:
+        """按布局配置精简内容并组装结果"""
         trimmed_data = self._trim_content(input_data, layout_config)
         
         return AgentResult(
@@ -123,52 +369,10 @@ class LayoutAgent(BaseLLMAgent):
     
     def _get_default_config(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
         """根据简历内容生成默认配置"""
-        # 判断职业阶段
-        normalized_resume = normalize_resume_data(resume_data)
-        experiences = normalized_resume.get("experience", [])
-        education = normalized_resume.get("education", [])
-        
-        is_fresh_grad = len(experiences) == 0 or (
-            len(experiences) == 1 and "实习" in str(experiences)
-        )
-        
-        if is_fresh_grad:
-            section_order = ["header", "summary", "education", "projects", "experience", "skills"]
-        else:
-            section_order = ["header", "summary", "experience", "projects", "education", "skills"]
+        # 判断职业阶段：只读取经历字段，无需深拷贝整份简历做规范化
+        is_fresh_grad = _is_fresh_grad(_experiences_of(resume_data or {}))
         
-        return {
-            "section_order": section_order,
-            "style": "modern",
-            "color_scheme": "executive",
-            "font_config": {
-                "family": "Microsoft YaHei",
-                "title_size": 20,          # 更有存在感的姓名标题
-                "heading_size": 11,
-                "subheading_size": 10,
-                "body_size": 9,             # 正文
-                "small_size": 8,
-            },
-            "spacing_config": {
-                "margin": 0.45,
-                "section_gap": 6,
-                "item_gap": 2,
-                "line_height": 1.08,
-            },
-            "visual_elements": {
-                "use_icons": False,
-                "use_skill_bars": True,
-                "use_timeline": False,
-                "highlight_keywords": True,
-            },
-            "content_limits": {
-                "compact_mode": True,
-                "max_experiences": 3,
-                "max_projects": 2,
-                "max_highlights_per_item": 3,
-            },
-            "design_notes": "Executive editorial layout with stronger hierarchy and cleaner spacing."
-        }
+        return _thaw(_DEFAULT_CONFIGS[is_fresh_grad])
     
     def _trim_content(
         self,
@@ -181,21 +385,18 @@ class LayoutAgent(BaseLLMAgent):
         max_proj = limits.get("max_projects", 3)
         max_highlights = limits.get("max_highlights_per_item", 4)
         
-        trimmed = normalize_resume_data(resume_data.copy())
+        # normalize_resume_data 返回深拷贝，之后原地截断不会影响调用方数据
+        trimmed = normalize_resume_data(resume_data)
         
-        # 精简经历
-        if "experience" in trimmed:
-            trimmed["experience"] = trimmed["experience"][:max_exp]
-            for exp in trimmed["experience"]:
-                if "highlights" in exp:
-                    exp["highlights"] = exp["highlights"][:max_highlights]
-        
-        # 精简项目
-        if "projects" in trimmed:
-            trimmed["projects"] = trimmed["projects"][:max_proj]
-            for proj in trimmed["projects"]:
-                if "highlights" in proj:
-                    proj["highlights"] = proj["highlights"][:max_highlights]
+        # 精简经历和项目：原地删除超出部分，不再为切片分配新列表
+        for section, max_items in (("experience", max_exp), ("projects", max_proj)):
+            items = trimmed.get(section)
+            if not isinstance(items, list):
+                continue
+            del items[max_items:]
+            for item in items:
+                if isinstance(item, dict) and isinstance(item.get("highlights"), list):
+                    del item["highlights"][max_highlights:]
         
         return trimmed
     
@@ -213,12 +414,22 @@ class LayoutAgent(BaseLLMAgent):
         
         return notes
     
-    def suggest_improvements(self, resume_data: Dict[str, Any]) -> List[str]:
-        """为简历布局提供改进建议"""
+    def suggest_improvements(
+        self,
+        resume_data: Dict[str, Any],
+        *,
+        resume_json: Optional[str] = None,
+    ) -> List[str]:
+        """为简历布局提供改进建议
+        
+        调用方已有 resume_data 的序列化结果时可通过 resume_json 传入，避免重复序列化。
+        """
+        if resume_json is None:
+            resume_json = self._dumps(resume_data)
         prompt = f"""请为以下简历的布局和视觉呈现提供 5 条专业改进建议：
 
 ```json
-{json.dumps(resume_data, ensure_ascii=False, indent=2)}
+{resume_json}
 ```
 
 关注点：
@@ -237,48 +448,5 @@ class LayoutAgent(BaseLLMAgent):
     
     def generate_style_config(self, style_preference: str = "modern") -> Dict[str, Any]:
         """根据偏好生成样式配置（紧凑版，适合一页简历）"""
-        style_presets = {
-            "modern": {
-                "style": "modern",
-                "color_scheme": "professional",
-                "font_config": {
-                    "title_size": 16, "heading_size": 10, "subheading_size": 9,
-                    "body_size": 9, "small_size": 8,
-                },
-                "spacing_config": {"margin": 0.4, "section_gap": 4, "item_gap": 1},
-                "visual_elements": {"use_icons": True, "use_skill_bars": True, "use_timeline": False},
-            },
-            "classic": {
-                "style": "classic",
-                "color_scheme": "monochrome",
-                "font_config": {
-                    "title_size": 14, "heading_size": 11, "subheading_size": 10,
-                    "body_size": 10, "small_size": 9,
-                },
-                "spacing_config": {"margin": 0.5, "section_gap": 6, "item_gap": 2},
-                "visual_elements": {"use_icons": False, "use_skill_bars": False, "use_timeline": False},
-            },
-            "minimal": {
-                "style": "minimal",
-                "color_scheme": "elegant",
-                "font_config": {
-                    "title_size": 14, "heading_size": 10, "subheading_size": 9,
-                    "body_size": 9, "small_size": 8,
-                },
-                "spacing_config": {"margin": 0.4, "section_gap": 4, "item_gap": 1},
-                "visual_elements": {"use_icons": False, "use_skill_bars": False, "use_timeline": False},
-            },
-            "creative": {
-                "style": "modern",
-                "color_scheme": "vibrant",
-                "font_config": {
-                    "title_size": 18, "heading_size": 11, "subheading_size": 10,
-                    "body_size": 9, "small_size": 8,
-                },
-                "spacing_config": {"margin": 0.5, "section_gap": 6, "item_gap": 2},
-                "visual_elements": {"use_icons": True, "use_skill_bars": True, "use_timeline": True},
-            },
-        }
-        
-        return style_presets.get(style_preference, style_presets["modern"])
+        return _thaw(STYLE_PRESETS.get(style_preference, STYLE_PRESETS["modern"]))
 
@@ -18,6 +18,8 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```", re.IGNORECASE)
+
 __all__ = ["PlanExecuteReflectAgent", "PERAgent"]
 
 
@@ -261,7 +263,7 @@ class PlanExecuteReflectAgent:
         except json.JSONDecodeError:
             pass
 
-        fenced = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", text, re.IGNORECASE)
+        fenced = _JSON_FENCE_RE.search(text)
         if fenced:
             try:
                 data = json.loads(fenced.group(1))
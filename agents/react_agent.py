@@ -3,26 +3,72 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import copy
+import hashlib
 import os
 import platform
 import json
+from itertools import islice
 from string import Template
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Protocol
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Protocol, Tuple
 
-from common import get_logger
+from common import get_executor, get_logger, run_sync
 from core.message import Conversation
-from core.parser import ToolCall, parse_tool_calls
-from prompts import REACT_SYSTEM_PROMPT
+from core.parser import ActionStreamScanner, ToolCall, parse_tool_calls
+from prompts import REACT_SUMMARY_PROMPT, REACT_SYSTEM_PROMPT
 
 if TYPE_CHECKING:
+    from common.response_cache import CacheBackend
+    from common.semantic_cache import SemanticCache
     from memory import MemoryManager
     from tools import ToolRegistry
     from tools.base import BaseTool
 
 logger = get_logger(__name__)
 
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 __all__ = ["ReactAgent"]
 
+_SYSTEM_PROMPT_TEMPLATE = Template(REACT_SYSTEM_PROMPT)
+_SUMMARY_PROMPT_TEMPLATE = Template(REACT_SUMMARY_PROMPT)
+
+_OS_NAME = {
+    "Darwin": "macOS",
+    "Windows": "Windows",
+    "Linux": "Linux",
+}.get(platform.system(), "Unknown")
+
+# Upper bound on threads used for one round of concurrent I/O-bound tool calls
+_MAX_TOOL_WORKERS = 8
+
+# Set while a call runs on a tool worker; contextvars follow asyncio.to_thread and
+# run_sync, so an agent nested under a tool sees it whichever thread it lands on
+_in_tool_worker: contextvars.ContextVar[bool] = contextvars.ContextVar("in_tool_worker", default=False)
+
+
+def _dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Serialize to a JSON string, with orjson when it is installed.
+
+    Values json cannot encode fall back to ``str`` in both paths.
+    """
+    if _orjson is not None:
+        option = _orjson.OPT_NON_STR_KEYS | (_orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return _orjson.dumps(obj, default=str, option=option).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys, default=str)
+
+
+def _loads(text: str) -> Any:
+    """Parse a JSON string, with orjson when it is installed."""
+    if _orjson is not None:
+        return _orjson.loads(text)
+    return json.loads(text)
+
 
 class LLMProtocol(Protocol):
     """Protocol for chat-based LLM clients."""
@@ -45,6 +91,11 @@ class ReactAgent:
         use_memory_context: bool = True,
         auto_finish: bool = True,
         max_stall_rounds: int = 2,
+        response_cache: Optional["CacheBackend"] = None,
+        semantic_cache: Optional["SemanticCache"] = None,
+        stream: bool = False,
+        context_window: Optional[int] = None,
+        summary_interval: int = 4,
     ):
         self.llm = llm
         self.max_rounds = max(1, max_rounds)
@@ -53,10 +104,26 @@ class ReactAgent:
         self.use_memory_context = use_memory_context
         self.auto_finish = auto_finish
         self.max_stall_rounds = max(1, max_stall_rounds)
+        # Exact cache keyed on the full request (messages, tool specs, model);
+        # the semantic cache is only consulted for the opening turn of a conversation.
+        self.response_cache = response_cache
+        self.semantic_cache = semantic_cache
+        # Stream text-mode rounds and stop generating once a complete Action call arrives
+        self.stream = stream
+        # Send only the last ``context_window`` messages verbatim; older ones are
+        # folded into a running summary once ``summary_interval`` of them pile up.
+        self.context_window = max(1, context_window) if context_window else None
+        self.summary_interval = max(1, summary_interval)
+        self._summary = ""
+        self._summarized_upto = 0
 
         self.tool_registry = self._init_registry(tools, tool_registry)
         self.conversation = Conversation()
         self._system_prompt: Optional[str] = None
+        # (registry version, project directory, directory mtime) -> prompt without memory context
+        self._base_prompt_cache: Optional[Tuple[Tuple[Any, ...], str]] = None
+        # (registry version, tool list); survives file-list changes that miss the prompt cache
+        self._tool_list_cache: Optional[Tuple[int, str]] = None
 
         memory_status = "enabled" if memory else "disabled"
         logger.info(
@@ -82,7 +149,7 @@ class ReactAgent:
 
     def run(self, user_input: str) -> str:
         """Run one request through the ReAct loop."""
-        logger.info(f"Handling user input: {user_input}")
+        logger.info("Handling user input: %s", user_input)
 
         if self.memory:
             self.memory.add_conversation("user", user_input, importance=0.4)
@@ -94,12 +161,12 @@ class ReactAgent:
         stall_rounds = 0
 
         for round_num in range(1, self.max_rounds + 1):
-            logger.info(f"Round {round_num}/{self.max_rounds}")
+            logger.info("Round %d/%d", round_num, self.max_rounds)
 
             try:
                 response = self._think()
             except Exception as exc:
-                logger.error(f"LLM call failed: {exc}", exc_info=True)
+                logger.error("LLM call failed: %s", exc, exc_info=True)
                 if self.memory:
                     self.memory.add_task_result(
                         task=user_input[:100],
@@ -110,12 +177,12 @@ class ReactAgent:
                 return f"Error while processing request: {exc}"
 
             content = response.get("content") or ""
-            logger.info(f"LLM response: {content[:200]}...")
+            logger.info("LLM response: %.200s...", content)
 
             tool_calls = parse_tool_calls(response)
             if tool_calls:
                 self.conversation.add_assistant(content, self._serialize_tool_calls(tool_calls))
-                logger.info(f"Executing {len(tool_calls)} tool call(s)")
+                logger.info("Executing %d tool call(s)", len(tool_calls))
                 self._execute_tools(tool_calls)
                 previous_non_tool_content = ""
                 stall_rounds = 0
@@ -154,6 +221,40 @@ class ReactAgent:
 
         return "Reached max rounds; task may be incomplete."
 
+    async def arun(self, user_input: str) -> str:
+        """Async variant of run; the blocking loop runs in a worker thread."""
+        return await asyncio.to_thread(self.run, user_input)
+
+    async def arun_many(self, inputs: List[str], max_concurrency: int = 4) -> List[str]:
+        """Run independent requests concurrently, each in its own conversation.
+
+        At most ``max_concurrency`` requests wait on the LLM at once. Results
+        are returned in input order; this agent's own conversation is untouched.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _run_one(user_input: str) -> str:
+            async with semaphore:
+                return await self._fork().arun(user_input)
+
+        return list(await asyncio.gather(*(_run_one(text) for text in inputs)))
+
+    def _fork(self) -> "ReactAgent":
+        """Shallow copy sharing llm and tools, with a fresh conversation.
+
+        Memory keeps its backends but moves to a new session, so concurrent
+        requests neither write into nor read back each other's turns.
+        """
+        clone = copy.copy(self)
+        clone.conversation = Conversation()
+        clone._system_prompt = None
+        clone._summary = ""
+        clone._summarized_upto = 0
+        if self.memory is not None:
+            clone.memory = copy.copy(self.memory)
+            clone.memory.new_session()
+        return clone
+
     def _is_final_answer(self, content: str) -> bool:
         return "final_answer" in (content or "").lower()
 
@@ -174,6 +275,8 @@ class ReactAgent:
         """Reset in-memory conversation state."""
         self.conversation.clear()
         self._system_prompt = None
+        self._summary = ""
+        self._summarized_upto = 0
         if new_session and self.memory:
             self.memory.new_session()
             logger.info("Started a new memory session")
@@ -181,26 +284,184 @@ class ReactAgent:
     def _think(self) -> Dict[str, Any]:
         messages = [{"role": "system", "content": self._system_prompt}]
         use_native = self._supports_native_tool_calling() and len(self.tool_registry) > 0
-        messages.extend(self.conversation.to_list(compatible=not use_native))
+        messages.extend(self._windowed_history(compatible=not use_native))
 
+        chat_kwargs: Dict[str, Any] = {}
         if use_native:
-            return self.llm.chat(
-                messages,
-                tools=self.tool_registry.as_function_specs(),
-                tool_choice="auto",
-            )
-        return self.llm.chat(messages)
+            chat_kwargs = {
+                "tools": self.tool_registry.as_function_specs(),
+                "tool_choice": "auto",
+            }
+
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self._response_cache_key(messages, chat_kwargs)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("LLM response cache hit")
+                return _loads(cached)
+
+        semantic_text = None
+        if self.semantic_cache is not None and len(self.conversation) == 1:
+            semantic_text = f"{self._system_prompt}\n{messages[-1]['content']}"
+            cached = self.semantic_cache.lookup(semantic_text)
+            if cached is not None:
+                logger.debug("LLM semantic cache hit")
+                return _loads(cached)
+
+        if self.stream and not chat_kwargs and hasattr(self.llm, "chat_stream"):
+            response = self._chat_until_action(messages)
+        else:
+            response = self.llm.chat(messages, **chat_kwargs)
+
+        if isinstance(response, dict) and (cache_key is not None or semantic_text is not None):
+            serialized = _dumps(response)
+            if cache_key is not None:
+                self.response_cache.set(cache_key, serialized)
+            if semantic_text is not None:
+                self.semantic_cache.add(semantic_text, serialized)
+        return response
+
+    def _windowed_history(self, compatible: bool) -> List[Dict[str, Any]]:
+        """Conversation history to send, bounded by ``context_window``.
+
+        Messages that fall out of the window are sent verbatim until
+        ``summary_interval`` of them have accumulated, then summarized in one
+        LLM call. The summary goes out as a system message ahead of the rest.
+        """
+        history = self.conversation.to_list(compatible=compatible)
+        if self.context_window is None:
+            return history
+        if self._summarized_upto > len(history):
+            # conversation was cleared or replaced underneath us
+            self._summary = ""
+            self._summarized_upto = 0
+
+        cut = max(0, len(history) - self.context_window)
+        # never open the window on tool results detached from their call
+        while cut < len(history) and history[cut]["role"] == "tool":
+            cut += 1
+        if cut - self._summarized_upto >= self.summary_interval:
+            summary = self._summarize(history[self._summarized_upto:cut])
+            if summary:
+                self._summary = summary
+                self._summarized_upto = cut
+
+        recent = history[self._summarized_upto:]
+        if not self._summary:
+            return recent
+        return [{"role": "system", "content": f"Prior context summary:\n{self._summary}"}, *recent]
+
+    def _summarize(self, evicted: List[Dict[str, Any]]) -> str:
+        """Fold evicted messages into the running summary; empty string on failure."""
+        transcript = "\n".join(f"[{m['role']}] {m.get('content') or m.get('tool_calls') or ''}" for m in evicted)
+        prompt = _SUMMARY_PROMPT_TEMPLATE.substitute(summary=self._summary or "(none)", transcript=transcript)
+        try:
+            response = self.llm.chat([{"role": "user", "content": prompt}])
+        except Exception as exc:
+            logger.warning("Context summarization failed, keeping messages verbatim: %s", exc)
+            return ""
+        logger.debug("Summarized %d message(s) out of the context window", len(evicted))
+        return (response.get("content") or "").strip()
+
+    def _chat_until_action(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Stream a text-mode round, closing the stream once a full Action call is in."""
+        scanner = ActionStreamScanner()
+        stream = iter(self.llm.chat_stream(messages))
+        try:
+            for chunk in stream:
+                end = scanner.feed(chunk)
+                if end is not None:
+                    logger.debug("Complete action received; stopping stream early")
+                    return {"role": "assistant", "content": scanner.text[:end]}
+        finally:
+            # Closing the generator lets the client release the HTTP response
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+        return {"role": "assistant", "content": scanner.text}
+
+    def _response_cache_key(self, messages: List[Dict[str, Any]], chat_kwargs: Dict[str, Any]) -> str:
+        """blake2b over model, messages and tool specs, so tool changes miss."""
+        model_id = getattr(self.llm, "model", None) or type(self.llm).__name__
+        payload = _dumps([model_id, messages, chat_kwargs], sort_keys=True)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
 
     def _execute_tools(self, tool_calls: List[ToolCall]) -> None:
-        for tc in tool_calls:
-            result = self._execute_single_tool(tc.name, tc.arguments)
+        results = self._run_tool_calls(tool_calls)
+        for tc, result in zip(tool_calls, results):
             self.conversation.add_tool_result(tc.name, str(result), tool_call_id=tc.id)
 
+    def _run_tool_calls(self, tool_calls: List[ToolCall]) -> List[Any]:
+        """Run one round of tool calls, returning results in call order.
+
+        Consecutive calls to pure tools form a batch: identical (name, arguments)
+        calls in a batch execute once, and I/O-bound ones run concurrently.
+        Any other call ends the batch and runs on its own, so side effects keep
+        their order relative to the reads around them.
+        """
+        results: List[Any] = [None] * len(tool_calls)
+        batch: List[int] = []
+
+        def flush() -> None:
+            if batch:
+                self._run_pure_batch(tool_calls, batch, results)
+                batch.clear()
+
+        for i, tc in enumerate(tool_calls):
+            tool = self.tool_registry.get(tc.name)
+            if tool is not None and tool.is_pure:
+                batch.append(i)
+                continue
+            flush()
+            results[i] = self._execute_single_tool(tc.name, tc.arguments)
+        flush()
+        return results
+
+    def _run_pure_batch(self, tool_calls: List[ToolCall], batch: List[int], results: List[Any]) -> None:
+        first_index: Dict[Tuple[str, str], int] = {}
+        duplicates: List[Tuple[int, int]] = []
+        unique: List[int] = []
+        for i in batch:
+            tc = tool_calls[i]
+            key = (tc.name, _dumps(tc.arguments, sort_keys=True))
+            if key in first_index:
+                duplicates.append((i, first_index[key]))
+            else:
+                first_index[key] = i
+                unique.append(i)
+
+        def run(i: int) -> Any:
+            return self._execute_single_tool(tool_calls[i].name, tool_calls[i].arguments)
+
+        def run_in_worker(i: int) -> Any:
+            token = _in_tool_worker.set(True)
+            try:
+                return run(i)
+            finally:
+                _in_tool_worker.reset(token)
+
+        io_bound = [i for i in unique if self.tool_registry.get(tool_calls[i].name).is_io_bound]
+        # a nested agent running under a tool worker must not wait on its own pool
+        if len(io_bound) > 1 and not _in_tool_worker.get():
+            # shared by all agents (and their forks) so rounds reuse threads
+            executor = get_executor("react-tool", _MAX_TOOL_WORKERS)
+            for i, output in zip(io_bound, executor.map(run_in_worker, io_bound)):
+                results[i] = output
+        else:
+            io_bound = []
+        for i in unique:
+            if i not in io_bound:
+                results[i] = run(i)
+        for i, source in duplicates:
+            logger.debug("Reusing result of identical call: %s", tool_calls[i].name)
+            results[i] = results[source]
+
     def _execute_single_tool(self, name: str, args: dict) -> str:
-        logger.info(f"Executing tool: {name}")
+        logger.info("Executing tool: %s", name)
         is_valid, error = self.tool_registry.validate_call(name, args)
         if not is_valid:
-            logger.warning(f"Tool validation failed: {error}")
+            logger.warning("Tool validation failed: %s", error)
             return f"Tool argument validation failed: {error}"
 
         tool = self.tool_registry.get(name)
@@ -209,21 +470,20 @@ class ReactAgent:
 
         try:
             result = tool.execute(**args)
-            logger.debug(f"Tool result: {str(result)[:200]}...")
+            if asyncio.iscoroutine(result):
+                # AsyncBaseTool: runs on a fresh loop, off-thread if one is already running here
+                result = run_sync(result)
+            logger.debug("Tool result: %.200s...", result)
             return result
         except TypeError as exc:
-            logger.error(f"Tool argument error: {exc}")
+            logger.error("Tool argument error: %s", exc)
             return f"Tool argument error: {exc}"
         except Exception as exc:
-            logger.error(f"Tool execution error: {type(exc).__name__}: {exc}", exc_info=True)
+            logger.error("Tool execution error: %s: %s", type(exc).__name__, exc, exc_info=True)
             return f"Tool execution error: {exc}"
 
     def _render_system_prompt(self, user_input: str = "") -> str:
-        base_prompt = Template(REACT_SYSTEM_PROMPT).substitute(
-            operating_system=self._get_os_name(),
-            tool_list=self._format_tools(),
-            file_list=self._get_files(),
-        )
+        base_prompt = self._render_base_prompt()
 
         if self.memory and self.use_memory_context and user_input:
             memory_context = self.memory.get_context(
@@ -236,20 +496,42 @@ class ReactAgent:
 
         return base_prompt
 
+    def _render_base_prompt(self) -> str:
+        """Render the tool/file part of the system prompt, reused until tools or files change."""
+        try:
+            dir_mtime: Optional[int] = os.stat(self.project_directory).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        key = (self.tool_registry.version, self.project_directory, dir_mtime)
+
+        cached = self._base_prompt_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        base_prompt = _SYSTEM_PROMPT_TEMPLATE.substitute(
+            operating_system=_OS_NAME,
+            tool_list=self._format_tools(),
+            file_list=self._get_files(),
+        )
+        self._base_prompt_cache = (key, base_prompt)
+        return base_prompt
+
     def _format_tools(self) -> str:
-        tools = self.tool_registry.get_all()
-        if not tools:
-            return "No tools available."
+        version = self.tool_registry.version
+        cached = self._tool_list_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
 
         lines: List[str] = []
-        for tool in tools:
-            spec = tool.as_function_spec()
+        for spec in self.tool_registry.as_function_specs():
             params = spec.get("parameters", {}).get("properties", {})
             param_str = ", ".join(
                 f"{k}: {v.get('description', '')}" for k, v in params.items()
             ) or "none"
             lines.append(f"- {spec['name']}: {spec['description']}\n  params: {param_str}")
-        return "\n".join(lines)
+        tool_list = "\n".join(lines) or "No tools available."
+        self._tool_list_cache = (version, tool_list)
+        return tool_list
 
     def _serialize_tool_calls(self, tool_calls: List[ToolCall]) -> List[Dict[str, Any]]:
         serialized: List[Dict[str, Any]] = []
@@ -260,7 +542,7 @@ class ReactAgent:
                     "type": "function",
                     "function": {
                         "name": tc.name,
-                        "arguments": json.dumps(tc.arguments, ensure_ascii=False),
+                        "arguments": _dumps(tc.arguments),
                     },
                 }
             )
@@ -271,22 +553,13 @@ class ReactAgent:
 
     def _get_files(self) -> str:
         try:
-            files = [
-                f
-                for f in os.listdir(self.project_directory)
-                if os.path.isfile(os.path.join(self.project_directory, f))
-            ]
-            return ", ".join(files[:10]) if files else "No files."
+            # scandir reports the entry type from readdir, so no stat per file;
+            # stop once the first ten files are found
+            with os.scandir(self.project_directory) as entries:
+                files = list(islice((e.name for e in entries if e.is_file()), 10))
+            return ", ".join(files) if files else "No files."
         except Exception:
             return "Unavailable"
 
-    @staticmethod
-    def _get_os_name() -> str:
-        return {
-            "Darwin": "macOS",
-            "Windows": "Windows",
-            "Linux": "Linux",
-        }.get(platform.system(), "Unknown")
-
 
 Agent = ReactAgent
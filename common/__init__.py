@@ -5,6 +5,11 @@
 - 配置管理
 - 日志系统
 - 异常定义
+- 响应缓存 / 语义缓存
+- JSON Schema 校验 / 流式 JSON 解析
+- 预解析提示词模板
+- 同步等待协程
+- 共享线程池
 """
 # 配置
 from .config import (
@@ -19,7 +24,22 @@ from .config import (
 )
 
 # 日志
-from .logger import get_logger, setup_logging, set_level
+from .logger import clock_time, get_logger, setup_logging, set_level
+
+# 缓存
+from .response_cache import CacheBackend, ResponseCache, RedisResponseCache
+from .semantic_cache import SemanticCache
+
+# 校验
+from .json_schema import compile_validator
+from .json_stream import JsonObjectStream
+
+# 提示词模板
+from .prompt_template import PromptTemplate
+
+# 异步
+from .async_utils import run_sync
+from .executors import get_executor
 
 # 异常
 from .exceptions import (
@@ -44,9 +64,23 @@ __all__ = [
     "get_config",
     "reload_config",
     # 日志
+    "clock_time",
     "get_logger",
     "setup_logging",
     "set_level",
+    # 缓存
+    "CacheBackend",
+    "ResponseCache",
+    "RedisResponseCache",
+    "SemanticCache",
+    # 校验
+    "compile_validator",
+    "JsonObjectStream",
+    # 提示词模板
+    "PromptTemplate",
+    # 异步
+    "run_sync",
+    "get_executor",
     # 异常
     "AgentBaseException",
     "AgentRuntimeError",
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""在同步代码中等待 awaitable。
+
+asyncio.run 不能在已有运行中事件循环的线程里调用（async Web 处理函数、
+Jupyter 等），run_sync 此时改在独立线程的新事件循环中执行，
+并带上当前的 contextvars 上下文。
+
+Example:
+    >>> async def add(a, b):
+    ...     return a + b
+    >>> run_sync(add(1, 2))
+    3
+"""
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, TypeVar
+
+T = TypeVar("T")
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """同步等待 awaitable 完成并返回结果"""
+    async def _await() -> Any:
+        return await awaitable
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_await())
+
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-sync") as executor:
+        return executor.submit(context.run, asyncio.run, _await()).result()
@@ -6,14 +6,21 @@ Priority: environment variables > YAML file > default values.
 
 from __future__ import annotations
 
+import copy
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
 
+from .logger import get_logger
+
+logger = get_logger(__name__)
 
 PROJECT_ROOT = Path(__file__).parent.parent
 
+# Parsed YAML per path, reused while the file's (mtime_ns, size) is unchanged.
+_yaml_cache: dict[Path, tuple[tuple[int, int], dict[str, Any]]] = {}
+
 
 @dataclass
 class LogConfig:
@@ -233,19 +240,34 @@ class Config:
     def _load_from_yaml(self, path: Path) -> None:
         try:
             import yaml
+        except ImportError:
+            return
 
-            with open(path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
+        try:
+            stat = path.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            cached = _yaml_cache.get(path)
+            if cached is not None and cached[0] == stamp:
+                data = cached[1]
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = yaml.safe_load(f) or {}
+                if isinstance(data, dict):
+                    _yaml_cache[path] = (stamp, data)
+        except (OSError, yaml.YAMLError) as exc:
+            logger.warning("Ignoring config file %s: %s", path, exc)
+            return
 
-            self._apply_yaml(data)
-        except ImportError:
-            pass
-        except Exception:
-            pass
+        if not isinstance(data, dict):
+            logger.warning("Ignoring config file %s: top level must be a mapping", path)
+            return
+
+        # The cached mapping is shared across loads; give this Config its own copy.
+        self._apply_yaml(copy.deepcopy(data))
 
     def _apply_yaml(self, data: dict[str, Any]) -> None:
         self._apply_mapping(
-            data.get("llm", {}),
+            self._section(data, "llm"),
             self.llm,
             {
                 "provider": "provider",
@@ -255,28 +277,28 @@ class Config:
             },
         )
         self._apply_mapping(
-            data.get("llm", {}).get("modelscope", {}),
+            self._section(self._section(data, "llm"), "modelscope"),
             self.llm.modelscope,
             {"api_key": "api_key", "base_url": "base_url", "model": "model"},
         )
         self._apply_mapping(
-            data.get("llm", {}).get("vllm", {}),
+            self._section(self._section(data, "llm"), "vllm"),
             self.llm.vllm,
             {"base_url": "base_url", "model": "model"},
         )
 
         self._apply_mapping(
-            data.get("agent", {}),
+            self._section(data, "agent"),
             self.agent,
             {"max_rounds": ("max_rounds", int), "output_dir": "output_dir"},
         )
         self._apply_mapping(
-            data.get("logging", {}),
+            self._section(data, "logging"),
             self.log,
             {"level": "level", "format": "format"},
         )
         self._apply_mapping(
-            data.get("milvus", {}),
+            self._section(data, "milvus"),
             self.milvus,
             {
                 "host": "host",
@@ -288,7 +310,7 @@ class Config:
             },
         )
         self._apply_mapping(
-            data.get("redis", {}),
+            self._section(data, "redis"),
             self.redis,
             {
                 "host": "host",
@@ -299,7 +321,7 @@ class Config:
             },
         )
         self._apply_mapping(
-            data.get("memory", {}),
+            self._section(data, "memory"),
             self.memory,
             {
                 "enabled": ("enabled", self._as_bool),
@@ -338,7 +360,7 @@ class Config:
             },
         )
         self._apply_mapping(
-            data.get("web_search", {}),
+            self._section(data, "web_search"),
             self.web_search,
             {
                 "provider": "provider",
@@ -347,7 +369,7 @@ class Config:
             },
         )
         self._apply_mapping(
-            data.get("gateway", {}),
+            self._section(data, "gateway"),
             self.gateway,
             {
                 "host": "host",
@@ -356,7 +378,7 @@ class Config:
             },
         )
         self._apply_mapping(
-            data.get("runtime", {}),
+            self._section(data, "runtime"),
             self.runtime,
             {
                 "default_harness": "default_harness",
@@ -366,7 +388,7 @@ class Config:
             },
         )
         self._apply_mapping(
-            data.get("tracing", {}),
+            self._section(data, "tracing"),
             self.tracing,
             {
                 "enabled": ("enabled", self._as_bool),
@@ -376,7 +398,7 @@ class Config:
             },
         )
         self._apply_mapping(
-            data.get("reflection", {}),
+            self._section(data, "reflection"),
             self.reflection,
             {
                 "enabled": ("enabled", self._as_bool),
@@ -387,7 +409,7 @@ class Config:
             },
         )
         self._apply_mapping(
-            data.get("etl", {}),
+            self._section(data, "etl"),
             self.etl,
             {
                 "enabled": ("enabled", self._as_bool),
@@ -399,7 +421,7 @@ class Config:
             },
         )
         self._apply_mapping(
-            data.get("worker", {}),
+            self._section(data, "worker"),
             self.worker,
             {
                 "enabled": ("enabled", self._as_bool),
@@ -409,7 +431,7 @@ class Config:
             },
         )
         self._apply_mapping(
-            data.get("storage", {}),
+            self._section(data, "storage"),
             self.storage,
             {
                 "session_store": "session_store",
@@ -418,13 +440,28 @@ class Config:
             },
         )
 
+    @staticmethod
+    def _section(data: dict[str, Any], key: str) -> dict[str, Any]:
+        value = data.get(key)
+        if value is None:
+            return {}
+        if not isinstance(value, dict):
+            logger.warning("Ignoring config section %r: expected a mapping, got %s", key, type(value).__name__)
+            return {}
+        return value
+
     def _apply_mapping(self, source: dict[str, Any], target: Any, mapping: dict[str, Any]) -> None:
         for source_key, target_spec in mapping.items():
             if source_key not in source:
                 continue
             if isinstance(target_spec, tuple):
                 attr_name, caster = target_spec
-                setattr(target, attr_name, caster(source[source_key]))
+                try:
+                    value = caster(source[source_key])
+                except (TypeError, ValueError) as exc:
+                    logger.warning("Ignoring invalid config value %s=%r: %s", source_key, source[source_key], exc)
+                    continue
+                setattr(target, attr_name, value)
             else:
                 setattr(target, target_spec, source[source_key])
 
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""进程内共享的具名线程池。
+
+同一名称只创建一个线程池（懒创建，线程名以该名称为前缀），
+调用方按用途取各自的池，互不排队。
+
+Example:
+    >>> executor = get_executor("agent-bg", max_workers=4)
+    >>> executor is get_executor("agent-bg", max_workers=4)
+    True
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+
+
+def get_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """返回名为 name 的共享线程池，首次调用时以 max_workers 创建"""
+    executor = _executors.get(name)
+    if executor is None:
+        with _lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix=name
+                )
+    return executor
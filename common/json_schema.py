@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""JSON Schema 校验。
+
+把 schema 预编译为校验函数，供 LLM 结构化输出在每次响应时复用，
+不必在每次调用时重新解释 schema。
+
+安装了 fastjsonschema 时使用它生成的校验代码；否则使用内置的轻量实现，
+支持 type / properties / required / items 这几个关键字（项目内 schema 只用到这些）。
+
+Example:
+    >>> validate = compile_validator({"type": "object", "required": ["name"]})
+    >>> validate({"name": "张三"})
+    []
+    >>> validate({})
+    ['$: 缺少字段 name']
+"""
+from typing import Any, Callable, Dict, List
+
+Validator = Callable[[Any], List[str]]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def compile_validator(schema: Dict[str, Any]) -> Validator:
+    """编译 schema，返回 validate(value) -> 错误列表（为空表示通过）"""
+    try:
+        import fastjsonschema
+    except ImportError:
+        return _compile(schema, "$")
+
+    check = fastjsonschema.compile(schema)
+
+    def validate(value: Any) -> List[str]:
+        try:
+            check(value)
+        except fastjsonschema.JsonSchemaException as e:
+            return [e.message]
+        return []
+
+    return validate
+
+
+def _compile(schema: Dict[str, Any], path: str) -> Validator:
+    checks: List[Validator] = []
+
+    expected = schema.get("type")
+    if expected is not None:
+        names = [expected] if isinstance(expected, str) else list(expected)
+        type_checks = [_TYPE_CHECKS[name] for name in names if name in _TYPE_CHECKS]
+
+        def check_type(value: Any) -> List[str]:
+            if any(check(value) for check in type_checks):
+                return []
+            return [f"{path}: 期望类型 {'/'.join(names)}，实际为 {type(value).__name__}"]
+
+        checks.append(check_type)
+
+    required = tuple(schema.get("required", ()))
+    if required:
+        def check_required(value: Any) -> List[str]:
+            if not isinstance(value, dict):
+                return []
+            return [f"{path}: 缺少字段 {key}" for key in required if key not in value]
+
+        checks.append(check_required)
+
+    properties = {
+        key: _compile(sub, f"{path}.{key}")
+        for key, sub in schema.get("properties", {}).items()
+    }
+    if properties:
+        def check_properties(value: Any) -> List[str]:
+            if not isinstance(value, dict):
+                return []
+            errors: List[str] = []
+            for key, check in properties.items():
+                if key in value:
+                    errors.extend(check(value[key]))
+            return errors
+
+        checks.append(check_properties)
+
+    if "items" in schema:
+        check_item = _compile(schema["items"], f"{path}[]")
+
+        def check_items(value: Any) -> List[str]:
+            if not isinstance(value, list):
+                return []
+            errors: List[str] = []
+            for item in value:
+                errors.extend(check_item(item))
+            return errors
+
+        checks.append(check_items)
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate(value: Any) -> List[str]:
+        errors: List[str] = []
+        for check in checks:
+            errors.extend(check(value))
+        return errors
+
+    return validate
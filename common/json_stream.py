@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""增量解析流式 JSON 对象。
+
+LLM 流式输出 JSON 对象时，每个顶层字段一闭合就解析出来，
+调用方可以边接收边合并，不必等完整响应后再整体 json.loads。
+
+对象之前的说明文字或 ```json 代码块标记会被跳过；
+已扫描过的字符不会重复扫描，只缓存尚未闭合的字段。
+
+Example:
+    >>> stream = JsonObjectStream()
+    >>> stream.feed('```json\\n{"name": "张三", "ski')
+    [('name', '张三')]
+    >>> stream.feed('lls": ["Python"]}\\n```')
+    [('skills', ['Python'])]
+    >>> stream.done
+    True
+"""
+import json
+from typing import Any, List, Tuple
+
+
+class JsonObjectStream:
+    """顶层 JSON 对象的增量解析器。
+
+    feed() 返回本次新闭合的 (key, value) 列表。
+    对象闭合后 done 为 True；字段解析失败时 failed 为 True，
+    之后不再产出字段，调用方应回退到对完整响应的整体解析。
+    """
+
+    def __init__(self):
+        # 当前未闭合字段已收到的文本片段，字段闭合时才拼接
+        self._pending: List[str] = []
+        self._depth = 0
+        self._in_str = False
+        self._escape = False
+        self._in_object = False
+        self.done = False
+        self.failed = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        if self.done or self.failed or not chunk:
+            return []
+
+        members: List[Tuple[str, Any]] = []
+        # 当前字段在本分片中的起点
+        start = 0
+        for i, c in enumerate(chunk):
+            if not self._in_object:
+                # 尚未进入对象：跳过前导说明文字
+                if c == "{":
+                    self._depth = 1
+                    self._in_object = True
+                    start = i + 1
+                continue
+            if self._escape:
+                self._escape = False
+            elif c == "\\":
+                self._escape = self._in_str
+            elif c == '"':
+                self._in_str = not self._in_str
+            elif self._in_str:
+                continue
+            elif c in "{[":
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(chunk[start:i], members)
+                    self.done = True
+                    return members
+            elif c == "," and self._depth == 1:
+                self._emit(chunk[start:i], members)
+                start = i + 1
+            if self.failed:
+                return members
+        if self._in_object:
+            self._pending.append(chunk[start:])
+        return members
+
+    def _emit(self, tail: str, members: List[Tuple[str, Any]]) -> None:
+        self._pending.append(tail)
+        segment = "".join(self._pending)
+        self._pending = []
+        if not segment.strip():
+            return
+        try:
+            members.extend(json.loads("{" + segment + "}").items())
+        except json.JSONDecodeError:
+            self.failed = True
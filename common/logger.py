@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
-"""日志管理。"""
+"""日志管理。
+
+get_logger 只返回 logging.getLogger(name)，不读取配置，模块顶层调用没有 I/O 开销；
+输出格式和级别由入口程序（CLI / Web 服务）显式调用 setup_logging() 配置。
+"""
 import logging
 import sys
+import time
+from functools import lru_cache
 from typing import Optional
 
 _initialized = False
@@ -43,12 +49,20 @@ def setup_logging(level: Optional[str] = None) -> None:
 
 
 def get_logger(name: str) -> logging.Logger:
-    """获取日志器"""
-    if not _initialized:
-        setup_logging()
+    """获取日志器（不触发 setup_logging）"""
     return logging.getLogger(name)
 
 
 def set_level(level: str) -> None:
     """设置日志级别"""
     logging.getLogger().setLevel(getattr(logging, level.upper(), logging.INFO))
+
+
+@lru_cache(maxsize=1)
+def _format_clock(second: int) -> str:
+    return time.strftime("%H:%M:%S", time.localtime(second))
+
+
+def clock_time() -> str:
+    """当前本地时间（HH:MM:SS），同一秒内复用已格式化的字符串"""
+    return _format_clock(int(time.time()))
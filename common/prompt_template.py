@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""预解析的提示词模板。
+
+str.format 每次调用都要重新扫描模板；PromptTemplate 在构造时把模板解析为
+(字面量, 字段名) 片段，渲染时只做拼接。值中的大括号不会被再次解释。
+
+模板语法与 str.format 相同（{{ }} 表示字面大括号），但不支持格式说明符和转换符。
+
+Example:
+    >>> tmpl = PromptTemplate("简历：{resume_json}\\n{job_context}")
+    >>> tmpl.render(resume_json='{"name": "张三"}', job_context="")
+    '简历：{"name": "张三"}\\n'
+    >>> tmpl.partial(job_context="").fields
+    ('resume_json',)
+"""
+from string import Formatter
+from typing import Any, Optional, Tuple
+
+Segments = Tuple[Tuple[str, Optional[str]], ...]
+
+
+class PromptTemplate:
+    """导入时解析一次、渲染时只拼接的 str.format 风格模板"""
+
+    __slots__ = ("_segments",)
+
+    def __init__(self, template: str):
+        self._segments: Segments = tuple(
+            (literal, field) for literal, field, _, _ in Formatter().parse(template)
+        )
+
+    @classmethod
+    def _from_segments(cls, segments: Segments) -> "PromptTemplate":
+        tmpl = cls.__new__(cls)
+        tmpl._segments = segments
+        return tmpl
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """模板中尚未代入的字段名"""
+        return tuple(field for _, field in self._segments if field is not None)
+
+    def render(self, **values: Any) -> str:
+        """代入全部字段，等价于 template.format(**values)"""
+        return "".join(
+            literal if field is None else literal + str(values[field])
+            for literal, field in self._segments
+        )
+
+    def partial(self, **values: Any) -> "PromptTemplate":
+        """提前代入部分字段并与相邻字面量合并，返回只含剩余字段的新模板"""
+        bound = []
+        pending = ""
+        for literal, field in self._segments:
+            pending += literal
+            if field is None:
+                continue
+            if field in values:
+                pending += str(values[field])
+            else:
+                bound.append((pending, field))
+                pending = ""
+        if pending:
+            bound.append((pending, None))
+        return self._from_segments(tuple(bound))
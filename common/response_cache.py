@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""LLM 响应缓存。
+
+按键精确匹配缓存 LLM 响应文本，供 BaseLLMAgent 使用。
+
+- ResponseCache: 进程内 LRU，同时受条数、总字节数和 TTL 约束
+- RedisResponseCache: 多进程部署时共享缓存，传入 redis 客户端即可
+
+自定义后端只需实现 CacheBackend 协议（get / set / delete / clear）。
+
+Example:
+    >>> from agents.base import BaseLLMAgent
+    >>> BaseLLMAgent.set_response_cache(ResponseCache(maxsize=1024, ttl=600))
+    >>> BaseLLMAgent.cache_stats()
+    {'entries': 0, 'bytes': 0, 'hits': 0, 'misses': 0}
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+
+class CacheBackend(Protocol):
+    """响应缓存后端协议"""
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, value: str) -> None:
+        ...
+
+    def delete(self, key: str) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class ResponseCache:
+    """进程内 LRU 响应缓存。
+
+    Args:
+        maxsize: 最大条数
+        ttl: 过期时间（秒），None 表示不过期
+        max_bytes: 缓存值的 UTF-8 总字节数上限，None 表示不限制
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl: Optional[float] = 3600,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # key -> (过期时间, 值, 字节数)
+        self._data: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._pop(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        if not isinstance(value, str):
+            return
+        size = len(value.encode("utf-8"))
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (expires_at, value, size)
+            self._bytes += size
+            while len(self._data) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._pop(next(iter(self._data)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """命中统计与占用"""
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _pop(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisResponseCache:
+    """基于 Redis 的响应缓存（多进程共享）。
+
+    Args:
+        client: redis.Redis 实例
+        ttl: 过期时间（秒），None 表示不过期
+        prefix: 键前缀，clear() 只删除该前缀下的键
+    """
+
+    def __init__(self, client: Any, ttl: Optional[int] = 3600, prefix: str = "llm_cache:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str) -> None:
+        if not isinstance(value, str):
+            return
+        self.client.set(self.prefix + key, value, ex=self.ttl)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses}
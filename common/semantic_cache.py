@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""语义缓存。
+
+对提示词做向量化，余弦相似度超过阈值时复用历史 LLM 响应，
+用于空白/字段顺序不同但语义相同的重复请求。条目按 namespace 分区，
+只在同一分区内比较（如按系统提示词、模型、请求参数划分）。
+
+Example:
+    >>> from embeddings import EmbeddingModel
+    >>> cache = SemanticCache(EmbeddingModel(model_name="all-MiniLM-L6-v2"))
+    >>> cache.add("分析这份简历 ...", "分析结果")
+    >>> cache.lookup("分析这份简历  ...")
+    '分析结果'
+"""
+import threading
+from typing import Any, List, Optional, Protocol
+
+
+class EmbedderProtocol(Protocol):
+    """Embedding 模型协议（与 embeddings.EmbeddingModel 一致）"""
+    def encode(self, texts: Any, normalize: bool = True) -> Any:
+        ...
+
+
+class SemanticCache:
+    """基于向量内积的语义缓存（暴力检索，等价于 IndexFlatIP）。
+
+    Args:
+        embedder: 提供 encode(texts, normalize=True) 的 Embedding 模型
+        threshold: 命中所需的最小余弦相似度
+        max_entries: 最大缓存条数，超出后淘汰最早写入的条目
+    """
+
+    def __init__(
+        self,
+        embedder: EmbedderProtocol,
+        threshold: float = 0.92,
+        max_entries: int = 512,
+    ):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._vectors = None  # np.ndarray [n, dim]
+        self._responses: List[str] = []
+        self._namespaces: List[str] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """折叠空白，消除缩进/换行差异"""
+        return " ".join(text.split())
+
+    def _embed(self, text: str):
+        import numpy as np
+
+        vec = np.asarray(self.embedder.encode([self._normalize(text)], normalize=True))
+        return vec.reshape(1, -1).astype(np.float32)
+
+    def lookup(self, text: str, namespace: str = "") -> Optional[str]:
+        """在 namespace 分区内查找语义相近的历史响应，未命中返回 None"""
+        import numpy as np
+
+        if namespace not in self._namespaces:
+            return None
+
+        query = self._embed(text)
+        with self._lock:
+            if self._vectors is None:
+                return None
+            scores = self._vectors @ query[0]
+            in_scope = np.fromiter(
+                (ns == namespace for ns in self._namespaces), dtype=bool, count=len(self._namespaces)
+            )
+            scores = np.where(in_scope, scores, -np.inf)
+            best = int(scores.argmax())
+            if float(scores[best]) >= self.threshold:
+                return self._responses[best]
+        return None
+
+    def add(self, text: str, response: str, namespace: str = "") -> None:
+        """向 namespace 分区写入一条缓存"""
+        import numpy as np
+
+        vec = self._embed(text)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = vec
+            else:
+                self._vectors = np.vstack([self._vectors, vec])
+            self._responses.append(response)
+            self._namespaces.append(namespace)
+
+            overflow = len(self._responses) - self.max_entries
+            if overflow > 0:
+                self._vectors = self._vectors[overflow:]
+                del self._responses[:overflow]
+                del self._namespaces[:overflow]
+
+    def discard(self, response: str) -> int:
+        """删除响应为 response 的全部条目（如该响应导致执行失败），返回删除条数"""
+        with self._lock:
+            keep = [i for i, cached in enumerate(self._responses) if cached != response]
+            removed = len(self._responses) - len(keep)
+            if removed:
+                self._responses = [self._responses[i] for i in keep]
+                self._namespaces = [self._namespaces[i] for i in keep]
+                self._vectors = self._vectors[keep] if keep else None
+            return removed
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._vectors = None
+            self._responses.clear()
+            self._namespaces.clear()
+
+    def __len__(self) -> int:
+        return len(self._responses)
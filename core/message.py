@@ -3,7 +3,7 @@
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 
 class Role(str, Enum):
@@ -15,25 +15,30 @@ class Role(str, Enum):
     SYSTEM = "system"
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
-    """Structured conversation message."""
+    """Structured conversation message.
+
+    Slotted, and messages without tool calls share one empty tuple instead of
+    each allocating a list, since long conversations hold many of them.
+    """
 
     role: Role
     content: Optional[str] = None
-    tool_calls: List[dict] = field(default_factory=list)
+    tool_calls: Sequence[dict] = ()
     name: Optional[str] = None
     tool_call_id: Optional[str] = None
 
     def to_dict(self, compatible: bool = True) -> Dict[str, Any]:
         """Convert to provider-friendly message dict."""
-        if compatible and self.role == Role.TOOL:
+        # Role members are singletons: `is` and _value_ skip Enum.__eq__ and the .value descriptor
+        if compatible and self.role is Role.TOOL:
             return {
                 "role": "user",
                 "content": f"[tool {self.name} result]\n{self.content}",
             }
 
-        data = {"role": self.role.value}
+        data = {"role": self.role._value_}
         if self.content is not None:
             data["content"] = self.content
         if self.tool_calls:
@@ -50,18 +55,22 @@ class Message:
 
     @classmethod
     def assistant(cls, content: str = None, tool_calls: list = None) -> "Message":
-        return cls(Role.ASSISTANT, content, tool_calls or [])
+        return cls(Role.ASSISTANT, content, tool_calls or ())
 
     @classmethod
     def tool(cls, name: str, content: str, tool_call_id: str = None) -> "Message":
         return cls(Role.TOOL, content, name=name, tool_call_id=tool_call_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     """In-memory conversation store."""
 
     messages: List[Message] = field(default_factory=list)
+    # (message, dict form) pairs per ``compatible`` flag, extended as messages are added
+    _serialized: Dict[bool, List[Tuple[Message, Dict[str, Any]]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def add(self, msg: Message) -> None:
         self.messages.append(msg)
@@ -76,10 +85,29 @@ class Conversation:
         self.add(Message.tool(name, content, tool_call_id=tool_call_id))
 
     def to_list(self, compatible: bool = True) -> List[Dict[str, Any]]:
-        return [m.to_dict(compatible=compatible) for m in self.messages]
+        """Dict form of all messages.
+
+        Conversions are cached per message object, so only messages added or
+        replaced since the last call go through ``to_dict``; a message is
+        treated as immutable once added. Each call returns fresh dicts that
+        callers may modify.
+        """
+        serialized = self._serialized.setdefault(compatible, [])
+        # keep the cached prefix whose message objects are still in place;
+        # anything after a replaced, removed or reassigned entry is rebuilt
+        keep = 0
+        for (cached, _), current in zip(serialized, self.messages):
+            if cached is not current:
+                break
+            keep += 1
+        del serialized[keep:]
+        for m in self.messages[keep:]:
+            serialized.append((m, m.to_dict(compatible=compatible)))
+        return [dict(data) for _, data in serialized]
 
     def clear(self) -> None:
         self.messages.clear()
+        self._serialized.clear()
 
     def __len__(self) -> int:
         return len(self.messages)
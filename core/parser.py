@@ -3,14 +3,37 @@
 import json
 import re
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from common import get_logger
 
 logger = get_logger(__name__)
 
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
 
-@dataclass
+# 模块加载时预编译，解析每轮 LLM 响应时不再查 re 的模式缓存
+# Action: 之后紧跟的 {（只定位起点，不再用 .+ 把剩余文本整段捕获）
+_ACTION_RE = re.compile(r'Action:\s*(?=\{)')
+# 任意位置的 {"name": ...
+_NAME_KEY_RE = re.compile(r'\{\s*"name"\s*:')
+# 流式扫描时只关心的 JSON 结构字符
+_JSON_STRUCT_RE = re.compile(r'[{}"\\]')
+_ACTION_MARKER = "Action:"
+
+_DECODER = json.JSONDecoder()
+
+
+def _loads(text: str) -> Any:
+    """解析完整的 JSON 字符串；安装了 orjson 时使用 orjson（其异常是 json.JSONDecodeError 的子类）"""
+    if _orjson is not None:
+        return _orjson.loads(text)
+    return json.loads(text)
+
+
+@dataclass(slots=True)
 class ToolCall:
     """工具调用"""
     name: str
@@ -41,88 +64,166 @@ def _parse_native(tool_calls: list) -> Optional[List[ToolCall]]:
             args = func.get("arguments", "{}")
             results.append(ToolCall(
                 name=func.get("name"),
-                arguments=json.loads(args) if isinstance(args, str) else args,
+                arguments=_loads(args) if isinstance(args, str) else args,
                 id=tc.get("id"),
             ))
         except Exception as e:
-            logger.warning(f"解析失败: {e}")
+            logger.warning("解析失败: %s", e)
     return results or None
 
 
 def _parse_from_text(content: str) -> Optional[List[ToolCall]]:
     """从文本解析工具调用"""
     
+    # 两种格式都以 JSON 对象承载调用；纯文本回答（如 final_answer）直接跳过正则
+    if "{" not in content:
+        return None
+    
     # 匹配 Action: {...}
-    match = re.search(r'Action:\s*(\{.+)', content, re.DOTALL)
+    match = _ACTION_RE.search(content) if _ACTION_MARKER in content else None
     if match:
-        json_str = _extract_json(match.group(1))
-        if json_str:
-            return _parse_json_call(json_str)
+        decoded = _decode_json(content, match.end())
+        if decoded is not None:
+            return _parse_json_call(decoded[0])
+        logger.debug("Action 之后的 JSON 不完整或非法: %s", content[match.end():match.end() + 200])
     
     # 匹配任意 {"name": ...}
-    match = re.search(r'\{\s*"name"\s*:', content)
+    match = _NAME_KEY_RE.search(content) if '"name"' in content else None
     if match:
-        json_str = _extract_json(content[match.start():])
-        if json_str:
-            return _parse_json_call(json_str)
+        decoded = _decode_json(content, match.start())
+        if decoded is not None:
+            return _parse_json_call(decoded[0])
     
     return None
 
 
-def _parse_json_call(json_str: str) -> Optional[List[ToolCall]]:
-    """解析 JSON 格式的工具调用"""
-    try:
-        data = json.loads(json_str)
-        if "name" not in data:
-            logger.warning("JSON 中没有 'name' 字段")
+def find_action_end(text: str) -> Optional[int]:
+    """返回文本中第一个完整 Action: {...} 调用的结束位置，尚不完整时返回 None
+    
+    用于流式接收时判断工具调用已经完整输出，可以提前结束生成。
+    """
+    match = _ACTION_RE.search(text)
+    if match is None:
+        return None
+    decoded = _decode_json(text, match.end())
+    return None if decoded is None else decoded[1]
+
+
+class ActionStreamScanner:
+    """增量查找流式输出中第一个完整的 Action: {...}
+    
+    find_action_end 每收到一个分片都要拼接全文并从头 raw_decode，
+    流越长开销越接近 O(n²)。这里每个分片只扫描一次：先找 Action: 标记，
+    再按 JSON 字符串/转义状态跟踪括号深度，深度归零时才做一次 raw_decode 校验。
+    """
+    
+    def __init__(self) -> None:
+        self._chunks: List[str] = []
+        self._length = 0
+        # 尚未找到 JSON 起点时，待搜索的文本及其在全文中的偏移
+        self._pending = ""
+        self._pending_offset = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape_at = -1
+        self._failed = False
+    
+    @property
+    def text(self) -> str:
+        """目前收到的全部文本"""
+        return "".join(self._chunks)
+    
+    def feed(self, chunk: str) -> Optional[int]:
+        """追加一个分片；Action 调用完整时返回其在全文中的结束位置，否则返回 None"""
+        offset = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        if self._failed or not chunk:
             return None
         
-        args = data.get("arguments", {})
-        if isinstance(args, str):
-            try:
-                args = json.loads(args)
-            except json.JSONDecodeError as e:
-                logger.warning(f"arguments 内部 JSON 解析失败: {e}")
-                logger.warning(f"arguments 内容前200字符: {args[:200]}")
+        if self._start is None:
+            if not self._find_start(chunk):
                 return None
+            # 从 { 之后开始跟踪，前面的文本不属于 JSON
+            scan_from = self._start + 1 - offset
+            self._depth = 1
+        else:
+            scan_from = 0
         
-        logger.debug(f"解析到工具调用: {data['name']}")
-        return [ToolCall(name=data["name"], arguments=args)]
-    except json.JSONDecodeError as e:
-        logger.warning(f"外层 JSON 解析失败: {e}")
-        logger.warning(f"JSON 字符串前200字符: {json_str[:200]}")
+        for m in _JSON_STRUCT_RE.finditer(chunk, scan_from):
+            pos = offset + m.start()
+            if pos == self._escape_at:
+                continue
+            ch = m.group()
+            if self._in_string:
+                if ch == "\\":
+                    self._escape_at = pos + 1
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    return self._finish()
         return None
-    except Exception as e:
-        logger.warning(f"解析异常: {type(e).__name__}: {e}")
+    
+    def _find_start(self, chunk: str) -> bool:
+        """在待搜索文本中找 Action: 之后紧跟的 {，找到时记录其全文位置"""
+        self._pending += chunk
+        match = _ACTION_RE.search(self._pending)
+        if match is not None:
+            self._start = self._pending_offset + match.end()
+            self._pending = ""
+            return True
+        # 保留可能与下一分片拼成 "Action:   {" 的尾部
+        marker = self._pending.rfind(_ACTION_MARKER)
+        if marker != -1 and not self._pending[marker + len(_ACTION_MARKER):].strip():
+            keep = marker
+        else:
+            keep = max(0, len(self._pending) - len(_ACTION_MARKER) + 1)
+        self._pending_offset += keep
+        self._pending = self._pending[keep:]
+        return False
+    
+    def _finish(self) -> Optional[int]:
+        decoded = _decode_json(self.text, self._start)
+        if decoded is None:
+            # 括号配平但不是合法 JSON，与 find_action_end 一致，不再提前结束
+            self._failed = True
+            return None
+        return decoded[1]
+
+
+def _decode_json(text: str, start: int) -> Optional[Tuple[Any, int]]:
+    """从 text[start] 起解码一个完整 JSON 值，返回 (值, 结束位置)；不完整或非法时返回 None
+    
+    raw_decode 在 C 扫描器中一次完成定界与解析，
+    不再先逐字符做括号匹配、再对截出的片段 json.loads 一遍。
+    """
+    try:
+        return _DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
         return None
 
 
-def _extract_json(text: str) -> Optional[str]:
-    """使用括号匹配提取完整 JSON"""
-    if not text.startswith('{'):
+def _parse_json_call(data: Any) -> Optional[List[ToolCall]]:
+    """把解码后的 JSON 转为工具调用"""
+    if not isinstance(data, dict) or "name" not in data:
+        logger.warning("JSON 中没有 'name' 字段")
         return None
     
-    depth = 0
-    in_str = False
-    escape = False
-    
-    for i, c in enumerate(text):
-        if escape:
-            escape = False
-            continue
-        if c == '\\':
-            escape = True
-            continue
-        if c == '"' and not escape:
-            in_str = not in_str
-            continue
-        if in_str:
-            continue
-        if c == '{':
-            depth += 1
-        elif c == '}':
-            depth -= 1
-            if depth == 0:
-                return text[:i + 1]
+    args = data.get("arguments", {})
+    if isinstance(args, str):
+        try:
+            args = _loads(args)
+        except json.JSONDecodeError as e:
+            logger.warning("arguments 内部 JSON 解析失败: %s", e)
+            logger.warning("arguments 内容前200字符: %.200s", args)
+            return None
     
-    return None
+    logger.debug("解析到工具调用: %s", data["name"])
+    return [ToolCall(name=data["name"], arguments=args)]
@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """通用任务"""
     name: str                                    # 任务名称
@@ -13,7 +13,7 @@ class Task:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskResult:
     """任务执行结果"""
     success: bool
@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any, Dict, Generator, List, Optional
 
 from openai import OpenAI
@@ -13,6 +14,16 @@ from .base import BaseLLM
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _shared_client(base_url: str, api_key: str) -> OpenAI:
+    """Return one OpenAI client (and its keep-alive connection pool) per endpoint/key.
+
+    Every agent gets its own ModelScopeOpenAI instance; sharing the underlying
+    client lets them reuse connections instead of each opening new TLS sessions.
+    """
+    return OpenAI(base_url=base_url, api_key=api_key)
+
+
 class ModelScopeOpenAI(BaseLLM):
     """ModelScope chat client via the OpenAI-compatible API."""
 
@@ -37,10 +48,7 @@ class ModelScopeOpenAI(BaseLLM):
                 "Configure it via config, env var, or constructor argument."
             )
 
-        self.client = OpenAI(
-            base_url=self.base_url,
-            api_key=self.api_key,
-        )
+        self.client = _shared_client(self.base_url, self.api_key)
 
     def chat(
         self,
@@ -72,9 +80,10 @@ class ModelScopeOpenAI(BaseLLM):
             usage = getattr(response, "usage", None)
             if usage:
                 logger.info(
-                    f"[Token Usage] input: {usage.prompt_tokens}, "
-                    f"output: {usage.completion_tokens}, "
-                    f"total: {usage.total_tokens}"
+                    "[Token Usage] input: %s, output: %s, total: %s",
+                    usage.prompt_tokens,
+                    usage.completion_tokens,
+                    usage.total_tokens,
                 )
 
             message = response.choices[0].message
@@ -118,6 +127,12 @@ class ModelScopeOpenAI(BaseLLM):
             **kwargs,
         )
 
-        for chunk in response:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+        try:
+            for chunk in response:
+                if chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Release the connection when the caller stops reading early
+            close = getattr(response, "close", None)
+            if close is not None:
+                close()
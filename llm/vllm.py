@@ -3,7 +3,8 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import json
+from typing import Any, Dict, Generator, List, Optional
 
 import requests
 
@@ -20,10 +21,23 @@ class VllmLLM(BaseLLM):
         base_url: str = "http://localhost:8000/v1",
         model: str = "Qwen3-0.6B/",
         timeout: int = 120,
+        session: Optional[requests.Session] = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.model = model
         self.timeout = timeout
+        # Optional keep-alive session shared by every agent that uses this client;
+        # without one each call goes through requests.post and opens a new connection.
+        self.session = session
+
+    @staticmethod
+    def create_session(pool_maxsize: int = 20) -> requests.Session:
+        """Build a pooled keep-alive session suitable for passing as ``session``."""
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
 
     def chat(
         self,
@@ -40,10 +54,52 @@ class VllmLLM(BaseLLM):
             **kwargs,
         }
 
+        resp = self._post(payload)
+        data = resp.json()
+        if not data.get("choices"):
+            raise RuntimeError(f"VllmLLM returned invalid payload: {data}")
+
+        return data["choices"][0]["message"]
+
+    def chat_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        **kwargs,
+    ) -> Generator[str, None, None]:
+        """Stream content deltas over the same session/connection pool as ``chat``."""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs,
+            "stream": True,
+        }
+
+        resp = self._post(payload, stream=True)
+        try:
+            for line in resp.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                content = choices[0].get("delta", {}).get("content")
+                if content:
+                    yield content
+        finally:
+            resp.close()
+
+    def _post(self, payload: Dict[str, Any], stream: bool = False) -> requests.Response:
         url = f"{self.base_url}/chat/completions"
 
         try:
-            resp = requests.post(url, json=payload, timeout=self.timeout)
+            post = self.session.post if self.session is not None else requests.post
+            kwargs = {"stream": True} if stream else {}
+            resp = post(url, json=payload, timeout=self.timeout, **kwargs)
             resp.raise_for_status()
         except requests.exceptions.Timeout:
             raise RuntimeError(f"VllmLLM request timed out ({self.timeout}s)")
@@ -52,8 +108,4 @@ class VllmLLM(BaseLLM):
         except Exception as err:
             raise RuntimeError(f"VllmLLM request failed: {err}") from err
 
-        data = resp.json()
-        if not data.get("choices"):
-            raise RuntimeError(f"VllmLLM returned invalid payload: {data}")
-
-        return data["choices"][0]["message"]
+        return resp
@@ -11,16 +11,29 @@
     ├── layout.py        # 简历布局提示词
     └── resume.py        # 简历优化提示词
 """
-from .agent import REACT_SYSTEM_PROMPT
+from .agent import REACT_SYSTEM_PROMPT, REACT_SUMMARY_PROMPT
 from .content import (
     CONTENT_AGENT_SYSTEM_PROMPT,
     CONTENT_THINK_PROMPT,
     CONTENT_EXECUTE_PROMPT,
+    CONTENT_THINK_STATIC,
+    CONTENT_THINK_DYNAMIC_FMT,
+    CONTENT_EXECUTE_STATIC,
+    CONTENT_EXECUTE_DYNAMIC_FMT,
+    CONTENT_EXECUTE_PATCH_DYNAMIC_FMT,
+    CONTENT_ANALYSIS_SCHEMA,
+    CONTENT_RESUME_SCHEMA,
 )
 from .layout import (
     LAYOUT_AGENT_SYSTEM_PROMPT,
     LAYOUT_THINK_PROMPT,
     LAYOUT_EXECUTE_PROMPT,
+    LAYOUT_THINK_STATIC,
+    LAYOUT_THINK_DYNAMIC_FMT,
+    LAYOUT_EXECUTE_STATIC,
+    LAYOUT_EXECUTE_DYNAMIC_FMT,
+    LAYOUT_COMBINED_STATIC,
+    LAYOUT_COMBINED_PROMPT,
     LAYOUT_CONTENT_TRIM_PROMPT,
 )
 from .resume import (
@@ -33,14 +46,28 @@ from .resume import (
 __all__ = [
     # Agent
     "REACT_SYSTEM_PROMPT",
+    "REACT_SUMMARY_PROMPT",
     # Content
     "CONTENT_AGENT_SYSTEM_PROMPT",
     "CONTENT_THINK_PROMPT",
     "CONTENT_EXECUTE_PROMPT",
+    "CONTENT_THINK_STATIC",
+    "CONTENT_THINK_DYNAMIC_FMT",
+    "CONTENT_EXECUTE_STATIC",
+    "CONTENT_EXECUTE_DYNAMIC_FMT",
+    "CONTENT_EXECUTE_PATCH_DYNAMIC_FMT",
+    "CONTENT_ANALYSIS_SCHEMA",
+    "CONTENT_RESUME_SCHEMA",
     # Layout
     "LAYOUT_AGENT_SYSTEM_PROMPT",
     "LAYOUT_THINK_PROMPT",
     "LAYOUT_EXECUTE_PROMPT",
+    "LAYOUT_THINK_STATIC",
+    "LAYOUT_THINK_DYNAMIC_FMT",
+    "LAYOUT_EXECUTE_STATIC",
+    "LAYOUT_EXECUTE_DYNAMIC_FMT",
+    "LAYOUT_COMBINED_STATIC",
+    "LAYOUT_COMBINED_PROMPT",
     "LAYOUT_CONTENT_TRIM_PROMPT",
     # Resume
     "RESUME_OPTIMIZER_SYSTEM_PROMPT",
@@ -32,3 +32,16 @@ final_answer: 最终回复内容
 - Files: ${file_list}
 """.strip()
 
+
+# 滑动窗口之外的早期对话压缩为摘要，随后作为附加 system 消息发送
+REACT_SUMMARY_PROMPT = """
+请把下面的早期对话压缩成一段简洁的摘要，供后续推理使用。
+必须保留：用户的原始请求与约束、已调用的工具及其关键结果、已得出的结论和尚未完成的步骤。
+省略寒暄、重复内容和冗长的原始输出，只输出摘要正文。
+
+## 已有摘要
+${summary}
+
+## 新增对话
+${transcript}
+""".strip()
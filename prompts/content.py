@@ -4,6 +4,9 @@
 包含内容 Agent 所需的所有提示词模板。
 支持职位描述匹配优化。
 """
+from typing import Any
+
+from common.prompt_template import PromptTemplate
 
 # =============================================================================
 # 系统提示词
@@ -33,12 +36,9 @@ CONTENT_AGENT_SYSTEM_PROMPT = """你是一位资深的简历优化专家，拥
 # 内容分析提示词
 # =============================================================================
 
-CONTENT_THINK_PROMPT = """请分析以下简历内容，识别需要优化的地方：
+# 静态指令在前、简历数据在后：同一模式下前缀逐字节一致，可命中服务端前缀缓存
+CONTENT_THINK_STATIC = """请分析简历内容，识别需要优化的地方。
 
-```json
-{resume_json}
-```
-{job_context}
 请从以下维度分析：
 1. 个人简介的吸引力和定位清晰度
 2. 工作经历的成就量化程度
@@ -58,9 +58,20 @@ CONTENT_THINK_PROMPT = """请分析以下简历内容，识别需要优化的地
     }},
     "weaknesses": ["问题1", "问题2", ...],
     "opportunities": ["改进点1", "改进点2", ...],{job_keywords_field}
+    "target_fields": ["需要修改的顶层字段，如 summary", "experiences", ...],
     "reasoning": "整体分析..."
 }}
-```"""
+```
+"""
+
+CONTENT_THINK_DYNAMIC_FMT = """
+**简历内容：**
+```json
+{resume_json}
+```
+{job_context}"""
+
+CONTENT_THINK_PROMPT = CONTENT_THINK_STATIC + CONTENT_THINK_DYNAMIC_FMT
 
 
 # 职位描述上下文模板
@@ -78,16 +89,8 @@ JOB_KEYWORDS_FIELD = '\n    "target_keywords": ["从JD提取的关键词1", "关
 # 内容优化执行提示词
 # =============================================================================
 
-CONTENT_EXECUTE_PROMPT = """基于以下分析，请优化简历内容：
+CONTENT_EXECUTE_STATIC = """请基于分析结果优化简历内容。
 
-**原始简历：**
-```json
-{resume_json}
-```
-
-**分析结果：**
-{reasoning}
-{job_context}
 请按以下要求优化：
 1. **个人简介 (summary)**: 重写为 2-3 句话的价值主张，突出核心竞争力{job_summary_note}
 2. **工作经历 (experiences)**: 用 STAR 法则重构，每项经历提炼 2-3 条量化成就{job_exp_note}
@@ -124,7 +127,32 @@ CONTENT_EXECUTE_PROMPT = """基于以下分析，请优化简历内容：
         {{"name": "技能名", "level": "expert/proficient/familiar"}}
     ]
 }}
-```"""
+```
+"""
+
+CONTENT_EXECUTE_DYNAMIC_FMT = """
+**原始简历：**
+```json
+{resume_json}
+```
+
+**分析结果：**
+{reasoning}
+{job_context}"""
+
+CONTENT_EXECUTE_PROMPT = CONTENT_EXECUTE_STATIC + CONTENT_EXECUTE_DYNAMIC_FMT
+
+# 补丁模式：只发送分析阶段标记为需要修改的字段，返回结果在本地合并
+CONTENT_EXECUTE_PATCH_DYNAMIC_FMT = """
+**待优化字段（原始简历中需要修改的部分）：**
+```json
+{resume_json}
+```
+
+**分析结果：**
+{reasoning}
+{job_context}
+注意：只需返回上面出现的字段（{fields}），其余字段保持不变，不要返回。以本条要求为准。"""
 
 
 # 职位相关的优化提示
@@ -132,3 +160,110 @@ JOB_SUMMARY_NOTE = "，需呼应目标岗位要求"
 JOB_EXP_NOTE = "，突出与目标岗位相关的经验"
 JOB_SKILLS_NOTE = "，优先展示JD中提到的技能"
 
+
+# =============================================================================
+# 结构化输出 JSON Schema（structured_output=True 时作为 response_format 传给后端）
+# =============================================================================
+
+CONTENT_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "analysis": {
+            "type": "object",
+            "properties": {
+                "summary_score": {"type": "number"},
+                "experience_score": {"type": "number"},
+                "project_score": {"type": "number"},
+                "skills_score": {"type": "number"},
+                "overall_score": {"type": "number"},
+                "job_match_score": {"type": "number"},
+            },
+        },
+        "weaknesses": {"type": "array", "items": {"type": "string"}},
+        "opportunities": {"type": "array", "items": {"type": "string"}},
+        "target_keywords": {"type": "array", "items": {"type": "string"}},
+        "target_fields": {"type": "array", "items": {"type": "string"}},
+        "reasoning": {"type": "string"},
+    },
+    "required": ["analysis", "weaknesses", "opportunities"],
+}
+
+CONTENT_RESUME_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "title": {"type": "string"},
+        "email": {"type": "string"},
+        "phone": {"type": "string"},
+        "summary": {"type": "string"},
+        "education": {"type": "array"},
+        "experiences": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "company": {"type": "string"},
+                    "position": {"type": "string"},
+                    "period": {"type": "string"},
+                    "highlights": {"type": "array", "items": {"type": "string"}},
+                },
+            },
+        },
+        "projects": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "role": {"type": "string"},
+                    "period": {"type": "string"},
+                    "description": {"type": "string"},
+                    "highlights": {"type": "array", "items": {"type": "string"}},
+                },
+            },
+        },
+        "skills": {"type": "array"},
+    },
+    "required": ["name", "summary"],
+}
+
+
+# =============================================================================
+# 模板渲染（导入时预解析，渲染时只做拼接）
+# =============================================================================
+
+_JOB_CONTEXT_TMPL = PromptTemplate(JOB_CONTEXT_TEMPLATE)
+_THINK_DYNAMIC_TMPL = PromptTemplate(CONTENT_THINK_DYNAMIC_FMT)
+_EXECUTE_DYNAMIC_TMPL = PromptTemplate(CONTENT_EXECUTE_DYNAMIC_FMT)
+_EXECUTE_PATCH_DYNAMIC_TMPL = PromptTemplate(CONTENT_EXECUTE_PATCH_DYNAMIC_FMT)
+
+# 无职位描述时 job_context 恒为空串，导入时预先代入，渲染时少一个字段
+_THINK_DYNAMIC_NO_JOB_TMPL = _THINK_DYNAMIC_TMPL.partial(job_context="")
+_EXECUTE_DYNAMIC_NO_JOB_TMPL = _EXECUTE_DYNAMIC_TMPL.partial(job_context="")
+_EXECUTE_PATCH_DYNAMIC_NO_JOB_TMPL = _EXECUTE_PATCH_DYNAMIC_TMPL.partial(job_context="")
+
+
+def render_job_context(**values: Any) -> str:
+    """渲染 JOB_CONTEXT_TEMPLATE"""
+    return _JOB_CONTEXT_TMPL.render(**values)
+
+
+def render_think_dynamic(**values: Any) -> str:
+    """渲染 CONTENT_THINK_DYNAMIC_FMT"""
+    if values.get("job_context"):
+        return _THINK_DYNAMIC_TMPL.render(**values)
+    return _THINK_DYNAMIC_NO_JOB_TMPL.render(**values)
+
+
+def render_execute_dynamic(**values: Any) -> str:
+    """渲染 CONTENT_EXECUTE_DYNAMIC_FMT"""
+    if values.get("job_context"):
+        return _EXECUTE_DYNAMIC_TMPL.render(**values)
+    return _EXECUTE_DYNAMIC_NO_JOB_TMPL.render(**values)
+
+
+def render_execute_patch_dynamic(**values: Any) -> str:
+    """渲染 CONTENT_EXECUTE_PATCH_DYNAMIC_FMT"""
+    if values.get("job_context"):
+        return _EXECUTE_PATCH_DYNAMIC_TMPL.render(**values)
+    return _EXECUTE_PATCH_DYNAMIC_NO_JOB_TMPL.render(**values)
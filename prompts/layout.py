@@ -28,11 +28,8 @@ LAYOUT_AGENT_SYSTEM_PROMPT = """你是一位顶尖的简历设计专家，专注
 # 布局分析提示词
 # =============================================================================
 
-LAYOUT_THINK_PROMPT = """请分析以下简历内容，确定最佳布局策略：
-
-```json
-{resume_json}
-```
+# 静态指令在前、简历数据在后：前缀逐字节一致，可命中服务端前缀缓存
+LAYOUT_THINK_STATIC = """请分析简历内容，确定最佳布局策略。
 
 分析维度：
 1. **内容量评估**: 各章节的内容多少，是否需要精简
@@ -65,24 +62,23 @@ LAYOUT_THINK_PROMPT = """请分析以下简历内容，确定最佳布局策略
     "special_suggestions": ["建议1", "建议2"],
     "reasoning": "整体分析..."
 }}
+```
+"""
+
+LAYOUT_THINK_DYNAMIC_FMT = """
+**简历内容：**
+```json
+{resume_json}
 ```"""
 
+LAYOUT_THINK_PROMPT = LAYOUT_THINK_STATIC + LAYOUT_THINK_DYNAMIC_FMT
+
 
 # =============================================================================
 # 布局执行提示词
 # =============================================================================
 
-LAYOUT_EXECUTE_PROMPT = """基于以下分析，请生成最优布局配置：
-
-**简历内容：**
-```json
-{resume_json}
-```
-
-**分析结果：**
-{reasoning}
-
-请生成详细的布局配置，确保：
+LAYOUT_EXECUTE_STATIC = """请基于简历内容和分析结果，生成详细的最优布局配置，确保：
 1. 章节顺序符合职业阶段（应届生教育优先，资深者经验优先）
 2. 选择合适的样式风格（modern/classic/minimal）
 3. 根据内容密度调整间距和紧凑模式
@@ -123,7 +119,103 @@ LAYOUT_EXECUTE_PROMPT = """基于以下分析，请生成最优布局配置：
     }},
     "design_notes": "设计说明..."
 }}
-```"""
+```
+"""
+
+LAYOUT_EXECUTE_DYNAMIC_FMT = """
+**简历内容：**
+```json
+{resume_json}
+```
+
+**分析结果：**
+{reasoning}"""
+
+LAYOUT_EXECUTE_PROMPT = LAYOUT_EXECUTE_STATIC + LAYOUT_EXECUTE_DYNAMIC_FMT
+
+
+# =============================================================================
+# 布局分析 + 配置合并提示词（一次调用同时完成 think 与 execute）
+# =============================================================================
+
+LAYOUT_COMBINED_STATIC = """请分析简历内容，确定最佳布局策略，并据此生成详细的最优布局配置。
+
+分析维度：
+1. **内容量评估**: 各章节的内容多少，是否需要精简
+2. **职业阶段判断**: 应届生/初级/中级/资深
+3. **重点章节识别**: 哪些内容是核心卖点
+4. **视觉权重分配**: 各章节应该占多大篇幅
+5. **特殊处理建议**: 是否需要技能条、时间轴等
+
+配置要求：
+1. 章节顺序符合职业阶段（应届生教育优先，资深者经验优先）
+2. 选择合适的样式风格（modern/classic/minimal）
+3. 根据内容密度调整间距和紧凑模式
+4. 配置合适的视觉元素（图标、技能条等）
+
+在一个 JSON 对象中返回分析结果（analysis）和完整配置（layout_config）：
+```json
+{{
+    "analysis": {{
+        "content_analysis": {{
+            "total_items": 数量,
+            "experiences_count": 数量,
+            "projects_count": 数量,
+            "education_count": 数量,
+            "skills_count": 数量,
+            "content_density": "sparse/normal/dense"
+        }},
+        "career_stage": "freshman/junior/mid/senior",
+        "key_sections": ["最重要章节1", "次重要章节2"],
+        "visual_weight": {{
+            "header": 0.1,
+            "summary": 0.1,
+            "experience": 0.35,
+            "projects": 0.25,
+            "education": 0.1,
+            "skills": 0.1
+        }},
+        "special_suggestions": ["建议1", "建议2"],
+        "reasoning": "整体分析..."
+    }},
+    "layout_config": {{
+        "section_order": ["header", "summary", ...],
+        "style": "modern/classic/minimal/creative",
+        "color_scheme": "professional/vibrant/elegant/monochrome",
+        "font_config": {{
+            "family": "字体名",
+            "title_size": 18,
+            "heading_size": 11,
+            "body_size": 9
+        }},
+        "spacing_config": {{
+            "margin": 0.5,
+            "section_gap": 8,
+            "item_gap": 3
+        }},
+        "visual_elements": {{
+            "use_icons": true/false,
+            "use_skill_bars": true/false,
+            "use_timeline": true/false,
+            "highlight_keywords": true/false
+        }},
+        "content_limits": {{
+            "compact_mode": true/false,
+            "max_experiences": 4,
+            "max_projects": 3,
+            "max_highlights_per_item": 4
+        }},
+        "section_styles": {{
+            "header": {{"alignment": "center/left", "show_photo": false}},
+            "skills": {{"layout": "grid/list/bars", "columns": 3}}
+        }},
+        "design_notes": "设计说明..."
+    }}
+}}
+```
+"""
+
+LAYOUT_COMBINED_PROMPT = LAYOUT_COMBINED_STATIC + LAYOUT_THINK_DYNAMIC_FMT
 
 
 # =============================================================================
@@ -13,7 +13,6 @@ from common import get_logger, set_level, setup_logging
 from resume_copilot.application.resume_product_service import ResumeProductService
 from resume_copilot.application.resume_workbench_service import ResumeWorkbenchService
 
-setup_logging()
 logger = get_logger(__name__)
 
 
@@ -22,7 +21,7 @@ def create_llm(local: bool = False):
 
     if local:
         logger.info("Using local vLLM")
-        return VllmLLM()
+        return VllmLLM(session=VllmLLM.create_session())
     logger.info("Using ModelScope API")
     try:
         return ModelScopeOpenAI()
@@ -177,6 +176,7 @@ def parse_args() -> argparse.Namespace:
 
 
 def main() -> None:
+    setup_logging()
     args = parse_args()
     if args.mode is None:
         print("Resume Copilot")
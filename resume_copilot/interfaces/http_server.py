@@ -14,6 +14,7 @@ from pathlib import Path
 from typing import Any
 from urllib.parse import parse_qs, urlparse
 
+from common import setup_logging
 from resume_copilot.application import (
     PersonalJobSearchService,
     ResumeProductService,
@@ -341,6 +342,7 @@ def main() -> None:
         ),
     )
     args = parser.parse_args()
+    setup_logging()
     run_server(
         host=args.host,
         port=args.port,
@@ -42,7 +42,8 @@ AWARD_PRIORITY_PATTERNS = (
 
 def curate_resume(resume_data: dict[str, Any], job_description: str = "") -> tuple[dict[str, Any], list[str]]:
     """Apply product curation before layout and export."""
-    curated = copy.deepcopy(normalize_resume_data(resume_data))
+    # normalize_resume_data already returns a deep copy.
+    curated = normalize_resume_data(resume_data)
     suggestions: list[str] = []
 
     if curated.get("projects"):
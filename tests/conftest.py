@@ -48,6 +48,15 @@ class MockKnowledgeBase:
 # Fixtures
 # =============================================================================
 
+@pytest.fixture(autouse=True)
+def clear_llm_response_cache():
+    """每个用例前后清空进程级 LLM 响应缓存，避免用例间串扰"""
+    from agents.base import BaseLLMAgent
+    BaseLLMAgent.clear_response_cache()
+    yield
+    BaseLLMAgent.clear_response_cache()
+
+
 @pytest.fixture
 def mock_llm():
     """提供 Mock LLM"""
@@ -117,6 +117,288 @@ class TestReactAgent:
         tool_messages = [m for m in agent.conversation.to_list(compatible=False) if m["role"] == "tool"]
         assert "Tool argument validation failed" in tool_messages[0]["content"]
 
+    def test_arun_many_overlaps_requests(self):
+        import asyncio
+        import threading
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        class EchoLLM:
+            def chat(self, messages, **kwargs):
+                # Both requests must be waiting on the LLM at once, or the barrier times out
+                barrier.wait()
+                return {"content": f"final_answer: {messages[-1]['content']}"}
+
+        agent = ReactAgent(llm=EchoLLM(), tools=[])
+        results = asyncio.run(agent.arun_many(["a", "b"], max_concurrency=2))
+
+        assert results == ["final_answer: a", "final_answer: b"]
+        assert len(agent.conversation) == 0
+
+    def test_arun_many_isolates_memory_sessions(self):
+        import asyncio
+        import itertools
+        import threading
+
+        barrier = threading.Barrier(2, timeout=5)
+        session_ids = itertools.count()
+
+        class FakeMemory:
+            def __init__(self):
+                self.session_id = "parent"
+                self.turns = []
+                self.contexts = {}
+
+            def new_session(self):
+                self.session_id = f"fork-{next(session_ids)}"
+                return self.session_id
+
+            def add_conversation(self, role, content, importance=0.5):
+                self.turns.append((self.session_id, content))
+
+            def add_task_result(self, task, result, success, importance=0.5):
+                pass
+
+            def get_context(self, query, max_items=5, include_recent=3):
+                # Both requests have written their user turn before either reads
+                barrier.wait()
+                context = " | ".join(c for sid, c in self.turns if sid == self.session_id)
+                self.contexts[query] = context
+                return context
+
+        class EchoLLM:
+            def chat(self, messages, **kwargs):
+                return {"content": f"final_answer: {messages[-1]['content']}"}
+
+        memory = FakeMemory()
+        agent = ReactAgent(llm=EchoLLM(), tools=[], memory=memory)
+        asyncio.run(agent.arun_many(["a", "b"], max_concurrency=2))
+
+        assert memory.contexts == {"a": "a", "b": "b"}
+        assert memory.session_id == "parent"
+        assert {sid for sid, _ in memory.turns} == {"fork-0", "fork-1"}
+
+    def test_response_cache_skips_repeated_request(self):
+        from common.response_cache import ResponseCache
+
+        llm = MockLLM([{"content": "final_answer: ok"}])
+        cache = ResponseCache(maxsize=8, ttl=None)
+        agent = ReactAgent(llm=llm, tools=[], response_cache=cache, project_directory="/nonexistent")
+
+        assert agent.run("hello") == "final_answer: ok"
+        agent.reset()
+        assert agent.run("hello") == "final_answer: ok"
+        assert llm.call_count == 1
+
+        # Different tool set -> different key
+        other = ReactAgent(llm=llm, tools=[Calculator()], response_cache=cache, project_directory="/nonexistent")
+        other.run("hello")
+        assert llm.call_count == 2
+
+    def test_system_prompt_reused_until_tools_or_files_change(self, tmp_path):
+        import os
+
+        agent = ReactAgent(llm=MockLLM([{"content": "final_answer: ok"}]), tools=[], project_directory=str(tmp_path))
+        calls = []
+        original = agent._format_tools
+        agent._format_tools = lambda: calls.append(1) or original()
+
+        first = agent._render_system_prompt()
+        assert agent._render_system_prompt() == first
+        assert len(calls) == 1
+
+        agent.tool_registry.register(Calculator())
+        assert "calculator" in agent._render_system_prompt()
+
+        (tmp_path / "notes.txt").write_text("x", encoding="utf-8")
+        os.utime(tmp_path, ns=(0, 1))
+        assert "notes.txt" in agent._render_system_prompt()
+        assert len(calls) == 3
+        # the file change re-rendered the prompt but reused the formatted tool list
+        assert agent._format_tools() is original()
+
+    def test_file_list_skips_directories_and_caps_at_ten(self, tmp_path):
+        (tmp_path / "subdir").mkdir()
+        for i in range(12):
+            (tmp_path / f"f{i}.txt").write_text("x", encoding="utf-8")
+
+        agent = ReactAgent(llm=MockLLM([{"content": "ok"}]), tools=[], project_directory=str(tmp_path))
+        files = agent._get_files().split(", ")
+
+        assert len(files) == 10
+        assert "subdir" not in files
+        assert ReactAgent(llm=MockLLM([{"content": "ok"}]), tools=[], project_directory=str(tmp_path / "subdir"))._get_files() == "No files."
+
+    def test_stream_stops_after_complete_action(self):
+        consumed = []
+
+        class StreamLLM(MockLLM):
+            def chat_stream(self, messages, **kwargs):
+                self.call_count += 1
+                if self.call_count > 1:
+                    yield "final_answer: 2"
+                    return
+                for chunk in ['Action: {"name": "calculator", ', '"arguments": {"expression": "1+1"}}', " trailing", " text"]:
+                    consumed.append(chunk)
+                    yield chunk
+
+        llm = StreamLLM([{"content": "unused"}])
+        agent = ReactAgent(llm=llm, tools=[Calculator()], stream=True)
+
+        assert agent.run("calculate 1+1") == "final_answer: 2"
+        assert len(consumed) == 2
+        assert llm.calls == []
+
+    def test_pure_tool_calls_deduplicated_and_io_bound_run_concurrently(self):
+        import threading
+
+        from core.parser import ToolCall
+        from tools.base import BaseTool
+
+        barrier = threading.Barrier(2, timeout=5)
+        executed = []
+
+        class Fetch(BaseTool):
+            is_pure = True
+            is_io_bound = True
+
+            def __init__(self):
+                super().__init__(name="fetch", description="fetch")
+
+            def execute(self, url=""):
+                executed.append(("fetch", url))
+                # Both distinct fetches must be in flight together, or the barrier times out
+                barrier.wait()
+                return f"page {url}"
+
+        class Write(BaseTool):
+            def __init__(self):
+                super().__init__(name="write", description="write")
+
+            def execute(self, text=""):
+                executed.append(("write", text))
+                return "written"
+
+        agent = ReactAgent(llm=MockLLM([{"content": "ok"}]), tools=[Fetch(), Write()])
+        calls = [
+            ToolCall("fetch", {"url": "a"}),
+            ToolCall("fetch", {"url": "b"}),
+            ToolCall("fetch", {"url": "a"}),
+            ToolCall("write", {"text": "x"}),
+            ToolCall("write", {"text": "x"}),
+        ]
+
+        results = agent._run_tool_calls(calls)
+
+        assert results == ["page a", "page b", "page a", "written", "written"]
+        assert sorted(executed[:2]) == [("fetch", "a"), ("fetch", "b")]
+        assert executed[2:] == [("write", "x"), ("write", "x")]
+
+    def test_context_window_summarizes_old_messages(self):
+        action = {"content": 'Action: {"name": "calculator", "arguments": {"expression": "1+1"}}'}
+        responses = [
+            action,
+            action,
+            {"content": "earlier: asked to add, got 2"},
+            action,
+            {"content": "final_answer: 2"},
+        ]
+        llm = MockLLM(responses)
+        agent = ReactAgent(llm=llm, tools=[Calculator()], context_window=2, summary_interval=3, max_rounds=5)
+
+        result = agent.run("calculate 1+1")
+
+        assert "2" in result
+        summary_call = llm.calls[2]["messages"]
+        assert len(summary_call) == 1 and "calculate 1+1" in summary_call[0]["content"]
+        last = llm.calls[-1]["messages"]
+        assert last[1] == {"role": "system", "content": "Prior context summary:\nearlier: asked to add, got 2"}
+        # system prompt, summary, then the four messages since the cut
+        assert len(last) == 2 + 4
+        assert len(agent.conversation) == 8
+
+    def test_async_tool_is_awaited(self):
+        from tools import AsyncBaseTool
+
+        class EchoTool(AsyncBaseTool):
+            def __init__(self):
+                super().__init__(name="echo", description="echo text")
+
+            async def execute(self, text: str = "") -> str:
+                return f"echo: {text}"
+
+        responses = [
+            {"content": 'Action: {"name": "echo", "arguments": {"text": "hi"}}'},
+            {"content": "final_answer: done"},
+        ]
+        llm = MockLLM(responses)
+        agent = ReactAgent(llm=llm, tools=[EchoTool()])
+        agent.run("echo hi")
+
+        tool_messages = [m for m in agent.conversation.to_list(compatible=False) if m["role"] == "tool"]
+        assert tool_messages[0]["content"] == "echo: hi"
+
+    def test_async_tool_inside_running_loop(self):
+        import asyncio
+
+        from tools import AsyncBaseTool
+
+        class EchoTool(AsyncBaseTool):
+            def __init__(self):
+                super().__init__(name="echo", description="echo text")
+
+            async def execute(self, text: str = "") -> str:
+                return f"echo: {text}"
+
+        agent = ReactAgent(llm=MockLLM([{"content": "ok"}]), tools=[EchoTool()])
+
+        async def handler():
+            # e.g. an async web handler calling the synchronous agent API
+            return agent._execute_single_tool("echo", {"text": "hi"})
+
+        assert asyncio.run(handler()) == "echo: hi"
+
+    def test_nested_agent_under_tool_worker_skips_pool(self):
+        import asyncio
+        import threading
+
+        from core.parser import ToolCall
+        from tools.base import BaseTool
+
+        inner_threads = []
+
+        class Probe(BaseTool):
+            is_pure = True
+            is_io_bound = True
+
+            def __init__(self):
+                super().__init__(name="probe", description="probe")
+
+            def execute(self, key=""):
+                inner_threads.append(threading.current_thread().name)
+                return key
+
+        inner = ReactAgent(llm=MockLLM([{"content": "ok"}]), tools=[Probe()])
+        inner_calls = [ToolCall("probe", {"key": "x"}), ToolCall("probe", {"key": "y"})]
+
+        class Delegate(BaseTool):
+            is_pure = True
+            is_io_bound = True
+
+            def __init__(self):
+                super().__init__(name="delegate", description="delegate")
+
+            def execute(self, key=""):
+                # reaches the nested agent through asyncio.to_thread, off the tool pool
+                return ",".join(asyncio.run(asyncio.to_thread(inner._run_tool_calls, inner_calls)))
+
+        outer = ReactAgent(llm=MockLLM([{"content": "ok"}]), tools=[Delegate()])
+
+        results = outer._run_tool_calls([ToolCall("delegate", {"key": "a"}), ToolCall("delegate", {"key": "b"})])
+
+        assert results == ["x,y", "x,y"]
+        assert inner_threads and not any(name.startswith("react-tool") for name in inner_threads)
+
     def test_reset(self):
         llm = MockLLM([{"content": "final_answer: ok"}])
         agent = ReactAgent(llm=llm, tools=[])
@@ -154,6 +436,48 @@ class TestConversation:
         conv.clear()
         assert len(conv) == 0
 
+    def test_to_list_converts_only_new_messages(self, monkeypatch):
+        converted = []
+        original = Message.to_dict
+
+        def counting_to_dict(self, compatible=True):
+            converted.append(self.content)
+            return original(self, compatible=compatible)
+
+        monkeypatch.setattr(Message, "to_dict", counting_to_dict)
+        conv = Conversation()
+        conv.add_user("a")
+        conv.add_assistant("b")
+        conv.to_list()
+        conv.add_tool_result("calc", "c")
+        messages = conv.to_list()
+
+        assert converted == ["a", "b", "c"]
+        assert [m["content"] for m in messages][:2] == ["a", "b"]
+
+        conv.clear()
+        conv.add_user("d")
+        assert conv.to_list() == [{"role": "user", "content": "d"}]
+
+    def test_to_list_tracks_direct_writes_to_messages(self):
+        conv = Conversation()
+        conv.add_user("a")
+        conv.add_assistant("b")
+        conv.to_list()
+
+        conv.messages[1] = Message.assistant("c")
+        assert [m["content"] for m in conv.to_list()] == ["a", "c"]
+
+        conv.messages = [Message.user("x"), Message.user("y")]
+        assert [m["content"] for m in conv.to_list()] == ["x", "y"]
+
+    def test_to_list_returns_independent_dicts(self):
+        conv = Conversation()
+        conv.add_user("a")
+        conv.to_list()[0]["content"] = "changed"
+
+        assert conv.to_list() == [{"role": "user", "content": "a"}]
+
 
 class TestMessage:
     def test_user_message(self):
@@ -183,6 +507,12 @@ class TestMessage:
         assert "tool_calls" in data
         assert data["tool_calls"][0]["function"]["name"] == "calculator"
 
+    def test_messages_are_slotted_and_share_empty_tool_calls(self):
+        first, second = Message.user("a"), Message.assistant("b")
+        assert not hasattr(first, "__dict__")
+        assert first.tool_calls is second.tool_calls
+        assert "tool_calls" not in second.to_dict(compatible=False)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
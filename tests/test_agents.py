@@ -24,6 +24,18 @@ class MockLLM:
         return self.response
 
 
+class RecordingLLM(MockLLM):
+    """模拟 LLM，按顺序记录每次请求的用户提示词"""
+    
+    def __init__(self, response: str = ""):
+        super().__init__(response)
+        self.prompts = []
+    
+    def chat(self, prompt, system_prompt: str = None) -> str:
+        self.prompts.append(prompt[-1]["content"] if isinstance(prompt, list) else prompt)
+        return super().chat(prompt, system_prompt)
+
+
 class TestContentAgent:
     """测试 ContentAgent"""
     
@@ -97,6 +109,186 @@ class TestContentAgent:
         
         assert result.success == True
         assert "name" in result.data
+    
+    def test_keyword_extraction_overlaps_think(self):
+        """关键词提取与 think 并行执行"""
+        import threading
+        from agents import ContentAgent
+        
+        barrier = threading.Barrier(2, timeout=5)
+        
+        class BarrierLLM(MockLLM):
+            def chat(self, prompt, system_prompt=None):
+                # 关键词提取和 think 的首次请求必须同时在途
+                if self.call_count < 2:
+                    self.call_count += 1
+                    barrier.wait()
+                    return "Python, SQL" if "只返回关键词列表" in str(prompt) else "{}"
+                return super().chat(prompt, system_prompt)
+        
+        llm = BarrierLLM(response='{"name": "张三", "summary": "Python 工程师"}')
+        agent = ContentAgent(llm)
+        result = agent.run({"name": "张三"}, job_description="招聘 Python 工程师")
+        
+        assert result.success
+        assert agent.get_job_keywords() == ["Python", "SQL"]
+        assert result.suggestions[0].startswith("职位关键词匹配度")
+    
+    def test_keyword_match_uses_string_values(self):
+        """匹配度只看字符串值，忽略大小写"""
+        from agents import ContentAgent
+        
+        agent = ContentAgent(MockLLM())
+        agent._extracted_keywords = ["python", "Docker", "skills"]
+        
+        info = agent._calculate_keyword_match({"skills": ["Python"], "projects": [{"tech": "docker"}]})
+        
+        assert info == "职位关键词匹配度: 67% (2/3)"
+    
+    def test_extract_job_keywords_prefilter(self):
+        """本地词表命中足够多时不调用 LLM；不足时与 LLM 结果合并去重"""
+        from agents import ContentAgent
+        
+        llm = MockLLM(response="Python, 分布式系统")
+        agent = ContentAgent(llm)
+        
+        jd = "熟悉 Python、Java、Go、MySQL、Redis、Kafka、Docker、Kubernetes"
+        assert len(agent._extract_job_keywords(jd)) >= ContentAgent.KEYWORD_PREFILTER_THRESHOLD
+        assert llm.call_count == 0
+        
+        assert agent._extract_job_keywords("熟悉 Python 和 Redis") == ["Python", "分布式系统", "Redis"]
+        assert llm.call_count == 1
+    
+    def test_background_keyword_call_leaves_attempt_state_alone(self):
+        """后台关键词提取不写入对话历史和本次尝试的缓存键"""
+        from agents import ContentAgent
+        
+        agent = ContentAgent(MockLLM(response="Python, 分布式系统"), history_maxlen=None)
+        agent._extract_job_keywords("熟悉 Python 和 Redis")
+        
+        assert agent._attempt_cache_keys == []
+        assert len(agent.conversation_history) == 0
+    
+    def test_keyword_match_rates_batch(self):
+        """同一组关键词批量计算多份简历的匹配率"""
+        from agents import ContentAgent
+        
+        agent = ContentAgent(MockLLM())
+        agent._extracted_keywords = ["Python", "Docker"]
+        
+        rates = agent.keyword_match_rates([
+            {"skills": ["python", "docker"]},
+            {"skills": ["Python"]},
+            {"skills": []},
+        ])
+        
+        assert rates == [1.0, 0.5, 0.0]
+    
+    def test_simple_keyword_extract_overlapping(self):
+        """单次扫描仍保持子串语义（JavaScript 同时命中 Java）"""
+        from agents import ContentAgent
+        
+        agent = ContentAgent(MockLLM())
+        found = agent._simple_keyword_extract("熟悉 JavaScript 与 PostgreSQL")
+        
+        assert found == ["Java", "JavaScript", "PostgreSQL"]
+    
+    def test_execute_patch_mode(self):
+        """补丁模式只发送 target_fields 并在本地合并"""
+        from agents import ContentAgent
+        
+        llm = RecordingLLM(response='{"summary": "资深后端工程师"}')
+        agent = ContentAgent(llm)
+        
+        resume_data = {"name": "测试用户", "email": "a@b.com", "summary": "工程师"}
+        reasoning = json.dumps({"target_fields": ["summary", "unknown"]})
+        
+        result = agent.execute(resume_data, reasoning)
+        
+        assert result.success
+        assert "a@b.com" not in llm.prompts[0]
+        assert result.data == {"name": "测试用户", "email": "a@b.com", "summary": "资深后端工程师"}
+    
+    def test_execute_reuses_think_analysis(self):
+        """execute 复用 think 的解析结果，并最多返回 5 条建议"""
+        from agents import ContentAgent
+        
+        analysis = json.dumps({
+            "weaknesses": ["w1", "w2", "w3"],
+            "opportunities": ["o1", "o2", "o3"],
+        })
+        agent = ContentAgent(MockLLM(response=analysis), patch_mode=False)
+        reasoning = agent.think({"name": "测试用户"})
+        
+        with patch.object(agent, "_parse_json_response", wraps=agent._parse_json_response) as parse:
+            agent.llm.response = '{"name": "测试用户"}'
+            result = agent.execute({"name": "测试用户"}, reasoning)
+        
+        assert result.suggestions == ["w1", "w2", "w3", "o1", "o2"]
+        # 只解析了 execute 自己的响应
+        assert parse.call_count == 1
+    
+    def test_execute_drops_invalid_fields(self):
+        """类型不符的字段保留原值"""
+        from agents import ContentAgent
+        
+        llm = MockLLM(response='{"summary": {"text": "x"}, "title": "高级工程师"}')
+        agent = ContentAgent(llm, patch_mode=False)
+        
+        result = agent.execute({"name": "测试用户", "summary": "工程师"}, "{}")
+        
+        assert result.success
+        assert result.data["summary"] == "工程师"
+        assert result.data["title"] == "高级工程师"
+    
+    def test_optimize_experiences_batch(self):
+        """多条经历合并为一次 LLM 请求"""
+        from agents import ContentAgent
+        
+        experiences = [
+            {"company": f"公司{i}", "position": "工程师", "highlights": ["写代码"]}
+            for i in range(3)
+        ]
+        optimized = [
+            {**exp, "highlights": ["主导核心模块开发，性能提升 30%"]}
+            for exp in experiences
+        ]
+        llm = MockLLM(response=f"```json\n{json.dumps(optimized, ensure_ascii=False)}\n```")
+        agent = ContentAgent(llm)
+        
+        result = agent.optimize_experiences_batch(experiences)
+        
+        assert llm.call_count == 1
+        assert result == optimized
+    
+    def test_optimize_experiences_batch_fallback(self):
+        """批量结果无效时逐条回退，仍失败则保留原经历"""
+        from agents import ContentAgent
+        
+        experiences = [{"company": "A"}, {"company": "B"}]
+        llm = MockLLM(response="无法处理")
+        agent = ContentAgent(llm)
+        
+        result = agent.optimize_experiences_batch(experiences)
+        
+        # 1 次批量 + 2 次逐条
+        assert llm.call_count == 3
+        assert result == experiences
+    
+    def test_optimize_experiences_batch_invalid_item(self):
+        """批量结果中格式不符的条目单独重试"""
+        from agents import ContentAgent
+        
+        experiences = [{"company": "A"}, {"company": "B"}]
+        batch = [{"company": "A", "highlights": ["主导重构"]}, {"company": "B", "highlights": "写代码"}]
+        llm = MockLLM(response=json.dumps(batch, ensure_ascii=False))
+        agent = ContentAgent(llm)
+        
+        result = agent.optimize_experiences_batch(experiences)
+        
+        # 1 次批量 + 第 2 条单独重试（单条响应仍是数组，保留原经历）
+        assert llm.call_count == 2
+        assert result == [batch[0], experiences[1]]
 
 
 class TestLayoutAgent:
@@ -132,6 +324,113 @@ class TestLayoutAgent:
         assert "education" in config["section_order"]
         assert config["section_order"].index("education") < config["section_order"].index("experience")
     
+    def test_default_config_single_internship(self):
+        """只有一段实习经历也按应届生处理"""
+        from agents import LayoutAgent
+        
+        agent = LayoutAgent(MockLLM())
+        intern = {"experiences": [{"company": "某公司", "position": "后端实习生"}]}
+        fulltime = {"experiences": [{"company": "某公司", "position": "后端工程师"}]}
+        
+        order = agent._get_default_config(intern)["section_order"]
+        assert order.index("education") < order.index("experience")
+        order = agent._get_default_config(fulltime)["section_order"]
+        assert order.index("experience") < order.index("education")
+    
+    def test_default_config_returns_copy(self):
+        """默认配置预先构建，每次返回可修改的独立副本"""
+        from agents import LayoutAgent
+        
+        agent = LayoutAgent(MockLLM())
+        first = agent._get_default_config({})
+        first["section_order"].append("awards")
+        first["font_config"]["title_size"] = 99
+        second = agent._get_default_config({})
+        
+        assert isinstance(second["section_order"], list)
+        assert "awards" not in second["section_order"]
+        assert second["font_config"]["title_size"] == 20
+    
+    def test_structural_cache_reuses_layout_for_same_shape(self):
+        """结构相同的简历复用布局配置，不再调用 LLM，但按各自内容精简"""
+        from agents import LayoutAgent
+        
+        LayoutAgent._layout_cache.clear()
+        llm = MockLLM(response='{"style": "classic", "content_limits": {"max_highlights_per_item": 1}}')
+        agent = LayoutAgent(llm, structural_cache=True)
+        
+        first = agent.run({"name": "张三", "experience": [{"company": "A", "highlights": ["1", "2"]}]})
+        calls = llm.call_count
+        second = agent.run({"name": "李四", "experience": [{"company": "B", "highlights": ["3", "4"]}]})
+        third = agent.run({"name": "王五", "experience": []})
+        
+        assert first.data["layout_config"]["style"] == "classic"
+        assert second.data["layout_config"] == first.data["layout_config"]
+        assert second.data["resume_data"]["experience"] == [{"company": "B", "highlights": ["3"]}]
+        assert llm.call_count == calls + 2  # 第二份命中缓存，第三份结构不同
+        assert third.success
+        LayoutAgent._layout_cache.clear()
+    
+    def test_fused_run_makes_single_llm_call(self):
+        """fused 模式下分析与配置一次调用完成，execute 不再请求 LLM"""
+        from agents import LayoutAgent
+        
+        llm = MockLLM(response=json.dumps({
+            "analysis": {"career_stage": "junior"},
+            "layout_config": {"style": "minimal", "content_limits": {"max_projects": 1}},
+        }))
+        agent = LayoutAgent(llm, fused=True)
+        
+        result = agent.run({"name": "张三", "projects": [{"name": "A"}, {"name": "B"}]})
+        
+        assert result.success
+        assert llm.call_count == 1
+        assert result.data["layout_config"]["style"] == "minimal"
+        assert result.data["resume_data"]["projects"] == [{"name": "A"}]
+        assert json.loads(result.reasoning) == {"career_stage": "junior"}
+    
+    def test_fused_falls_back_to_execute_call(self):
+        """合并响应缺少 layout_config 时 execute 单独生成配置"""
+        from agents import LayoutAgent
+        
+        llm = MockLLM(response='{"style": "classic"}')
+        agent = LayoutAgent(llm, fused=True)
+        
+        result = agent.run({"name": "张三"})
+        
+        assert result.success
+        assert llm.call_count == 2
+        assert result.data["layout_config"]["style"] == "classic"
+    
+    def test_fused_array_response_falls_back(self):
+        """合并响应为顶层数组时 think 不抛异常，execute 使用默认配置"""
+        from agents import LayoutAgent
+        
+        llm = MockLLM(response='[{"style": "classic"}]')
+        agent = LayoutAgent(llm, fused=True)
+        
+        assert agent.think({"name": "张三"}) == '[{"style": "classic"}]'
+        result = agent.run({"name": "张三"})
+        
+        assert result.success
+        assert result.data["layout_config"] == agent._get_default_config({"name": "张三"})
+    
+    def test_generate_style_config_returns_copy(self):
+        """样式预设无需 LLM，返回副本不影响预设"""
+        from agents import LayoutAgent
+        from agents.crews.resume.layout_agent import STYLE_PRESETS
+        
+        llm = MockLLM()
+        agent = LayoutAgent(llm)
+        config = agent.generate_style_config("classic")
+        config["font_config"]["title_size"] = 99
+        
+        assert llm.call_count == 0
+        assert STYLE_PRESETS["classic"]["font_config"]["title_size"] == 14
+        with pytest.raises(TypeError):
+            STYLE_PRESETS["classic"]["font_config"]["title_size"] = 1
+        assert agent.generate_style_config("unknown")["style"] == "modern"
+    
     def test_trim_content(self):
         """测试内容精简"""
         from agents import LayoutAgent
@@ -163,6 +462,703 @@ class TestLayoutAgent:
         assert len(trimmed["experiences"]) == 3
         assert len(trimmed["projects"]) == 2
         assert len(trimmed["experiences"][0]["highlights"]) == 4
+    
+    def test_trim_content_leaves_input_untouched(self):
+        """精简结果不与调用方数据共享可变对象"""
+        from agents import LayoutAgent
+        
+        agent = LayoutAgent(MockLLM())
+        resume_data = {
+            "experience": [{"company": "A", "highlights": ["1", "2", "3"]}, {"company": "B"}],
+        }
+        
+        trimmed = agent._trim_content(
+            resume_data,
+            {"content_limits": {"max_experiences": 1, "max_highlights_per_item": 2}},
+        )
+        
+        assert trimmed["experience"] == [{"company": "A", "highlights": ["1", "2"]}]
+        assert len(resume_data["experience"]) == 2
+        assert resume_data["experience"][0]["highlights"] == ["1", "2", "3"]
+        
+        # 旧字段名 experiences 同样不被修改
+        legacy = {"experiences": [{"company": "A", "highlights": ["1", "2", "3"]}]}
+        agent._trim_content(legacy, {"content_limits": {"max_highlights_per_item": 1}})
+        assert legacy["experiences"][0]["highlights"] == ["1", "2", "3"]
+
+
+class TestParseJsonResponse:
+    """测试 JSON 响应解析"""
+    
+    def test_fenced_block(self):
+        from agents import ContentAgent
+        
+        agent = ContentAgent(MockLLM())
+        parsed = agent._parse_json_response('说明\n```json\n{"a": 1}\n```\n结束')
+        
+        assert parsed == {"a": 1}
+    
+    def test_first_object_with_trailing_prose(self):
+        """字符串中的括号不影响定界，JSON 之后的文字被忽略"""
+        from agents import ContentAgent
+        
+        agent = ContentAgent(MockLLM())
+        parsed = agent._parse_json_response('结果：{"a": {"b": "x}y"}} 以上 {注释}')
+        
+        assert parsed == {"a": {"b": "x}y"}}
+    
+    def test_unparseable(self):
+        from agents import ContentAgent
+        
+        agent = ContentAgent(MockLLM())
+        
+        assert agent._parse_json_response("没有 JSON") == {"raw_response": "没有 JSON"}
+    
+    def test_result_not_shared_outside_run(self):
+        """run 之外修改解析结果不影响下一次解析同一响应"""
+        from agents import ContentAgent
+        
+        response = '{"highlights": ["h1"]}'
+        llm = MockLLM(response=response)
+        agent = ContentAgent(llm)
+        
+        first = agent._parse_json_response(response)
+        first["highlights"].append("MUTATED")
+        
+        assert agent._parse_json_response(response) == {"highlights": ["h1"]}
+        
+        first = agent._optimize_single_experience({"company": "A", "highlights": ["h1"]})
+        first["highlights"].append("MUTATED")
+        second = agent._optimize_single_experience({"company": "A", "highlights": ["h1"]})
+        
+        assert second is not first
+        assert "MUTATED" not in second["highlights"]
+
+
+class TestJsonRepair:
+    """测试解析失败后的 JSON 修复"""
+    
+    class _SequenceLLM:
+        def __init__(self, responses):
+            self.responses = list(responses)
+            self.prompts = []
+        
+        def chat(self, prompt, system_prompt=None):
+            self.prompts.append(str(prompt))
+            return self.responses.pop(0)
+    
+    def test_execute_repairs_prose_response(self):
+        from agents import ContentAgent
+        
+        llm = self._SequenceLLM(["优化后的简历如下：姓名张三", '{"name": "张三"}'])
+        agent = ContentAgent(llm)
+        result = agent.execute({"name": "张三"}, "{}")
+        
+        assert result.success
+        assert len(llm.prompts) == 2
+        assert "不是合法的 JSON" in llm.prompts[1]
+    
+    def test_execute_fails_after_one_repair(self):
+        from agents import ContentAgent
+        
+        llm = self._SequenceLLM(["文字", "还是文字"])
+        agent = ContentAgent(llm)
+        result = agent.execute({"name": "张三"}, "{}")
+        
+        assert not result.success
+        assert len(llm.prompts) == 2
+
+
+class TestJsonSchemaValidator:
+    """测试预编译的 JSON Schema 校验"""
+    
+    def test_nested_errors(self):
+        from common.json_schema import compile_validator
+        
+        validate = compile_validator({
+            "type": "object",
+            "required": ["name"],
+            "properties": {
+                "skills": {"type": "array", "items": {"type": "string"}},
+                "score": {"type": "number"},
+            },
+        })
+        
+        assert validate({"name": "a", "skills": ["Python"], "score": 7}) == []
+        assert len(validate({"skills": ["Python", 1], "score": True})) == 3
+
+
+class TestJsonObjectStream:
+    """测试流式 JSON 增量解析"""
+    
+    def test_fields_emitted_as_they_close(self):
+        from common.json_stream import JsonObjectStream
+        
+        stream = JsonObjectStream()
+        
+        assert stream.feed('好的：\n{"summary": "a, {b}", "skills": ["Py') == [("summary", "a, {b}")]
+        assert stream.feed('thon"], "experience": [{"company": "X"}]}') == [
+            ("skills", ["Python"]),
+            ("experience", [{"company": "X"}]),
+        ]
+        assert stream.done and not stream.failed
+    
+    def test_char_by_char_matches_whole_feed(self):
+        """逐字符输入与一次性输入的结果一致，已闭合字段不再缓存"""
+        from common.json_stream import JsonObjectStream
+        
+        text = '说明 {"a": "x,}\\"y", "b": {"c": [1, 2]}, "d": null} 结束'
+        
+        whole = JsonObjectStream()
+        expected = whole.feed(text)
+        
+        stream = JsonObjectStream()
+        members = []
+        for ch in text:
+            members.extend(stream.feed(ch))
+            assert len("".join(stream._pending)) <= len(' "b": {"c": [1, 2]}')
+        
+        assert members == expected == [("a", 'x,}"y'), ("b", {"c": [1, 2]}), ("d", None)]
+        assert stream.done and not stream.failed
+    
+    def test_content_agent_stream_merges_fields(self):
+        from agents import ContentAgent
+        
+        class StreamLLM(MockLLM):
+            def chat_stream(self, messages, **kwargs):
+                self.call_count += 1
+                yield '{"summary": "新摘要", '
+                yield '"skills": ["Python"]}'
+        
+        agent = ContentAgent(StreamLLM(), patch_mode=False, stream=True)
+        result = agent.execute({"name": "张三", "summary": "旧摘要"}, "{}")
+        
+        assert result.success
+        assert result.data == {"name": "张三", "summary": "新摘要", "skills": ["Python"]}
+        assert agent.llm.call_count == 1
+
+    
+    def test_layout_agent_stream_builds_config(self):
+        from agents import LayoutAgent
+        
+        class StreamLLM(MockLLM):
+            def chat_stream(self, messages, **kwargs):
+                self.call_count += 1
+                yield '```json\n{"style": "classic", "content_'
+                yield 'limits": {"max_projects": 1}}\n```'
+        
+        agent = LayoutAgent(StreamLLM(), stream=True)
+        result = agent.execute({"name": "张三", "projects": [{"name": "A"}, {"name": "B"}]}, "{}")
+        
+        assert result.data["layout_config"] == {"style": "classic", "content_limits": {"max_projects": 1}}
+        assert result.data["resume_data"]["projects"] == [{"name": "A"}]
+        assert agent.llm.call_count == 1
+
+class TestDumps:
+    """测试提示词 JSON 序列化"""
+    
+    def test_compact_and_unicode(self):
+        from agents.base import BaseLLMAgent
+        
+        text = BaseLLMAgent._dumps({"name": "张三", "skills": ["Python"]})
+        
+        assert "\n" not in text
+        assert "张三" in text
+        assert json.loads(text) == {"name": "张三", "skills": ["Python"]}
+
+
+class TestRunContext:
+    """测试单次 run 内的序列化复用"""
+    
+    def test_run_uses_given_reasoning(self):
+        """传入 reasoning 时首次尝试跳过 think"""
+        from agents import LayoutAgent
+        
+        llm = MockLLM(response='{"style": "modern"}')
+        agent = LayoutAgent(llm)
+        
+        result = agent.run({"name": "张三"}, reasoning="预先完成的分析")
+        
+        assert result.success
+        assert result.reasoning == "预先完成的分析"
+        assert llm.call_count == 1
+    
+    def test_retry_after_given_reasoning_rethinks(self):
+        """预取的 think 之后 execute 失败，重试时不会从缓存拿回同一份分析"""
+        from agents import LayoutAgent
+        
+        class FailFirstExecuteLLM(RecordingLLM):
+            def chat(self, prompt, system_prompt=None):
+                response = super().chat(prompt, system_prompt)
+                if self.call_count == 2:
+                    raise RuntimeError("execute 失败")
+                return response
+        
+        llm = FailFirstExecuteLLM(response='{"style": "modern"}')
+        agent = LayoutAgent(llm, max_retries=1)
+        data = {"name": "预取重试用户"}
+        
+        reasoning = agent.think(data)
+        result = agent.run(data, reasoning=reasoning)
+        
+        assert result.success
+        # think, execute（失败）, think, execute
+        assert llm.call_count == 4
+        assert llm.prompts[2] == llm.prompts[0]
+    
+    def test_resume_json_serialized_once_per_run(self):
+        from agents import ContentAgent
+        
+        agent = ContentAgent(MockLLM())
+        calls = []
+        original = agent._dumps
+        
+        def counting_dumps(obj):
+            calls.append(obj)
+            return original(obj)
+        
+        agent._dumps = counting_dumps
+        resume = {"name": "张三", "skills": ["Python"]}
+        agent.run(resume)
+        
+        assert calls.count(resume) == 1
+        assert agent._run_context is None
+    
+    def test_job_context_rendered_once_per_run(self, monkeypatch):
+        """think 与 execute（含重试）共用同一份职位上下文"""
+        from agents import ContentAgent
+        import agents.crews.resume.content_agent as content_module
+        
+        calls = []
+        original = content_module.render_job_context
+        
+        def counting_render(**values):
+            calls.append(values)
+            return original(**values)
+        
+        monkeypatch.setattr(content_module, "render_job_context", counting_render)
+        agent = ContentAgent(MockLLM())
+        agent.run({"name": "张三"}, job_description="后端工程师，熟悉 Python")
+        
+        assert len(calls) == 1
+
+
+class TestPromptPrefix:
+    """测试提示词静态前缀"""
+    
+    def test_think_prompt_starts_with_static_prefix(self):
+        from agents import ContentAgent
+        from agents.crews.resume.content_agent import _THINK_PREFIX
+        
+        agent = ContentAgent(MockLLM())
+        first = agent._build_think_prompt({"name": "张三"})
+        second = agent._build_think_prompt({"name": "李四"})
+        
+        assert first.startswith(_THINK_PREFIX[False])
+        assert second.startswith(_THINK_PREFIX[False])
+        assert "张三" in first and "张三" not in _THINK_PREFIX[False]
+    
+    def test_layout_prompts_start_with_static_prefix(self):
+        from agents import LayoutAgent
+        from agents.crews.resume.layout_agent import _EXECUTE_PREFIX, _THINK_PREFIX
+        
+        llm = RecordingLLM(response="{}")
+        agent = LayoutAgent(llm)
+        agent.execute({"name": "张三"}, agent.think({"name": "张三"}))
+        
+        prompts = llm.prompts
+        assert prompts[0].startswith(_THINK_PREFIX)
+        assert prompts[1].startswith(_EXECUTE_PREFIX)
+        assert "{{" not in _THINK_PREFIX and "张三" not in _EXECUTE_PREFIX
+    
+    def test_layout_suggest_improvements_uses_compact_json(self):
+        from agents import LayoutAgent
+        
+        llm = RecordingLLM(response="建议1\n建议2")
+        agent = LayoutAgent(llm)
+        suggestions = agent.suggest_improvements({"name": "张三", "skills": ["Python"]})
+        
+        assert suggestions == ["建议1", "建议2"]
+        assert '{"name":"张三","skills":["Python"]}' in llm.prompts[0]
+    
+    def test_given_resume_json_skips_serialization(self):
+        """调用方传入已序列化的 resume_json 时两个 Agent 都不再序列化"""
+        from agents import ContentAgent, LayoutAgent
+        
+        def fail_dumps(obj):
+            raise AssertionError("不应重复序列化")
+        
+        content, layout = ContentAgent(RecordingLLM("{}")), LayoutAgent(RecordingLLM("{}"))
+        content._dumps = layout._dumps = fail_dumps
+        resume = {"name": "张三"}
+        serialized = '{"name":"张三"}'
+        
+        content.think(resume, resume_json=serialized)
+        layout.suggest_improvements(resume, resume_json=serialized)
+        
+        prompts = content.llm.prompts + layout.llm.prompts
+        assert prompts and all(serialized in prompt for prompt in prompts)
+    
+    def test_pre_parsed_render_matches_format(self):
+        """预解析渲染与 str.format 结果一致，且不会再次解释值中的大括号"""
+        from prompts.content import CONTENT_EXECUTE_DYNAMIC_FMT, render_execute_dynamic
+        
+        values = {"resume_json": '{"a": {"b": 1}}', "reasoning": "{x}", "job_context": ""}
+        
+        assert render_execute_dynamic(**values) == CONTENT_EXECUTE_DYNAMIC_FMT.format(**values)
+        
+        # 有职位描述时走未预绑定 job_context 的模板
+        values["job_context"] = "目标职位: {JD}"
+        assert render_execute_dynamic(**values) == CONTENT_EXECUTE_DYNAMIC_FMT.format(**values)
+    
+    def test_prompt_template_partial(self):
+        """partial 提前代入字段后渲染结果与 str.format 一致"""
+        from common.prompt_template import PromptTemplate
+        
+        text = "A{x}B{{literal}}{y}C"
+        tmpl = PromptTemplate(text)
+        bound = tmpl.partial(x="1")
+        
+        assert tmpl.fields == ("x", "y")
+        assert bound.fields == ("y",)
+        assert bound.render(y="{2}") == text.format(x="1", y="{2}")
+
+
+class TestStructuredOutput:
+    """测试结构化输出"""
+    
+    class _MessagesLLM:
+        model = "messages-llm"
+        
+        def __init__(self):
+            self.kwargs = []
+        
+        def chat(self, messages, **kwargs):
+            self.kwargs.append(kwargs)
+            return {"content": '{"analysis": {}, "weaknesses": [], "opportunities": []}'}
+    
+    def test_response_format_passed_when_enabled(self):
+        from agents import ContentAgent
+        
+        llm = self._MessagesLLM()
+        agent = ContentAgent(llm, structured_output=True)
+        agent.think({"name": "张三"})
+        
+        response_format = llm.kwargs[0]["response_format"]
+        assert response_format["type"] == "json_schema"
+        assert "analysis" in response_format["json_schema"]["schema"]["properties"]
+    
+    def test_response_format_omitted_by_default(self):
+        from agents import ContentAgent
+        
+        llm = self._MessagesLLM()
+        ContentAgent(llm).think({"name": "张三"})
+        
+        assert llm.kwargs == [{}]
+    
+    def test_structured_call_does_not_hit_free_form_cache(self):
+        """相同提示词下，结构化输出与自由文本响应分开缓存"""
+        from agents import ContentAgent
+        
+        llm = self._MessagesLLM()
+        ContentAgent(llm).think({"name": "张三"})
+        ContentAgent(llm, structured_output=True).think({"name": "张三"})
+        ContentAgent(llm, structured_output=True).think({"name": "张三"})
+        
+        assert len(llm.kwargs) == 2
+        assert "response_format" in llm.kwargs[1]
+
+
+class TestConversationHistory:
+    """测试对话历史记录"""
+    
+    def test_history_disabled_by_default(self):
+        from agents import ContentAgent
+        
+        agent = ContentAgent(MockLLM())
+        agent._call_llm("分析这份简历")
+        
+        assert len(agent.conversation_history) == 0
+        assert agent.dump_history() == []
+    
+    def test_history_bounded(self):
+        from agents import ContentAgent
+        
+        agent = ContentAgent(MockLLM(), cache_enabled=False, history_maxlen=2)
+        agent._call_llm("第一条")
+        agent._call_llm("第二条")
+        
+        history = agent.dump_history()
+        assert [m["role"] for m in history] == ["user", "assistant"]
+        assert history[0]["content"] == "第二条"
+
+
+class TestResponseCache:
+    """测试 LLM 响应缓存"""
+    
+    def test_identical_prompt_hits_cache(self):
+        """相同提示词只请求一次 LLM"""
+        from agents import ContentAgent
+        
+        llm = MockLLM(response='{"weaknesses": []}')
+        agent = ContentAgent(llm, history_maxlen=None)
+        
+        first = agent._call_llm("分析这份简历")
+        second = agent._call_llm("分析这份简历")
+        
+        assert first == second
+        assert llm.call_count == 1
+        assert agent.conversation_history[-1].metadata == {"cached": True}
+    
+    def test_cache_key_depends_on_system_prompt(self):
+        """缓存键区分系统提示词，同类实例之间一致"""
+        from agents import ContentAgent, LayoutAgent
+        
+        llm = MockLLM()
+        content_a, content_b, layout = ContentAgent(llm), ContentAgent(llm), LayoutAgent(llm)
+        
+        assert content_a._cache_key("p", True) == content_b._cache_key("p", True)
+        assert content_a._cache_key("p", True) != layout._cache_key("p", True)
+        assert content_a._cache_key("p", False) == layout._cache_key("p", False)
+    
+    def test_cache_disabled(self):
+        """关闭缓存时每次都请求 LLM"""
+        from agents import ContentAgent
+        
+        llm = MockLLM(response="ok")
+        agent = ContentAgent(llm, cache_enabled=False)
+        
+        agent._call_llm("同一个提示词")
+        agent._call_llm("同一个提示词")
+        
+        assert llm.call_count == 2
+    
+    def test_failed_attempt_is_not_cached(self):
+        """修复后仍无法解析属于确定性失败：不整轮重试，且失败响应不留在缓存中"""
+        from agents import ContentAgent
+        
+        llm = MockLLM(response="不是 JSON")
+        agent = ContentAgent(llm, max_retries=1)
+        
+        result = agent.run({"name": "测试用户"})
+        
+        assert result.success is False
+        assert result.retryable is False
+        # think + execute + JSON 修复各一次，不再重跑第二轮
+        assert llm.call_count == 3
+        
+        agent.run({"name": "测试用户"})
+        assert llm.call_count == 6
+
+
+class TestResponseCacheBackend:
+    """测试 ResponseCache 的淘汰策略与统计"""
+    
+    def test_non_string_value_is_not_cached(self):
+        from common.response_cache import ResponseCache
+        
+        cache = ResponseCache()
+        cache.set("k", None)
+        
+        assert cache.get("k") is None
+    
+    def test_none_content_becomes_empty_string(self):
+        """content=None 的响应按空字符串处理并正常缓存"""
+        from agents import ContentAgent
+        
+        class NoneContentLLM:
+            model = "none-content"
+            
+            def chat(self, messages, **kwargs):
+                return {"role": "assistant", "content": None}
+        
+        agent = ContentAgent(NoneContentLLM())
+        
+        assert agent._call_llm("空响应") == ""
+        assert agent._call_llm("空响应") == ""
+    
+    def test_ttl_expiry(self):
+        from common.response_cache import ResponseCache
+        
+        cache = ResponseCache(ttl=0)
+        cache.set("k", "v")
+        
+        assert cache.get("k") is None
+        assert cache.stats()["misses"] == 1
+    
+    def test_byte_bound_evicts_oldest(self):
+        from common.response_cache import ResponseCache
+        
+        cache = ResponseCache(max_bytes=10)
+        cache.set("a", "12345")
+        cache.set("b", "12345")
+        cache.set("c", "12345")
+        
+        assert cache.get("a") is None
+        assert cache.get("c") == "12345"
+        assert cache.stats()["bytes"] == 10
+    
+    def test_agent_cache_stats(self):
+        from agents import ContentAgent
+        from agents.base import BaseLLMAgent
+        
+        agent = ContentAgent(MockLLM(response="ok"))
+        agent._call_llm("同一个提示词")
+        agent._call_llm("同一个提示词")
+        
+        stats = BaseLLMAgent.cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+
+class TestSemanticCache:
+    """测试语义缓存"""
+    
+    class _BagOfCharsEmbedder:
+        """按字符计数的简易 Embedding，空白差异不影响向量"""
+        
+        def encode(self, texts, normalize=True):
+            import numpy as np
+            vecs = []
+            for text in texts:
+                vec = np.zeros(256, dtype=np.float32)
+                for ch in text:
+                    if not ch.isspace():
+                        vec[ord(ch) % 256] += 1
+                vecs.append(vec / (np.linalg.norm(vec) or 1.0))
+            return np.array(vecs)
+    
+    def test_lookup_after_add(self):
+        """语义相同的文本命中缓存"""
+        from common.semantic_cache import SemanticCache
+        
+        cache = SemanticCache(self._BagOfCharsEmbedder(), threshold=0.99)
+        cache.add('{"name": "张三"}', "结果")
+        
+        assert cache.lookup('{\n  "name":   "张三"\n}') == "结果"
+        assert cache.lookup("完全不同的内容") is None
+    
+    def test_max_entries(self):
+        """超出容量时淘汰最早的条目"""
+        from common.semantic_cache import SemanticCache
+        
+        cache = SemanticCache(self._BagOfCharsEmbedder(), max_entries=2)
+        for text in ["aaa", "bbb", "ccc"]:
+            cache.add(text, text)
+        
+        assert len(cache) == 2
+        assert cache.lookup("aaa") is None
+    
+    def test_think_uses_semantic_cache(self):
+        """think 阶段对缩进不同的同一份简历只请求一次 LLM"""
+        from agents import ContentAgent
+        from common.semantic_cache import SemanticCache
+        
+        llm = MockLLM(response='{"weaknesses": ["缺少量化"]}')
+        cache = SemanticCache(self._BagOfCharsEmbedder(), threshold=0.99)
+        agent = ContentAgent(llm, semantic_cache=cache)
+        
+        agent.think({"name": "测试用户", "summary": "工程师"})
+        agent.think({"summary": "工程师", "name": "测试用户"})
+        
+        assert llm.call_count == 1
+    
+    class _TruncatingEmbedder(_BagOfCharsEmbedder):
+        """只看前 max_chars 个字符，模拟 Embedding 模型的输入截断"""
+        
+        def __init__(self, max_chars=256):
+            self.max_chars = max_chars
+        
+        def encode(self, texts, normalize=True):
+            return super().encode([text[:self.max_chars] for text in texts], normalize)
+    
+    def test_lookup_scoped_to_namespace(self):
+        """不同分区的条目互不命中"""
+        from common.semantic_cache import SemanticCache
+        
+        cache = SemanticCache(self._BagOfCharsEmbedder(), threshold=0.99)
+        cache.add("同一段文本", "结构化结果", namespace="json")
+        
+        assert cache.lookup("同一段文本") is None
+        assert cache.lookup("同一段文本", namespace="json") == "结构化结果"
+    
+    def test_different_resumes_sharing_prefix_do_not_collide(self):
+        """静态前缀超过 Embedding 截断长度时，不同简历仍按简历内容区分"""
+        from agents import ContentAgent
+        from common.semantic_cache import SemanticCache
+        
+        llm = MockLLM(response='{"weaknesses": ["缺少量化"]}')
+        cache = SemanticCache(self._TruncatingEmbedder(), threshold=0.99)
+        agent = ContentAgent(llm, semantic_cache=cache, cache_enabled=False)
+        
+        agent.think({"name": "张三", "summary": "后端工程师，负责支付系统"})
+        agent.think({"name": "李四", "summary": "产品经理，主导增长实验"})
+        
+        assert llm.call_count == 2
+    
+    def test_structured_call_does_not_hit_free_form_entry(self):
+        """结构化输出调用不会命中自由文本调用写入的语义缓存"""
+        from agents import ContentAgent
+        from common.semantic_cache import SemanticCache
+        
+        cache = SemanticCache(self._BagOfCharsEmbedder(), threshold=0.99)
+        llm = TestStructuredOutput._MessagesLLM()
+        for structured in (False, True):
+            agent = ContentAgent(
+                llm, semantic_cache=cache, cache_enabled=False, structured_output=structured,
+            )
+            agent.think({"name": "测试用户"})
+        
+        assert len(llm.kwargs) == 2
+    
+    def test_failed_attempt_evicts_semantic_entry(self):
+        """失败尝试用到的语义缓存条目被淘汰，重试和后续请求不会再命中"""
+        from agents import ContentAgent
+        from common.semantic_cache import SemanticCache
+        
+        cache = SemanticCache(self._BagOfCharsEmbedder(), threshold=0.99)
+        cache.add("无关的提示词", "其它响应")
+        agent = ContentAgent(MockLLM(response="不是 JSON"), semantic_cache=cache)
+        
+        result = agent.run({"name": "语义缓存用户"})
+        
+        assert result.success is False
+        assert len(cache) == 1
+        assert cache.discard("其它响应") == 1
+        assert len(cache) == 0
+
+
+class TestLazyImports:
+    """测试 agents 包的按需导入"""
+    
+    def test_lazy_attribute(self):
+        import agents
+        from agents.crews.resume.content_agent import ContentAgent
+        
+        assert agents.ContentAgent is ContentAgent
+        assert "LayoutAgent" in dir(agents)
+    
+    def test_layout_agent_does_not_load_content_agent(self):
+        """只导入 LayoutAgent 时不加载 ContentAgent 模块"""
+        import os
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys\n"
+            "from agents.crews.resume.layout_agent import LayoutAgent\n"
+            "assert 'agents.crews.resume.content_agent' not in sys.modules\n"
+            "from agents.crews import ContentAgent\n"
+            "assert 'agents.crews.resume.content_agent' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    
+    def test_unknown_attribute(self):
+        import agents
+        
+        with pytest.raises(AttributeError):
+            agents.NoSuchAgent
 
 
 class TestAgentResult:
@@ -182,6 +1178,23 @@ class TestAgentResult:
         assert result.success == True
         assert result.data["key"] == "value"
         assert len(result.suggestions) == 2
+    
+    def test_agent_result_has_no_instance_dict(self):
+        """使用 __slots__，不为每个实例分配 __dict__"""
+        from agents.base import AgentMessage, AgentResult
+        
+        assert not hasattr(AgentResult(success=True, data={}), "__dict__")
+        assert not hasattr(AgentMessage(role="user", content="hi"), "__dict__")
+    
+    def test_result_types_have_no_instance_dict(self):
+        """任务 / 工作流结果与布局配置同样使用 __slots__"""
+        from agents.crews.resume.layout_agent import LayoutConfig
+        from core.task import TaskResult
+        from workflows.base import WorkflowResult
+        
+        assert not hasattr(TaskResult(success=True, output=None), "__dict__")
+        assert not hasattr(WorkflowResult(success=True, output={}), "__dict__")
+        assert not hasattr(LayoutConfig(), "__dict__")
 
 
 if __name__ == "__main__":
@@ -108,3 +108,95 @@ def test_env_overrides_v2_fields(monkeypatch, tmp_path: Path):
     assert cfg.gateway.port == 8123
     assert cfg.memory.cross_session_recall is True
     assert cfg.tracing.sample_rate == 0.5
+
+
+def test_get_logger_does_not_load_config(monkeypatch):
+    import common.config
+    from common.logger import get_logger
+
+    def fail():
+        raise AssertionError("get_logger must not load config")
+
+    monkeypatch.setattr(common.config, "get_config", fail)
+    assert get_logger("tests.lazy").name == "tests.lazy"
+
+
+def test_invalid_yaml_value_keeps_default_and_applies_rest(tmp_path: Path, caplog):
+    from common.config import Config
+
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        """
+gateway:
+  host: "127.0.0.1"
+  port: "not-a-port"
+runtime: "oops"
+worker:
+  concurrency: 16
+""",
+        encoding="utf-8",
+    )
+
+    default_port = Config().gateway.port
+    with caplog.at_level("WARNING", logger="common.config"):
+        cfg = Config.load(config_path=str(config_path))
+
+    assert cfg.gateway.host == "127.0.0.1"
+    assert cfg.gateway.port == default_port
+    assert cfg.worker.concurrency == 16
+    assert "not-a-port" in caplog.text
+    assert "runtime" in caplog.text
+
+
+def test_malformed_yaml_is_reported(tmp_path: Path, caplog):
+    from common.config import Config
+
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("gateway: [unclosed\n", encoding="utf-8")
+
+    with caplog.at_level("WARNING", logger="common.config"):
+        Config.load(config_path=str(config_path))
+
+    assert str(config_path) in caplog.text
+
+
+def test_clock_time_reuses_string_within_a_second(monkeypatch):
+    from common import logger as logger_module
+
+    monkeypatch.setattr(logger_module.time, "time", lambda: 1_700_000_000.25)
+    first = logger_module.clock_time()
+    monkeypatch.setattr(logger_module.time, "time", lambda: 1_700_000_000.75)
+
+    assert logger_module.clock_time() is first
+    assert first == logger_module.time.strftime("%H:%M:%S", logger_module.time.localtime(1_700_000_000))
+
+
+def test_unchanged_yaml_is_not_reparsed(monkeypatch, tmp_path: Path):
+    import yaml
+
+    from common.config import Config
+
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text('gateway:\n  cors_origins: ["http://a"]\n', encoding="utf-8")
+
+    calls = []
+    original = yaml.safe_load
+
+    def counting_safe_load(stream):
+        calls.append(stream)
+        return original(stream)
+
+    monkeypatch.setattr(yaml, "safe_load", counting_safe_load)
+
+    first = Config.load(config_path=str(config_path))
+    first.gateway.cors_origins.append("http://b")
+    second = Config.load(config_path=str(config_path))
+
+    assert len(calls) == 1
+    assert second.gateway.cors_origins == ["http://a"]
+
+    config_path.write_text('gateway:\n  cors_origins: ["http://changed"]\n', encoding="utf-8")
+    third = Config.load(config_path=str(config_path))
+
+    assert len(calls) == 2
+    assert third.gateway.cors_origins == ["http://changed"]
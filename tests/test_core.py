@@ -4,6 +4,7 @@
 测试内容：
 - Task / TaskResult
 - Orchestrator
+- 工具调用解析
 """
 import pytest
 from unittest.mock import MagicMock, patch
@@ -75,6 +76,18 @@ class TestTaskResult:
         assert result.output is None
         assert result.error == "Something went wrong"
 
+    def test_core_records_are_slotted(self):
+        """核心数据类使用 __slots__，不为每个实例分配 __dict__"""
+        from core import Conversation, Document, SearchResult
+        from core.parser import ToolCall
+        from core.task import Task
+        
+        assert not hasattr(Task(name="t", input_data=None), "__dict__")
+        assert not hasattr(ToolCall(name="calc", arguments={}), "__dict__")
+        assert not hasattr(Document(text="x"), "__dict__")
+        assert not hasattr(SearchResult(text="x", score=1.0), "__dict__")
+        assert not hasattr(Conversation(), "__dict__")
+
 
 # =============================================================================
 # Orchestrator 测试
@@ -185,6 +198,53 @@ class TestOrchestrator:
         assert len(orchestrator._crew_instances) == 1
 
 
+
+# =============================================================================
+# 工具调用解析测试
+# =============================================================================
+
+class TestParseToolCalls:
+    """工具调用解析测试"""
+    
+    def test_action_prefix(self):
+        from core.parser import parse_tool_calls
+        
+        content = '思考一下\nAction: {"name": "calculator", "arguments": {"expression": "{1}"}} 后续文字'
+        calls = parse_tool_calls({"content": content})
+        
+        assert len(calls) == 1
+        assert calls[0].name == "calculator"
+        assert calls[0].arguments == {"expression": "{1}"}
+    
+    def test_bare_json_and_no_call(self):
+        from core.parser import parse_tool_calls
+        
+        calls = parse_tool_calls({"content": '调用 {"name": "search", "arguments": "{\\"q\\": \\"x\\"}"}'})
+        
+        assert calls[0].name == "search"
+        assert calls[0].arguments == {"q": "x"}
+        assert parse_tool_calls({"content": "Action: 没有 JSON"}) is None
+    
+    def test_find_action_end(self):
+        from core.parser import find_action_end
+        
+        partial = 'Action: {"name": "search", "arguments": {"q": "a \\"}\\" b'
+        complete = partial + '"}} 之后的文字'
+        
+        assert find_action_end(partial) is None
+        assert complete[:find_action_end(complete)].endswith('b"}}')
+
+    def test_action_stream_scanner_matches_find_action_end(self):
+        from core.parser import ActionStreamScanner, find_action_end
+        
+        text = '思考\nAction: \n{"name": "search", "arguments": {"q": "a \\"}\\" {b"}} 之后的文字'
+        for size in (1, 2, 3, 7):
+            scanner = ActionStreamScanner()
+            ends = [scanner.feed(text[i:i + size]) for i in range(0, len(text), size)]
+            end = next(e for e in ends if e is not None)
+            assert end == find_action_end(text)
+            assert scanner.text[:end].endswith('{b"}}')
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
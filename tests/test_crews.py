@@ -89,6 +89,126 @@ class TestLayoutAgent:
         assert agent.name == "LayoutAgent"
 
 
+# =============================================================================
+# BaseCrew 测试
+# =============================================================================
+
+class TestBaseCrew:
+    """BaseCrew 测试"""
+    
+    def test_async_execute_runs_think_concurrently(self):
+        """async _execute 中的 think 并发执行"""
+        import asyncio
+        import threading
+        from agents import ContentAgent, LayoutAgent
+        from agents.crews.base import BaseCrew
+        from core.task import Task, TaskResult
+        
+        barrier = threading.Barrier(2, timeout=5)
+        
+        class BarrierLLM(MockLLM):
+            def chat(self, messages, **kwargs):
+                # 两个 think 必须同时在途，否则 barrier 超时
+                barrier.wait()
+                return super().chat(messages, **kwargs)
+        
+        class DemoCrew(BaseCrew):
+            CREW_NAME = "demo"
+            
+            def _init_agents(self):
+                self.agents = [ContentAgent(self.llm), LayoutAgent(self.llm)]
+            
+            async def _execute(self, task):
+                reasons = await asyncio.gather(
+                    *(agent.athink(task.input_data) for agent in self.agents)
+                )
+                return TaskResult(success=True, output=reasons)
+        
+        crew = DemoCrew(BarrierLLM())
+        result = crew.run(Task(name="demo", input_data=SAMPLE_RESUME))
+        
+        assert result.success is True
+        assert len(result.output) == 2
+    
+    def test_async_execute_inside_running_loop(self):
+        """在运行中的事件循环里同步调用 run，async _execute 仍能完成"""
+        import asyncio
+        from agents.crews.base import BaseCrew
+        from core.task import Task, TaskResult
+        
+        class DemoCrew(BaseCrew):
+            CREW_NAME = "demo"
+            
+            def _init_agents(self):
+                self.agents = []
+            
+            async def _execute(self, task):
+                await asyncio.sleep(0)
+                return TaskResult(success=True, output=task.name)
+        
+        async def main():
+            return DemoCrew(MockLLM()).run(Task(name="nested", input_data={}))
+        
+        result = asyncio.run(main())
+        
+        assert result.success is True
+        assert result.output == "nested"
+    
+    def test_each_run_keeps_its_own_logs(self):
+        """每次运行使用新的日志列表，后续运行不会改动之前的结果"""
+        from agents.crews.base import BaseCrew
+        from core.task import Task, TaskResult
+        
+        class DemoCrew(BaseCrew):
+            CREW_NAME = "demo"
+            
+            def _init_agents(self):
+                self.agents = []
+            
+            def _execute(self, task):
+                self._log(f"处理 {task.name}")
+                return TaskResult(success=True, output=None)
+        
+        crew = DemoCrew(MockLLM())
+        first = crew.run(Task(name="first", input_data={}))
+        first_logs = list(first.logs)
+        second = crew.run(Task(name="second", input_data={}))
+        crew.reset()
+        
+        assert first.logs == first_logs
+        assert any("处理 first" in entry for entry in first.logs)
+        assert not any("first" in entry for entry in second.logs)
+    
+    def test_retrieval_query_follows_input_data(self):
+        """检索查询按当前输入构建，不写入任务元数据"""
+        from agents.crews.base import BaseCrew
+        from core.task import Task, TaskResult
+        
+        class DemoCrew(BaseCrew):
+            CREW_NAME = "demo"
+            
+            def _init_agents(self):
+                self.agents = []
+            
+            def _execute(self, task):
+                return TaskResult(success=True, output=None)
+        
+        kb = MagicMock()
+        kb.retrieve_context.return_value = ["ref"]
+        crew = DemoCrew(MockLLM(), knowledge_base=kb)
+        task = Task(name="demo", input_data={"summary": "后端工程师"})
+        
+        crew.run(task)
+        kb.retrieve_context.assert_called_with("后端工程师", top_k=3)
+        
+        task.context.pop("references")
+        task.input_data["summary"] = "前端工程师"
+        crew.run(task)
+        
+        kb.retrieve_context.assert_called_with("前端工程师", top_k=3)
+        assert "retrieval_query" not in task.metadata
+
+
 # =============================================================================
 # ResumePipeline (Workflow) 测试
 # =============================================================================
@@ -150,6 +270,81 @@ class TestResumePipeline:
         template_config = pipeline._select_template(ctx)
         
         assert template_config is not None
+    
+    def test_prefetch_layout_think_runs_in_background(self):
+        """开启 prefetch_layout 时布局分析在后台线程执行，且只执行一次"""
+        import threading
+        from workflows import ResumePipeline
+        
+        pipeline = ResumePipeline(llm=MockLLM(), prefetch_layout=True)
+        pipeline._generator = MagicMock()
+        pipeline._generator.execute.return_value = "生成成功"
+        
+        think_threads = []
+        original_think = pipeline.layout_agent.think
+        
+        def recording_think(input_data):
+            think_threads.append(threading.current_thread().name)
+            return original_think(input_data)
+        
+        pipeline.layout_agent.think = recording_think
+        result = pipeline.run(input_data=SAMPLE_RESUME)
+        
+        assert result.success is True
+        assert len(think_threads) == 1
+        assert think_threads[0].startswith("layout-prefetch")
+    
+    def test_prefetch_layout_uses_given_executor(self):
+        """可传入自定义线程池承载布局预分析"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from workflows import ResumePipeline
+        
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="custom-llm") as executor:
+            pipeline = ResumePipeline(llm=MockLLM(), prefetch_layout=True, executor=executor)
+            pipeline._generator = MagicMock()
+            pipeline._generator.execute.return_value = "生成成功"
+            
+            think_threads = []
+            original_think = pipeline.layout_agent.think
+            
+            def recording_think(input_data):
+                think_threads.append(threading.current_thread().name)
+                return original_think(input_data)
+            
+            pipeline.layout_agent.think = recording_think
+            pipeline.run(input_data=SAMPLE_RESUME)
+        
+        assert think_threads[0].startswith("custom-llm")
+    
+    def test_prefetch_layout_disables_fused_think(self):
+        """预分析与合并调用不同时开启：布局只发分析 + 配置两次普通调用"""
+        from agents.base import BaseLLMAgent
+        from prompts import LAYOUT_COMBINED_STATIC
+        from workflows import ResumePipeline
+        
+        class CountingLLM(MockLLM):
+            def __init__(self):
+                self.prompts = []
+            
+            def chat(self, messages, **kwargs):
+                self.prompts.append(messages[-1]["content"])
+                return super().chat(messages, **kwargs)
+        
+        BaseLLMAgent.clear_response_cache()
+        llm = CountingLLM()
+        pipeline = ResumePipeline(llm=llm, prefetch_layout=True)
+        pipeline._generator = MagicMock()
+        pipeline._generator.execute.return_value = "生成成功"
+        
+        result = pipeline.run(input_data=SAMPLE_RESUME)
+        
+        assert result.success is True
+        assert pipeline.layout_agent.fused is False
+        # 内容优化 think + execute，布局 think + execute
+        assert len(llm.prompts) == 4
+        assert not any(LAYOUT_COMBINED_STATIC in prompt for prompt in llm.prompts)
+        assert ResumePipeline(llm=llm).layout_agent.fused is True
 
 
 if __name__ == "__main__":
@@ -59,6 +59,53 @@ class TestVllmLLM:
         assert result["content"] == "你好！"
         mock_post.assert_called_once()
     
+    @patch('requests.post')
+    def test_chat_uses_injected_session(self, mock_post):
+        """注入 session 时复用其连接池"""
+        from llm import VllmLLM
+        
+        session = MagicMock()
+        session.post.return_value.json.return_value = {
+            "choices": [{"message": {"content": "ok"}}]
+        }
+        
+        llm = VllmLLM(session=session)
+        result = llm.chat([{"role": "user", "content": "你好"}])
+        
+        assert result["content"] == "ok"
+        session.post.assert_called_once()
+        mock_post.assert_not_called()
+    
+    def test_chat_stream_uses_injected_session(self):
+        """流式请求与 chat 共用同一个 session"""
+        from llm import VllmLLM
+        
+        session = MagicMock()
+        session.post.return_value.iter_lines.return_value = [
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            "",
+            'data: {"choices": [{"delta": {"content": "你"}}]}',
+            'data: {"choices": [{"delta": {"content": "好"}}]}',
+            "data: [DONE]",
+        ]
+        
+        llm = VllmLLM(session=session)
+        chunks = list(llm.chat_stream([{"role": "user", "content": "你好"}]))
+        
+        assert chunks == ["你", "好"]
+        assert session.post.call_args.kwargs["json"]["stream"] is True
+        session.post.return_value.close.assert_called_once()
+    
+    def test_create_session(self):
+        """测试连接池 session 构建"""
+        from llm import VllmLLM
+        import requests
+        
+        session = VllmLLM.create_session(pool_maxsize=4)
+        
+        assert isinstance(session, requests.Session)
+        assert session.get_adapter("http://localhost:8000")._pool_maxsize == 4
+    
     @patch('requests.post')
     def test_chat_with_params(self, mock_post):
         """测试带参数的 chat"""
@@ -160,6 +207,17 @@ class TestModelScopeOpenAI:
         
         llm = ModelScopeOpenAI(api_key="test", model="custom-model")
         assert llm.model == "custom-model"
+    
+    def test_client_shared_per_endpoint(self):
+        """同一端点和 Key 的实例共用底层客户端（连接池）"""
+        from llm import ModelScopeOpenAI
+        
+        first = ModelScopeOpenAI(api_key="shared-key", model="a")
+        second = ModelScopeOpenAI(api_key="shared-key", model="b")
+        other = ModelScopeOpenAI(api_key="other-key")
+        
+        assert first.client is second.client
+        assert first.client is not other.client
 
 
 if __name__ == "__main__":
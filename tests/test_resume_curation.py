@@ -73,6 +73,9 @@ def test_curate_resume_applies_project_and_award_order():
     assert curated["projects"][0]["name"] == "A"
     assert curated["awards"][0] == "国际大学生竞赛金奖"
     assert notes
+    assert resume_data["projects"][0]["name"] == "B"
+    assert resume_data["awards"][0] == "校级三好学生"
+    assert curated["projects"][1] is not resume_data["projects"][0]
 
 
 def test_resume_data_accepts_curated_project_fields():
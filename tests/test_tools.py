@@ -98,6 +98,25 @@ class TestToolRegistry:
         assert ok is False
         assert "Invalid argument type" in error
 
+    def test_unknown_tool_error_lists_available_tools(self):
+        self.registry.register(Calculator())
+        ok, error = self.registry.validate_call("calc", {})
+        assert ok is False
+        assert error.endswith("Available tools: calculator")
+
+        self.registry.register(Search())
+        assert self.registry.names_str == "calculator, search"
+
+    def test_function_specs_reused_until_tools_change(self):
+        self.registry.register(Calculator())
+        first = self.registry.as_function_specs()
+        second = self.registry.as_function_specs()
+        assert first == second
+        assert first[0] is second[0]
+
+        self.registry.register(Search())
+        assert [spec["name"] for spec in self.registry.as_function_specs()] == ["calculator", "search"]
+
 
 class TestTavilySearch:
     """Tavily 搜索工具测试"""
@@ -25,6 +25,9 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# JSON 修复失败时兜底提取 "name" 字段
+_NAME_FIELD_RE = re.compile(r'"name"\s*:\s*"([^"]+)"')
+
 
 class LayoutDesignerTool(BaseTool):
     """简历布局设计工具。
@@ -107,20 +110,23 @@ class LayoutDesignerTool(BaseTool):
     
     def _try_fix_json(self, json_str: str) -> Optional[Dict[str, Any]]:
         """尝试修复损坏的 JSON"""
-        for end_pos in range(len(json_str), max(0, len(json_str) - 200), -1):
+        # 依次尝试截断到末尾 200 字符内的每个 }（以及其前最近的一个），
+        # 每个候选位置只解析一次，不再逐字符重复同一次 json.loads
+        floor = max(0, len(json_str) - 200)
+        last_brace = json_str.rfind('}')
+        while last_brace > 0:
             try:
-                truncated = json_str[:end_pos]
-                last_brace = truncated.rfind('}')
-                if last_brace > 0:
-                    test_str = truncated[:last_brace + 1]
-                    result = json.loads(test_str)
-                    logger.info(f"[LayoutDesignerTool] JSON 修复成功")
-                    return result
-            except:
-                continue
+                result = json.loads(json_str[:last_brace + 1])
+                logger.info("[LayoutDesignerTool] JSON 修复成功")
+                return result
+            except ValueError:
+                pass
+            if last_brace <= floor:
+                break
+            last_brace = json_str.rfind('}', 0, last_brace)
         
         try:
-            name_match = re.search(r'"name"\s*:\s*"([^"]+)"', json_str)
+            name_match = _NAME_FIELD_RE.search(json_str)
             if name_match:
                 return {"name": name_match.group(1), "_partial": True}
         except:
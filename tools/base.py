@@ -6,7 +6,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, ClassVar, Dict
 
 
 class BaseTool(ABC):
@@ -18,6 +18,8 @@ class BaseTool(ABC):
         name: 工具名称（用于 LLM 调用）
         description: 工具描述
         parameters: 参数 schema（OpenAI 函数调用格式）
+        is_pure: 无副作用，相同参数在同一轮内结果相同（可去重、可与其它调用重排）
+        is_io_bound: 主要耗时在网络 / 磁盘 I/O（纯工具会在线程池中并发执行）
         
     Example:
         >>> class MyTool(BaseTool):
@@ -38,6 +40,9 @@ class BaseTool(ABC):
         ...         return f"处理: {param1}"
     """
 
+    is_pure: ClassVar[bool] = False
+    is_io_bound: ClassVar[bool] = False
+
     def __init__(
         self,
         name: str,
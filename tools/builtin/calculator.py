@@ -18,6 +18,8 @@ class Calculator(BaseTool):
         '3*7+2 = 23'
     """
 
+    is_pure = True
+
     # 允许的字符正则
     SAFE_PATTERN = re.compile(r"^[0-9+\-*/().\s]+$")
 
@@ -74,6 +74,9 @@ class ReadFile(BaseTool):
         'Hello World'
     """
 
+    is_pure = True
+    is_io_bound = True
+
     def __init__(self) -> None:
         super().__init__(
             name="read_file",
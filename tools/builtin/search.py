@@ -19,6 +19,8 @@ class Search(BaseTool):
         'Python 是一种编程语言。'
     """
 
+    is_pure = True
+
     # 模拟搜索结果
     MOCK_RESULTS: ClassVar[Dict[str, str]] = {
         "python": "Python 是一种通用编程语言，以简洁易读著称。",
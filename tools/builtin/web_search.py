@@ -32,6 +32,9 @@ class TavilySearch(BaseTool):
         >>> print(result)
     """
     
+    is_pure = True
+    is_io_bound = True
+    
     API_URL = "https://api.tavily.com/search"
     
     def __init__(self, api_key: Optional[str] = None, max_results: int = 5) -> None:
@@ -139,6 +142,9 @@ class DuckDuckGoSearch(BaseTool):
         >>> print(result)
     """
     
+    is_pure = True
+    is_io_bound = True
+    
     def __init__(self, max_results: int = 5) -> None:
         """初始化 DuckDuckGo 搜索工具。
         
@@ -228,6 +234,9 @@ class WebSearch(BaseTool):
         >>> print(result)
     """
     
+    is_pure = True
+    is_io_bound = True
+    
     def __init__(
         self, 
         provider: Optional[str] = None,
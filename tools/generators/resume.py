@@ -18,11 +18,15 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Protocol, Type, TYPE_CHECKING
 
+from common.logger import get_logger
+
 from ..base import BaseTool
 
 if TYPE_CHECKING:
     from agents import ResumeAgentOrchestrator
 
+logger = get_logger(__name__)
+
 __all__ = ["ResumeGenerator"]
 
 
@@ -951,7 +955,7 @@ class ResumeGenerator(BaseTool):
         template_config = self._load_template_config(template, temp_dir)
         if template_config and not layout_config:
             layout_config = template_config
-            print("[ResumeGenerator] 使用模板配置")
+            logger.debug("[ResumeGenerator] 使用模板配置")
         
         # 4. AI 优化（如果启用且有协调器）
         optimization_result = None
@@ -977,9 +981,9 @@ class ResumeGenerator(BaseTool):
         style = StyleConfig()
         if layout_config:
             style = self._apply_layout_config(style, layout_config)
-            print("[ResumeGenerator] 使用布局配置")
+            logger.debug("[ResumeGenerator] 使用布局配置")
         else:
-            print("[ResumeGenerator] 使用默认样式")
+            logger.debug("[ResumeGenerator] 使用默认样式")
         
         # 8. 生成文档
         try:
@@ -1040,7 +1044,7 @@ class ResumeGenerator(BaseTool):
             filepath = os.path.join(temp_dir, filename)
             if os.path.exists(filepath):
                 with open(filepath, 'r', encoding='utf-8') as f:
-                    print(f"[ResumeGenerator] 使用{desc}数据")
+                    logger.debug("[ResumeGenerator] 使用%s数据", desc)
                     return json.load(f), None
             else:
                 return None, f"❌ 未找到{desc}数据"
@@ -1068,7 +1072,7 @@ class ResumeGenerator(BaseTool):
                 if config:
                     return config.to_layout_config()
             except Exception as e:
-                print(f"[ResumeGenerator] 加载模板失败: {e}")
+                logger.warning("[ResumeGenerator] 加载模板失败: %s", e)
         
         return None
     
@@ -1097,7 +1101,7 @@ class ResumeGenerator(BaseTool):
             )
             return data, style, notes
         except Exception as e:
-            print(f"[ResumeGenerator] 分页优化失败: {e}")
+            logger.warning("[ResumeGenerator] 分页优化失败: %s", e)
             return raw_data, layout_config, ""
     
     def _run_optimization(self, raw_data: Dict[str, Any]) -> tuple:
@@ -1116,9 +1120,9 @@ class ResumeGenerator(BaseTool):
                     raw_data = result.optimized_resume
                     layout_config = result.layout_config
                     optimization_result = result
-                    print(f"[ResumeGenerator] 多Agent优化完成，耗时 {result.execution_time:.2f}s")
+                    logger.info("[ResumeGenerator] 多Agent优化完成，耗时 %.2fs", result.execution_time)
             except Exception as e:
-                print(f"[ResumeGenerator] 多Agent优化失败: {e}")
+                logger.warning("[ResumeGenerator] 多Agent优化失败: %s", e)
         
         return raw_data, optimization_result, layout_config
     
@@ -1193,6 +1197,6 @@ class ResumeGenerator(BaseTool):
                     style.show_timeline = visual_cfg["use_timeline"]
                     
         except Exception as e:
-            print(f"[ResumeGenerator] 应用布局配置失败: {e}")
+            logger.warning("[ResumeGenerator] 应用布局配置失败: %s", e)
         
         return style
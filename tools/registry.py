@@ -3,21 +3,41 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from .base import BaseTool
 
+# JSON schema type -> check, shared by every validate_call
+_TYPE_CHECKERS: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+}
+
 
 class ToolRegistry:
     """Central registry for agent tools."""
 
     def __init__(self):
         self._tools: Dict[str, BaseTool] = {}
+        self._version = 0
+        # (version, specs) so every agent round reuses the same function specs
+        self._specs: Optional[Tuple[int, List[Dict[str, Any]]]] = None
+        self._names_str: Optional[Tuple[int, str]] = None
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every change to the tool set, for cache keys."""
+        return self._version
 
     def register(self, tool: BaseTool) -> None:
         if tool.name in self._tools:
             raise ValueError(f"Tool '{tool.name}' already registered")
         self._tools[tool.name] = tool
+        self._version += 1
 
     def register_tools(self, tools: Iterable[BaseTool]) -> None:
         for tool in tools:
@@ -26,6 +46,7 @@ class ToolRegistry:
     def unregister(self, name: str) -> bool:
         if name in self._tools:
             del self._tools[name]
+            self._version += 1
             return True
         return False
 
@@ -47,19 +68,30 @@ class ToolRegistry:
     def get_tool_names(self) -> List[str]:
         return self.get_names()
 
+    @property
+    def names_str(self) -> str:
+        """Comma-joined tool names, rebuilt only after the tool set changes."""
+        if self._names_str is None or self._names_str[0] != self._version:
+            self._names_str = (self._version, ", ".join(self._tools))
+        return self._names_str[1]
+
     def has(self, name: str) -> bool:
         return name in self._tools
 
     def clear(self) -> None:
         self._tools.clear()
+        self._version += 1
 
     def as_function_specs(self) -> List[Dict[str, Any]]:
-        return [tool.as_function_spec() for tool in self._tools.values()]
+        """Function specs of all tools, rebuilt only after the tool set changes."""
+        if self._specs is None or self._specs[0] != self._version:
+            self._specs = (self._version, [tool.as_function_spec() for tool in self._tools.values()])
+        return list(self._specs[1])
 
     def validate_call(self, name: str, arguments: Dict[str, Any]) -> Tuple[bool, str]:
         tool = self.get(name)
         if tool is None:
-            return False, f"Tool not found: '{name}'"
+            return False, f"Tool not found: '{name}'. Available tools: {self.names_str or 'none'}"
         if not isinstance(arguments, dict):
             return False, "Tool arguments must be an object"
 
@@ -83,15 +115,7 @@ class ToolRegistry:
 
     @staticmethod
     def _matches_type(value: Any, expected: str) -> bool:
-        type_map = {
-            "string": lambda v: isinstance(v, str),
-            "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
-            "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
-            "boolean": lambda v: isinstance(v, bool),
-            "object": lambda v: isinstance(v, dict),
-            "array": lambda v: isinstance(v, list),
-        }
-        checker = type_map.get(expected)
+        checker = _TYPE_CHECKERS.get(expected)
         return checker(value) if checker else True
 
     def __len__(self) -> int:
@@ -13,8 +13,12 @@ import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Type, Tuple
 
+from common.logger import get_logger
+
 from .base import BaseTemplate, TemplateConfig
 
+logger = get_logger(__name__)
+
 # 单例注册表
 _registry: Optional["TemplateRegistry"] = None
 
@@ -53,7 +57,7 @@ class TemplateRegistry:
                 config = TemplateConfig.from_json(str(json_file))
                 self._templates[config.name] = config
             except Exception as e:
-                print(f"[TemplateRegistry] 加载模板失败 {json_file}: {e}")
+                logger.warning("[TemplateRegistry] 加载模板失败 %s: %s", json_file, e)
     
     def register(self, config: TemplateConfig) -> None:
         """注册模板配置
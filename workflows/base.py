@@ -8,12 +8,12 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 import time
 
-from common.logger import get_logger
+from common.logger import clock_time, get_logger
 
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowResult:
     """工作流执行结果"""
     success: bool
@@ -95,9 +95,10 @@ class BaseWorkflow(ABC):
         Returns:
             WorkflowResult
         """
-        self._logs.clear()
+        # 每次运行使用新的列表，结果直接持有它，无需复制
+        self._logs = []
         self._current_step = 0
-        start_time = time.time()
+        start_time = time.monotonic()
         
         # 创建上下文
         ctx = WorkflowContext(
@@ -119,8 +120,8 @@ class BaseWorkflow(ABC):
         
         try:
             result = self._execute_steps(ctx)
-            result.logs = self._logs.copy()
-            result.execution_time = time.time() - start_time
+            result.logs = self._logs
+            result.execution_time = time.monotonic() - start_time
             result.total_steps = len(self.WORKFLOW_STEPS)
             
             self._log(f"工作流完成，耗时 {result.execution_time:.2f}s")
@@ -132,16 +133,16 @@ class BaseWorkflow(ABC):
             return WorkflowResult(
                 success=False,
                 output={},
-                logs=self._logs.copy(),
+                logs=self._logs,
                 error=str(e),
-                execution_time=time.time() - start_time,
+                execution_time=time.monotonic() - start_time,
                 steps_completed=self._current_step,
                 total_steps=len(self.WORKFLOW_STEPS),
             )
     
     def _log(self, message: str):
         """记录日志"""
-        timestamp = time.strftime("%H:%M:%S")
+        timestamp = clock_time()
         log_entry = f"[{timestamp}] [{self.WORKFLOW_NAME}] {message}"
         self._logs.append(log_entry)
         logger.info(f"[{self.WORKFLOW_NAME}] {message}")
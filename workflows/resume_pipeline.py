@@ -10,14 +10,21 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import Executor
 from typing import Any, Dict, Optional
 
 from .base import BaseWorkflow, WorkflowResult, WorkflowContext
+from common.executors import get_executor
 from common.logger import get_logger
 from resume_copilot.product import curate_resume
 
 logger = get_logger(__name__)
 
+# 布局预分析专用线程池：与 agent-bg（关键词提取等）分开，
+# 并发流水线的预分析不会排在其它后台 LLM 调用之后
+_PREFETCH_EXECUTOR = "layout-prefetch"
+_PREFETCH_WORKERS = 8
+
 
 class ResumePipeline(BaseWorkflow):
     """简历生成流水线
@@ -38,6 +45,12 @@ class ResumePipeline(BaseWorkflow):
         ...     job_description="招聘Python工程师...",
         ...     page_preference="one_page",
         ... )
+    
+    prefetch_layout=True 时，布局分析（LayoutAgent.think）与内容优化并行执行，
+    省下一次 LLM 往返的等待。代价是分析基于内容优化之前的简历：章节结构
+    通常不变，但字数、条目的变化不会反映在分析中，布局配置仍按优化后的简历
+    生成。内容优化会大幅改写简历结构时应关闭。预分析在 executor 上运行，
+    未指定时使用专用的 layout-prefetch 线程池。
     """
     
     WORKFLOW_NAME = "resume_pipeline"
@@ -49,9 +62,18 @@ class ResumePipeline(BaseWorkflow):
         "生成文档",
     ]
     
-    def __init__(self, llm=None, output_dir: str = "./output"):
+    def __init__(
+        self,
+        llm=None,
+        output_dir: str = "./output",
+        prefetch_layout: bool = False,
+        executor: Optional[Executor] = None,
+    ):
         super().__init__(llm=llm)
         self.output_dir = output_dir
+        # 布局分析基于优化前的简历与内容优化并行执行（取舍见类文档）
+        self.prefetch_layout = prefetch_layout
+        self.executor = executor
         
         # 延迟初始化的组件
         self._content_agent = None
@@ -71,7 +93,9 @@ class ResumePipeline(BaseWorkflow):
         """延迟加载 LayoutAgent"""
         if self._layout_agent is None and self.llm:
             from agents.crews.resume.layout_agent import LayoutAgent
-            self._layout_agent = LayoutAgent(self.llm)
+            # 分析与配置合并为一次调用。预分析时 think 看到的是优化前的简历，
+            # 合并结果在 execute 时必然对不上，只会白白多发一份配置输出，因此不合并
+            self._layout_agent = LayoutAgent(self.llm, fused=not self.prefetch_layout)
         return self._layout_agent
     
     @property
@@ -89,13 +113,17 @@ class ResumePipeline(BaseWorkflow):
     def _execute_steps(self, ctx: WorkflowContext) -> WorkflowResult:
         """执行完整流水线"""
         suggestions = []
-        data = ctx.input_data.copy()
-
-        data, curation_notes = curate_resume(data, ctx.job_description or "")
+        # curate_resume 返回规范化后的深拷贝，不会修改输入
+        data, curation_notes = curate_resume(ctx.input_data, ctx.job_description or "")
         suggestions.extend(curation_notes)
         if curation_notes:
             self._log("已完成岗位导向的项目筛选与奖项排序")
         
+        layout_future = None
+        if self.prefetch_layout and self.content_agent and self.layout_agent:
+            executor = self.executor or get_executor(_PREFETCH_EXECUTOR, _PREFETCH_WORKERS)
+            layout_future = executor.submit(self.layout_agent.think, data)
+        
         # =====================================================================
         # Step 1: 内容优化（ContentAgent 专家）
         # =====================================================================
@@ -142,8 +170,15 @@ class ResumePipeline(BaseWorkflow):
         layout_config = template_config or {}
         
         if self.layout_agent:
+            layout_reasoning = None
+            if layout_future is not None:
+                try:
+                    layout_reasoning = layout_future.result()
+                except Exception as e:
+                    self._log(f"布局预分析失败，重新分析: {e}")
+            
             try:
-                result = self.layout_agent.run(data)
+                result = self.layout_agent.run(data, reasoning=layout_reasoning)
                 
                 if result.success:
                     result_data = result.data